@@ -0,0 +1,652 @@
+# Arbitrage core: loading, normalization and detection, no Streamlit
+# Shared by the dashboard (ui.py) and the headless service (arb_service.py)
+
+import os
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+import pandas as pd
+
+import arbitrage
+import resilience
+from fixtures import Batch
+from paths import out_dir
+from price_index import PriceIndex
+# stakes and fair_odds are imported by the functions that use them
+
+# Configuration - the same output folder the scrapers write (paths.py)
+OUT_DIR = out_dir()
+
+# File paths for all three sites
+FILES = {
+    "SuperSportBET": {
+        "csv": os.path.join(OUT_DIR, "supersport_premier.csv"),
+        "json": os.path.join(OUT_DIR, "supersport_premier.json"),
+        "history": os.path.join(OUT_DIR, "history", "supersport_premier.csv")
+    },
+    "SunBet": {
+        "csv": os.path.join(OUT_DIR, "sunbet_premier.csv"),
+        "json": os.path.join(OUT_DIR, "sunbet_premier.json"),
+        "history": os.path.join(OUT_DIR, "history", "sunbet_premier.csv")
+    },
+    "Betjets": {
+        "csv": os.path.join(OUT_DIR, "betjets_epl.csv"),
+        "json": os.path.join(OUT_DIR, "betjets_epl.json"),
+        "history": os.path.join(OUT_DIR, "history", "betjets_epl.csv")
+    }
+}
+
+# Common abbreviations and variations, applied in order
+TEAM_ALIASES: Tuple[Tuple[str, str], ...] = (
+    ('man united', 'manchester united'),
+    ('man utd', 'manchester united'),
+    ('man city', 'manchester city'),
+    ('spurs', 'tottenham'),
+    ('tottenham hotspur', 'tottenham'),
+    ('newcastle united', 'newcastle'),
+    ('wolves', 'wolverhampton'),
+    ('brighton & hove albion', 'brighton'),
+    ('brighton and hove albion', 'brighton'),
+    ('nottingham forest', 'nott\'m forest'),
+    ('west ham united', 'west ham'),
+    ('leicester city', 'leicester'),
+)
+
+@lru_cache(maxsize=8192)
+def normalize_team_name(team: str) -> str:
+    """Normalize team names for matching across different sites."""
+    team = team.lower().strip()
+    for old, new in TEAM_ALIASES:
+        if old in team:
+            team = team.replace(old, new)
+    return team
+
+def normalize_teams(teams: pd.Series) -> pd.Series:
+    """normalize_team_name over a column, computed once per distinct name."""
+    uniq = teams.dropna().unique()
+    return teams.map(dict(zip(uniq, map(normalize_team_name, uniq))))
+
+def fmt_age(seconds: float) -> str:
+    """Compact age of a price: 45s, 12m, 3h."""
+    if pd.isna(seconds):
+        return "?"
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.0f}h"
+
+def site_problem(site: str) -> str:
+    """Why a site is serving an old snapshot, from the scraper's status file ('' when healthy)."""
+    status = resilience.read_status(OUT_DIR, site.lower())
+    if not status.get("failures"):
+        return ""
+    now = pd.Timestamp.now(tz='UTC')
+    note = f"{site}: last {status['failures']} scrape(s) failed ({status.get('last_error')})"
+    if status.get("last_ok"):
+        note += f"; showing the last good snapshot, {fmt_age((now - pd.Timestamp(status['last_ok'])).total_seconds())} old"
+    if status.get("next_retry"):
+        note += f"; retry in {fmt_age(max(0.0, (pd.Timestamp(status['next_retry']) - now).total_seconds()))}"
+    return note
+
+def load_frames() -> Tuple[pd.DataFrame, List[str], List[str]]:
+    """Load and combine data from all three sites.
+    
+    Returns (combined rows, per-site loaded notes, per-site problems).
+    """
+    dfs = []
+    found_files = []
+    missing_files = []
+    
+    for site, paths in FILES.items():
+        problem = site_problem(site)
+        if problem:
+            missing_files.append(problem)
+        if os.path.exists(paths["csv"]):
+            try:
+                df = read_site(site)
+                if not df.empty:
+                    dfs.append(df)
+                    age = (pd.Timestamp.now(tz='UTC') - df['scraped_at'].max()).total_seconds()
+                    found_files.append(f"{site}: {len(df)} matches · {fmt_age(age)} old")
+                else:
+                    missing_files.append(f"{site}: File exists but empty")
+            except Exception as e:
+                missing_files.append(f"{site}: Error - {e}")
+        else:
+            missing_files.append(f"{site}: File not found at {paths['csv']}")
+    
+    if dfs:
+        return pd.concat(dfs, ignore_index=True), found_files, missing_files
+    return pd.DataFrame(), found_files, missing_files
+
+EVENT_KEYS = ['normalized_home', 'normalized_away', 'date']
+# a streamed row replaces its book's earlier row for the same fixture; its prices arrive as "" when missing
+STREAM_KEYS = EVENT_KEYS + ['start_time']
+
+def snapshot_manifest() -> Dict[str, Tuple[int, int]]:
+    """(mtime_ns, size) of each site's CSV; a scrape that rewrites a file changes its entry."""
+    manifest = {}
+    for site, paths in FILES.items():
+        try:
+            info = os.stat(paths["csv"])
+            manifest[site] = (info.st_mtime_ns, info.st_size)
+        except OSError:
+            pass
+    return manifest
+
+# How old a book's price may be before it is left out of cross-book comparisons
+DEFAULT_STALENESS = pd.Timedelta(minutes=15)
+MAX_STALENESS: Dict[str, pd.Timedelta] = {}
+
+def parse_scraped_at(df: pd.DataFrame, fallback: float = None) -> pd.Series:
+    """scraped_at as UTC timestamps; rows from files written before the column existed get `fallback` (epoch s)."""
+    ts = pd.to_datetime(df['scraped_at'], utc=True, errors='coerce') if 'scraped_at' in df.columns \
+        else pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns, UTC]')
+    if fallback is not None:
+        ts = ts.fillna(pd.Timestamp(fallback, unit='s', tz='UTC'))
+    return ts
+
+def read_site(site: str) -> pd.DataFrame:
+    """One site's rows with normalized team names and scrape times (empty when missing)."""
+    path = FILES[site]["csv"]
+    df = pd.read_csv(path)
+    df['normalized_home'] = normalize_teams(df['home_team'])
+    df['normalized_away'] = normalize_teams(df['away_team'])
+    df['scraped_at'] = parse_scraped_at(df, fallback=os.path.getmtime(path))
+    return df
+
+def staleness_for(books, max_staleness: Dict[str, pd.Timedelta] = None,
+                  default: pd.Timedelta = None) -> pd.Series:
+    """Per-row staleness limit for a column of book names."""
+    limits = {**MAX_STALENESS, **(max_staleness or {})}
+    default = DEFAULT_STALENESS if default is None else default
+    return pd.Series(books).map(limits).fillna(default).to_numpy()
+
+def fresh_rows(df: pd.DataFrame, now: pd.Timestamp = None, max_staleness: Dict[str, pd.Timedelta] = None,
+               default: pd.Timedelta = None) -> pd.DataFrame:
+    """Drop rows older than their book's max staleness at `now`, so stale files can't pair with fresh ones."""
+    if 'scraped_at' not in df.columns or df.empty:
+        return df
+    now = now or pd.Timestamp.now(tz='UTC')
+    age = now - df['scraped_at']
+    return df[(age <= staleness_for(df['source'], max_staleness, default)).to_numpy()]
+
+def load_history(sites: List[str] = None) -> pd.DataFrame:
+    """Every stored snapshot row, sorted by scrape time."""
+    dfs = []
+    for site in sites or FILES:
+        path = FILES[site]["history"]
+        if os.path.exists(path):
+            df = pd.read_csv(path)
+            df['scraped_at'] = parse_scraped_at(df)
+            dfs.append(df.dropna(subset=['scraped_at']))
+    if not dfs:
+        return pd.DataFrame()
+    hist = pd.concat(dfs, ignore_index=True)
+    hist['normalized_home'] = normalize_teams(hist['home_team'])
+    hist['normalized_away'] = normalize_teams(hist['away_team'])
+    return hist.sort_values('scraped_at', kind='stable', ignore_index=True)
+
+def asof_view(history: pd.DataFrame, at, max_staleness: Dict[str, pd.Timedelta] = None,
+              default: pd.Timedelta = None) -> pd.DataFrame:
+    """Each book's latest row per event as of time(s) `at`, within that book's staleness.
+    
+    `at` may be one timestamp or a sequence; the result has an `asof` column and
+    an `age` column per row. Uses one sorted merge_asof over the whole history
+    instead of filtering it once per time.
+    """
+    if history.empty:
+        return history
+    times = pd.to_datetime(pd.Series(list(at) if pd.api.types.is_list_like(at) else [at]), utc=True)
+    keys = EVENT_KEYS + ['source']
+    pairs = history[keys].drop_duplicates()
+    left = pairs.merge(pd.DataFrame({'asof': times}), how='cross').sort_values('asof', kind='stable')
+    limits = {**MAX_STALENESS, **(max_staleness or {})}
+    widest = max([DEFAULT_STALENESS if default is None else default] + list(limits.values()))
+    view = pd.merge_asof(left, history.sort_values('scraped_at', kind='stable'),
+                         left_on='asof', right_on='scraped_at', by=keys,
+                         direction='backward', tolerance=widest)
+    view = view.dropna(subset=['scraped_at'])
+    view['age'] = view['asof'] - view['scraped_at']
+    return view[(view['age'] <= staleness_for(view['source'], max_staleness, default)).to_numpy()].reset_index(drop=True)
+
+def changed_events(old: pd.DataFrame, new: pd.DataFrame) -> set:
+    """Event keys whose rows differ between two snapshots of the same site."""
+    both = pd.concat([old, new], ignore_index=True)
+    if both.empty:
+        return set()
+    diff = both.astype(str).drop_duplicates(keep=False)  # rows present in only one snapshot
+    return set(map(tuple, both.loc[diff.index, EVENT_KEYS].to_numpy().tolist()))
+
+class LiveAnalysis:
+    """Analysis state shared by every consumer (dashboard sessions, the service).
+    
+    poll() stats the site files and, when one changed, reloads only that site
+    and re-solves only the events whose rows changed. Sessions that poll
+    between scrapes just compare manifests, so CPU per viewer stays flat.
+    ingest() is the same from streamed rows (row_stream.py) instead of files,
+    fed quote by quote into a PriceIndex so a row only re-checks the covers
+    its prices belong to; feed one LiveAnalysis from either, not both. Both
+    also re-solve events whose open opportunity has a leg past its book's
+    staleness limit, so those close even when no new rows arrive.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.manifest: Dict[str, Tuple[int, int]] = {}
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.streamed: Dict[str, set] = {}   # book → row keys seen since its last end-of-scrape
+        self.index = PriceIndex()
+        self.index.subscribe(self._on_cover)
+        self.covers: Dict[tuple, set] = {}    # event → its covers open in the index
+        self.quotes: Dict[tuple, List[tuple]] = {}   # (book, row key) → the (market, outcome)s it quotes
+        self.quoted_at: Dict[tuple, float] = {}      # (event, market, outcome, book) → epoch s it was read
+        self.books: Dict[tuple, Dict[str, int]] = {}   # event → live quotes per book
+        self._touched: set = set()
+        self.names: Dict[tuple, tuple] = {}   # event → (home_team, away_team, start_time) as shown
+        self.opps: Dict[tuple, List[Dict]] = {}
+        self.expires: Dict[tuple, float] = {}   # event → epoch s its first open leg goes stale
+        self.changed: set = set()
+        self.version = 0
+        self.updated_at = None
+        self.table = pd.DataFrame()
+    
+    def poll(self) -> List[Dict]:
+        """Apply any new snapshots and return what changed.
+        
+        Each change is {'type': 'open'|'update'|'close', 'key', 'market',
+        'opportunity', 'latency_ms'}; latency is from the triggering file's
+        write time to now. An empty list means nothing changed.
+        """
+        with self.lock:
+            expired, expired_at = self._expired()
+            manifest = snapshot_manifest()
+            stale = [s for s in FILES if manifest.get(s) != self.manifest.get(s)]
+            if not stale:
+                return self._resolve(expired, expired_at) if expired else []
+            
+            touched = set()
+            for site in stale:
+                try:
+                    new = read_site(site) if site in manifest else pd.DataFrame()
+                except Exception:
+                    manifest.pop(site, None)  # half-written file, retry next poll
+                    continue
+                touched |= changed_events(self.frames.get(site, pd.DataFrame()), new)
+                self.frames[site] = new
+            self.manifest = manifest
+            if touched:
+                written = max((manifest[s][0] for s in stale if s in manifest), default=time.time_ns())
+            elif expired:
+                written = expired_at
+            else:
+                return []
+            return self._resolve(touched | expired, written)
+    
+    def ingest(self, records: List[Dict]) -> List[Dict]:
+        """Apply streamed rows and end-of-scrape markers; returns what changed, as poll() does.
+        
+        Rows replace the same fixture's earlier row from their book; an end marker
+        drops the rows its books no longer showed in that scrape, and quotes past
+        their book's staleness limit are withdrawn. Latency is from the newest
+        row's read time to now.
+        """
+        with self.lock:
+            now = time.time()
+            self._touched = set()
+            expired, written = self._expired()
+            if expired:
+                for (event, market, outcome, book), at in list(self.quoted_at.items()):
+                    if event in expired and now - at > self._limit(book):
+                        self._set(event, market, outcome, book, None)
+            else:
+                written = time.time_ns()
+            by_book: Dict[str, List[Dict]] = {}
+            for r in reversed(records):   # a Batch keeps a fixture's first row: newest first
+                if 'end' not in r:
+                    by_book.setdefault(r.get('source', ''), []).append(r)
+            if by_book:
+                # the scrapers' own row type, so prices get the dtypes read_csv gives the files
+                new = pd.concat([Batch(rows).to_frame() for rows in by_book.values()], ignore_index=True)
+                new['normalized_home'] = normalize_teams(new['home_team'])
+                new['normalized_away'] = normalize_teams(new['away_team'])
+                new['scraped_at'] = parse_scraped_at(new, fallback=now)
+                written = new['scraped_at'].max().value
+                for book, part in new.groupby('source', sort=False):
+                    old = self.frames.get(book)
+                    both = part if old is None else pd.concat([old, part], ignore_index=True)
+                    self.frames[book] = both.drop_duplicates(STREAM_KEYS, keep='last', ignore_index=True)
+                    self.streamed.setdefault(book, set()).update(map(tuple, part[STREAM_KEYS].to_numpy().tolist()))
+                for row in new.itertuples(index=False):
+                    self._quote(row, now)
+            for end in (r for r in records if 'end' in r):
+                for book in end.get('sources', []):
+                    seen, frame = self.streamed.pop(book, set()), self.frames.get(book)
+                    if frame is None or frame.empty:
+                        continue
+                    gone = ~pd.MultiIndex.from_frame(frame[STREAM_KEYS]).isin(list(seen))
+                    for key in map(tuple, frame.loc[gone, STREAM_KEYS].to_numpy().tolist()):
+                        self._unquote(book, key)
+                    self.frames[book] = frame[~gone]
+
+            touched = self._touched | expired
+            if not touched:
+                return []
+            before = {(k, o['market']): o for k in touched for o in self.opps.get(k, [])}
+            for event in touched:
+                # as price_table: an event only pairs up once two books quote it
+                opps = [] if len(self.books.get(event, ())) < 2 else \
+                    [o for o in (self._from_index(event, c, now) for c in self.covers.get(event, ())) if o]
+                if opps:
+                    self.opps[event] = sorted(opps, key=lambda o: o['market'])
+                else:
+                    self.opps.pop(event, None)
+            return self._publish(touched, before, written)
+    
+    def _limit(self, book: str) -> float:
+        return pd.Timedelta(staleness_for([book])[0]).total_seconds()
+    
+    def _quote(self, row, now: float):
+        """Put one streamed row's prices in the index, withdrawing what its earlier row quoted and it doesn't."""
+        book, key = row.source, (row.normalized_home, row.normalized_away, row.date, row.start_time)
+        event, at = key[:3], row.scraped_at.timestamp()
+        self.names[event] = (row.home_team, row.away_team, row.start_time)
+        quotes = {}
+        if now - at <= self._limit(book):     # as fresh_rows: a stale row pairs with nothing
+            quotes = {('1X2', o): getattr(row, f'odds_{o}') for o in ('home', 'draw', 'away')}
+            if row.total_line == row.total_line:
+                market = f"Total {row.total_line:g}"
+                quotes.update({(market, 'over'): row.over, (market, 'under'): row.under})
+        self._unquote(book, key, keep=quotes)
+        for (market, outcome), price in quotes.items():
+            self._set(event, market, outcome, book, price, at)
+        self.quotes[(book, key)] = list(quotes)
+    
+    def _unquote(self, book: str, key: tuple, keep=()):
+        for market, outcome in self.quotes.pop((book, key), []):
+            if (market, outcome) not in keep:
+                self._set(key[:3], market, outcome, book, None)
+    
+    def _set(self, event: tuple, market: str, outcome: str, book: str, price: Optional[float], at: float = 0.0):
+        """One quote into the index, keeping read times and the per-event book counts in step."""
+        self.index.update(event, market, outcome, book, price)
+        key, books = (event, market, outcome, book), self.books.setdefault(event, {})
+        if price is not None and price > 1.0:
+            if key not in self.quoted_at:
+                books[book] = books.get(book, 0) + 1
+            self.quoted_at[key] = at
+        elif self.quoted_at.pop(key, None) is not None:
+            books[book] -= 1
+            if not books[book]:
+                del books[book]
+        if not books:
+            del self.books[event]
+        self._touched.add(event)
+    
+    def _on_cover(self, kind: str, opp: Dict):
+        covers = self.covers.setdefault(opp['event'], set())
+        if kind == 'close':
+            covers.discard(opp['cover'])
+        else:
+            covers.add(opp['cover'])
+    
+    def _from_index(self, event: tuple, cover: str, now: float, total_stake: float = 100) -> Optional[Dict]:
+        """An open index cover as find_arbitrage_opportunities / find_totals_opportunities give it."""
+        found = self.index.open.get((event, cover))
+        if found is None or not (cover == '1X2' or cover.startswith('Total ')):
+            return None     # cross-market covers aren't reported, as in find_*_opportunities
+        legs = {leg['outcome']: leg for leg in found['legs']}
+        home, away, start = self.names[event]
+        market = '1X2' if cover == '1X2' else f"O/U {cover[len('Total '):]}"
+        opp = {'market': market, 'home_team': home, 'away_team': away, 'date': event[2], 'start_time': start}
+        if cover != '1X2':
+            opp['total_line'] = float(cover.split()[1])
+        returns = total_stake / found['implied']
+        opp.update({'profit_margin': found['profit_margin'], 'profit_amount': returns - total_stake})
+        for o, leg in legs.items():
+            opp.update({f'best_{o}_odds': leg['price'], f'best_{o}_source': leg['book'],
+                        f'stake_{o}': total_stake * leg['stake_fraction']})
+        opp.update({'total_stake': total_stake, 'guaranteed_return': returns})
+        for o, leg in legs.items():
+            opp[f'age_{o}_s'] = now - self.quoted_at[(event, leg['market'], o, leg['book'])]
+        return opp
+    
+    def _expired(self) -> Tuple[set, int]:
+        """Events whose opportunity has a leg gone stale, and when the first went (epoch ns)."""
+        now = time.time()
+        due = {k: t for k, t in self.expires.items() if t <= now}
+        return set(due), int(min(due.values(), default=now) * 1e9)
+    
+    @staticmethod
+    def _expiry(opp: Dict, solved_at: float) -> float:
+        """Epoch s the opportunity's oldest leg crosses its book's staleness limit (inf without ages)."""
+        outcomes = [c[len('age_'):-len('_s')] for c in opp if c.startswith('age_') and c.endswith('_s')]
+        if not outcomes:
+            return float('inf')
+        limits = pd.to_timedelta(staleness_for([opp[f'best_{o}_source'] for o in outcomes])).total_seconds()
+        return solved_at + min(lim - opp[f'age_{o}_s'] for o, lim in zip(outcomes, limits))
+    
+    def _resolve(self, touched: set, written: int) -> List[Dict]:
+        """Re-solve the touched events and diff their opportunities (caller holds the lock)."""
+        # re-solve only the touched events, across every book quoting them
+        frames = [f for f in self.frames.values() if not f.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=EVENT_KEYS)
+        keys = pd.MultiIndex.from_frame(df[EVENT_KEYS])
+        sub = df[keys.isin(list(touched))]
+        before = {(k, o['market']): o for k in touched for o in self.opps.pop(k, [])}
+        if not sub.empty:
+            for opp in find_arbitrage_opportunities(sub) + find_totals_opportunities(sub):
+                k = (normalize_team_name(opp['home_team']), normalize_team_name(opp['away_team']), opp['date'])
+                opp = {'market': f"O/U {opp['total_line']:g}" if 'total_line' in opp else '1X2', **opp}
+                self.opps.setdefault(k, []).append(opp)
+        
+        return self._publish(touched, before, written)
+    
+    def _publish(self, touched: set, before: Dict, written: int) -> List[Dict]:
+        """Diff the touched events' opportunities against `before` and bump the version."""
+        after = {(k, o['market']): o for k in touched for o in self.opps.get(k, [])}
+        solved_at = time.time()
+        for k in touched:
+            if self.opps.get(k):
+                self.expires[k] = min(self._expiry(o, solved_at) for o in self.opps[k])
+            else:
+                self.expires.pop(k, None)
+        
+        self.changed = touched
+        self.version += 1
+        self.updated_at = datetime.now()
+        self.table = self._build_table()
+        
+        latency_ms = (time.time_ns() - written) / 1e6
+        events = []
+        for ident in after.keys() | before.keys():
+            old, new = before.get(ident), after.get(ident)
+            if new is None:
+                kind = 'close'
+            elif old is None:
+                kind = 'open'
+            elif new == old:
+                continue
+            else:
+                kind = 'update'
+            events.append({'type': kind, 'key': list(ident[0]), 'market': ident[1],
+                           'opportunity': new or old, 'latency_ms': latency_ms})
+        return events
+    
+    def _build_table(self) -> pd.DataFrame:
+        rows = []
+        for k, opps in self.opps.items():
+            for opp in opps:
+                rows.append({'new': '🆕' if k in self.changed else '', **{
+                    c: opp.get(c) for c in ['market', 'home_team', 'away_team', 'date', 'start_time',
+                                            'profit_margin', 'profit_amount']}})
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).sort_values('profit_margin', ascending=False, ignore_index=True)
+
+def price_table(df: pd.DataFrame, event_keys: List[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Scraped rows → (long price table, event lookup) for events quoted by 2+ books."""
+    prices, events = arbitrage.to_long(df, event_keys or EVENT_KEYS)
+    # Need at least 2 bookmakers
+    books = prices.groupby('event')['book'].nunique()
+    return prices[prices['event'].map(books).to_numpy() >= 2], events
+
+def solve_frame(df: pd.DataFrame, total_stake: float = 100,
+                event_keys: List[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Scraped rows → (opportunities, legs, event lookup) for events quoted by 2+ books."""
+    prices, events = price_table(df, event_keys)
+    opps, legs = arbitrage.solve(prices, total_stake)
+    return opps, legs, events
+
+def solve_covers(df: pd.DataFrame, total_stake: float = 100, balances: Dict[str, float] = None,
+                 limits: Dict[str, float] = None, max_staleness: Dict[str, pd.Timedelta] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Run the generic solver over every market in the scraped rows.
+    
+    With balances, all opportunities also get whole-rand stakes from one
+    stakes.optimize_stakes run, so 1X2 and totals draw on the same accounts.
+    Rows older than their book's max staleness are left out first.
+    Returns (opportunities, legs pivoted by outcome, event lookup, long
+    price table); the price table is kept for find_value_bets.
+    """
+    df = fresh_rows(df, max_staleness=max_staleness)
+    prices, events = price_table(df)
+    opps, legs = arbitrage.solve(prices, total_stake)
+    values = ['price', 'book', 'stake']
+    if 'scraped_at' in legs.columns:
+        legs['age_s'] = (pd.Timestamp.now(tz='UTC') - pd.to_datetime(legs['scraped_at'], utc=True)).dt.total_seconds()
+        values.append('age_s')
+    if balances is not None:
+        import stakes
+        legs, plan = stakes.optimize_stakes(legs, balances, limits)
+        opps = opps.merge(plan[['event', 'cover', 'placed_total', 'placed_profit']],
+                          on=['event', 'cover'], how='left')
+        values.append('placed')
+    wide = legs.pivot(index=['event', 'cover'], columns='outcome', values=values)
+    return opps, wide, events, prices
+
+def _ages(leg, outcomes: List[str]) -> Dict:
+    """Age in seconds of each leg's price, empty when rows carry no scrape time."""
+    if ('age_s', outcomes[0]) not in leg.index:
+        return {}
+    return {f'age_{o}_s': leg[('age_s', o)] for o in outcomes}
+
+def _placed(opp, leg, outcomes: List[str]) -> Dict:
+    """Rounded stakes for one opportunity, empty when no plan was computed."""
+    if 'placed_total' not in opp._fields:
+        return {}
+    out = {f'placed_{o}': leg[('placed', o)] for o in outcomes}
+    out['placed_total'] = opp.placed_total
+    out['placed_profit'] = opp.placed_profit
+    return out
+
+def find_arbitrage_opportunities(df: pd.DataFrame, total_stake: float = 100, solved: Tuple = None) -> List[Dict]:
+    """Find arbitrage opportunities across different bookmakers."""
+    opps, wide, events, _ = solved or solve_covers(df, total_stake)
+    opportunities = []
+    
+    for opp in opps[opps['cover'] == '1X2'].itertuples(index=False):
+        leg = wide.loc[(opp.event, opp.cover)]
+        ev = events.loc[opp.event]
+        opportunities.append({
+            'home_team': ev['home_team'],
+            'away_team': ev['away_team'],
+            'date': ev['date'],
+            'start_time': ev['start_time'],
+            'profit_margin': opp.profit_margin,
+            'profit_amount': opp.profit_amount,
+            'best_home_odds': leg[('price', 'home')],
+            'best_home_source': leg[('book', 'home')],
+            'stake_home': leg[('stake', 'home')],
+            'best_draw_odds': leg[('price', 'draw')],
+            'best_draw_source': leg[('book', 'draw')],
+            'stake_draw': leg[('stake', 'draw')],
+            'best_away_odds': leg[('price', 'away')],
+            'best_away_source': leg[('book', 'away')],
+            'stake_away': leg[('stake', 'away')],
+            'total_stake': total_stake,
+            'guaranteed_return': opp.guaranteed_return,
+            **_ages(leg, ['home', 'draw', 'away']),
+            **_placed(opp, leg, ['home', 'draw', 'away'])
+        })
+    
+    return opportunities
+
+def find_totals_opportunities(df: pd.DataFrame, total_stake: float = 100, solved: Tuple = None) -> List[Dict]:
+    """Find two-way over/under arbitrage across bookmakers, per match and totals line."""
+    if df.empty or 'total_line' not in df.columns:
+        return []
+    opps, wide, events, _ = solved or solve_covers(df, total_stake)
+    opportunities = []
+    
+    # prices on different lines are different markets ("Total 2.5" vs "Total 3.5")
+    for opp in opps[opps['cover'].str.startswith('Total ')].itertuples(index=False):
+        leg = wide.loc[(opp.event, opp.cover)]
+        ev = events.loc[opp.event]
+        opportunities.append({
+            'home_team': ev['home_team'],
+            'away_team': ev['away_team'],
+            'date': ev['date'],
+            'start_time': ev['start_time'],
+            'total_line': float(opp.cover.split()[1]),
+            'profit_margin': opp.profit_margin,
+            'profit_amount': opp.profit_amount,
+            'best_over_odds': leg[('price', 'over')],
+            'best_over_source': leg[('book', 'over')],
+            'stake_over': leg[('stake', 'over')],
+            'best_under_odds': leg[('price', 'under')],
+            'best_under_source': leg[('book', 'under')],
+            'stake_under': leg[('stake', 'under')],
+            'total_stake': total_stake,
+            'guaranteed_return': opp.guaranteed_return,
+            **_ages(leg, ['over', 'under']),
+            **_placed(opp, leg, ['over', 'under'])
+        })
+    
+    return opportunities
+
+def find_value_bets(df: pd.DataFrame, method: str = 'proportional', min_edge: float = 0.0,
+                    solved: Tuple = None) -> pd.DataFrame:
+    """Prices above the consensus fair odds of all books, with match details.
+    
+    Reuses the fresh price table from solve_covers, so the dashboard pays
+    for one margin-removal pass per refresh on top of the solver.
+    """
+    import fair_odds
+    *_, events, prices = solved or solve_covers(df)
+    _, bets = fair_odds.value_bets(prices, method, min_edge)
+    ev = events.loc[bets['event'], ['home_team', 'away_team', 'date', 'start_time']].reset_index(drop=True)
+    return pd.concat([ev, bets.drop(columns='event')], axis=1)
+
+MATCH_COLS = ['match', 'date', 'home_team', 'away_team', 'bookmakers', 'is_arbitrage',
+              'total_implied_prob', 'profit_margin']
+
+def analyze_matches(df: pd.DataFrame) -> pd.DataFrame:
+    """Best 1X2 prices, implied probabilities and margin for every match, arb or not."""
+    prices, events = arbitrage.to_long(df)
+    opps, legs = arbitrage.solve(prices[prices['market'] == '1X2'], only_arbs=False)
+    if opps.empty:
+        return pd.DataFrame(columns=MATCH_COLS)
+    wide = legs.pivot(index='event', columns='outcome', values=['price', 'book']).loc[opps['event']]
+    ev = events.loc[opps['event']]
+    rows = df.groupby(['normalized_home', 'normalized_away', 'date'], sort=False).size().to_numpy()
+    out = pd.DataFrame({
+        'match': (ev['home_team'] + " vs " + ev['away_team']).to_numpy(),
+        'date': ev['date'].to_numpy(),
+        'home_team': ev['home_team'].to_numpy(),
+        'away_team': ev['away_team'].to_numpy(),
+        'bookmakers': rows[opps['event'].to_numpy()],
+    })
+    for o in ['home', 'draw', 'away']:
+        out[f'best_{o}_odds'] = wide[('price', o)].to_numpy(dtype=float)
+        out[f'{o}_source'] = wide[('book', o)].to_numpy()
+        out[f'implied_prob_{o}'] = 100 / out[f'best_{o}_odds']
+    implied = opps['implied'].to_numpy(dtype=float)
+    out['total_implied_prob'] = implied * 100
+    out['is_arbitrage'] = implied < 1.0
+    out['profit_margin'] = ((1 / implied - 1) * 100).clip(min=0)
+    # solve() already sorts by margin, so arbitrage opportunities come first
+    return out
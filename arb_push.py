@@ -0,0 +1,380 @@
+# Live push feed of best prices and opportunities: one analysis, any number of viewers
+# One LiveAnalysis polls the snapshots; each change is encoded once and fanned out as
+# server-sent events, so an open dashboard or tool costs a socket instead of a re-analysis
+# Viewers: GET /events    text/event-stream, a snapshot first and then open/update/close/best
+#                         events; reconnecting with Last-Event-ID resumes where it left off
+#          GET /snapshot  the current state as JSON
+#          ui.py follows a feed instead of loading and analysing the files itself when
+#          ARB_PUSH_URL is set (opportunities, best prices and the match breakdown)
+# run: python arb_push.py                              (serve on 127.0.0.1:8790)
+#      python arb_push.py --port 8790 --min-margin 0.5
+#      python arb_push.py --bench 500 --events 2000    (fan-out benchmark, synthetic events)
+
+import argparse, itertools, json, socket, statistics, sys, threading, time
+import urllib.request
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import pandas as pd
+
+import arb_core, arb_service
+
+HEARTBEAT_S = 15        # comment line sent to idle streams, so dead clients are noticed
+NEW_S = 60              # a viewer marks opportunities that changed this recently
+
+
+def frame(seq: int, event: str, data) -> bytes:
+    """One SSE message."""
+    return f"id: {seq}\nevent: {event}\ndata: {arb_service.to_ndjson([data])}\n".encode("utf-8")
+
+
+def read_events(stream) -> Iterator[Tuple[Optional[int], str, Dict]]:
+    """(id, event, data) from a text/event-stream response, as messages complete."""
+    seq, event, data = None, "message", []
+    for raw in stream:
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if not line:
+            if data:
+                yield seq, event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue    # heartbeat
+        else:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "id": seq = int(value)
+            elif field == "event": event = value
+            elif field == "data": data.append(value)
+
+
+def apply(opps: Dict[tuple, Dict], best: Dict[tuple, Dict], r: Dict):
+    """Fold one event into the (event, market) → opportunity and event → best price maps."""
+    key = tuple(r["key"])
+    if r["type"] == "best":
+        if r.get("gone"): best.pop(key, None)
+        else: best[key] = r
+    elif r["type"] == "close":
+        opps.pop((key, r["market"]), None)
+    else:
+        opps[(key, r["market"])] = r
+
+
+def best_prices(state: arb_core.LiveAnalysis, keys) -> List[Dict]:
+    """A "best" record per event: the top fresh 1X2 price and its book, and how many books quote
+    it; `gone` when nobody does."""
+    with state.lock:
+        frames = [f for f in state.frames.values() if not f.empty]
+    ts = datetime.now(timezone.utc).isoformat()
+    found = {}
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+        df = arb_core.fresh_rows(df[pd.MultiIndex.from_frame(df[arb_core.EVENT_KEYS]).isin(list(keys))])
+        for key, g in df.groupby(arb_core.EVENT_KEYS, sort=False):
+            rec = {"type": "best", "ts": ts, "key": list(key), "home_team": g["home_team"].iloc[0],
+                   "away_team": g["away_team"].iloc[0], "start_time": g["start_time"].iloc[0],
+                   "books": int(g["source"].nunique())}
+            for o in ("home", "draw", "away"):
+                col = g[f"odds_{o}"]
+                i = col.idxmax() if col.notna().any() else None
+                rec[o] = None if i is None else {"price": float(col[i]), "book": g.at[i, "source"]}
+            found[tuple(key)] = rec
+    return [found.get(tuple(k)) or {"type": "best", "ts": ts, "key": list(k), "gone": True} for k in keys]
+
+
+class Feed:
+    """Current state plus the last `keep` events, each encoded once and read by every client.
+
+    publish() and snapshot() share one lock, so a client that starts from a snapshot's
+    sequence number misses nothing and sees nothing twice.
+    """
+
+    def __init__(self, keep: int = 4096):
+        self.cond = threading.Condition()
+        self.log: deque = deque(maxlen=keep)     # (seq, encoded message)
+        self.seq = 0
+        self.opps: Dict[tuple, Dict] = {}
+        self.best: Dict[tuple, Dict] = {}
+        self.clients = 0
+
+    def publish(self, records: List[Dict]):
+        if not records:
+            return
+        with self.cond:
+            for r in records:
+                apply(self.opps, self.best, r)
+                self.seq += 1
+                self.log.append((self.seq, frame(self.seq, r["type"], r)))
+            self.cond.notify_all()
+
+    def snapshot(self) -> Tuple[int, Dict]:
+        with self.cond:
+            return self.seq, {"seq": self.seq, "opportunities": list(self.opps.values()),
+                              "best": list(self.best.values())}
+
+    def since(self, seq: int, timeout: float) -> Optional[List[Tuple[int, bytes]]]:
+        """Messages after `seq`, waiting up to `timeout` for one; None when `seq` is no longer in the log."""
+        with self.cond:
+            if seq == self.seq:
+                self.cond.wait(timeout)
+            if seq == self.seq:
+                return []
+            if seq > self.seq or not self.log or self.log[0][0] > seq + 1:
+                return None
+            return list(itertools.islice(self.log, seq + 1 - self.log[0][0], None))
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    feed: Feed = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/events":
+            return self._stream()
+        if path == "/snapshot":
+            body, status = arb_service.to_ndjson([self.feed.snapshot()[1]]), 200
+        else:
+            body, status = "not found\n", 404
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json" if status == 200 else "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self):
+        feed = self.feed
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        last = self.headers.get("Last-Event-ID", "")
+        seq = int(last) if last.isdigit() else -1
+        with feed.cond:
+            feed.clients += 1
+        try:
+            while True:
+                out = feed.since(seq, HEARTBEAT_S) if seq >= 0 else None
+                if out is None:     # new, or fell behind the log: start over from the state
+                    seq, snap = feed.snapshot()
+                    self.wfile.write(frame(seq, "snapshot", snap))
+                elif out:
+                    seq = out[-1][0]
+                    self.wfile.write(b"".join(m for _, m in out))
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except OSError:
+            pass    # viewer went away
+        finally:
+            with feed.cond:
+                feed.clients -= 1
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024   # hundreds of viewers may (re)connect at once
+
+
+def serve(feed: Feed, port: int = 8790, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve `feed` from background threads and return the server (shutdown() to stop)."""
+    handler = type("PushHandler", (Handler,), {"feed": feed})
+    server = Server((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="arb-push", daemon=True).start()
+    return server
+
+
+def watch(feed: Feed, interval: float = 1.0, min_margin: float = 0.0, state: arb_core.LiveAnalysis = None):
+    """Poll the snapshots and publish every change once: opportunities, then the touched events' best prices."""
+    state = state or arb_core.LiveAnalysis()
+    seen, sent = state.version, set()
+    while True:
+        t0 = time.perf_counter()
+        try:
+            changes = state.poll()
+            detect_ms = (time.perf_counter() - t0) * 1000
+            records = arb_service.to_records(changes, detect_ms, min_margin, sent)
+            if state.version != seen:
+                seen = state.version
+                records += best_prices(state, state.changed)
+        except Exception as e:
+            # viewers keep the last good state; the next snapshot change is tried afresh
+            print(f"poll failed: {type(e).__name__}: {e}", file=sys.stderr)
+            records = []
+        feed.publish(records)
+        if records:
+            print(f"v{state.version}: {len(records)} event(s) to {feed.clients} viewer(s) · detect {detect_ms:.0f}ms",
+                  file=sys.stderr)
+        time.sleep(max(0.0, interval - (time.perf_counter() - t0)))
+
+
+class Follower:
+    """This process's copy of a feed's state, kept current by a background reader (for viewers)."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.lock = threading.Lock()
+        self.opps: Dict[tuple, Dict] = {}
+        self.best: Dict[tuple, Dict] = {}
+        self.arrived: Dict[tuple, float] = {}
+        self.seq: Optional[int] = None
+        self.updated_at: Optional[datetime] = None
+        self.connected = False
+        threading.Thread(target=self._follow, name="arb-push-follow", daemon=True).start()
+
+    def _follow(self):
+        while True:
+            headers = {} if self.seq is None else {"Last-Event-ID": str(self.seq)}
+            try:
+                req = urllib.request.Request(self.url + "/events", headers=headers)
+                with urllib.request.urlopen(req, timeout=HEARTBEAT_S * 2) as resp:
+                    self.connected = True
+                    for seq, event, data in read_events(resp):
+                        self._apply(seq, event, data)
+            except (OSError, ValueError):
+                pass
+            self.connected = False
+            time.sleep(1)   # feed restarting: retry, resuming from the last id
+
+    def _apply(self, seq: int, event: str, data: Dict):
+        with self.lock:
+            if event == "snapshot":
+                self.opps, self.best, self.arrived = {}, {}, {}
+                for r in data["opportunities"] + data["best"]:
+                    apply(self.opps, self.best, r)
+            else:
+                apply(self.opps, self.best, data)
+                self.arrived[tuple(data["key"])] = time.time()
+            self.seq, self.updated_at = seq, datetime.now()
+
+    def table(self) -> pd.DataFrame:
+        """Open opportunities in LiveAnalysis.table's layout, best margin first."""
+        now = time.time()
+        with self.lock:
+            rows = [{"new": "🆕" if now - self.arrived.get(k, 0) < NEW_S else "", **{
+                c: opp.get(c) for c in ["market", "home_team", "away_team", "date", "start_time",
+                                        "profit_margin", "profit_amount"]}} for (k, _), opp in self.opps.items()]
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).sort_values("profit_margin", ascending=False, ignore_index=True)
+
+    def opportunities(self, market: str = "1X2") -> List[Dict]:
+        """Open opportunities on `market` ("O/U" for every totals line) as find_*_opportunities gives them."""
+        with self.lock:
+            found = [o for (_, m), o in self.opps.items() if m == market or (market == "O/U" and m.startswith("O/U"))]
+        return sorted(found, key=lambda o: o["profit_margin"], reverse=True)
+
+    def matches(self) -> pd.DataFrame:
+        """Every event's best fresh 1X2 prices in arb_core.analyze_matches' layout, arbitrage first."""
+        with self.lock:
+            best = [r for r in self.best.values() if all(r.get(o) for o in ("home", "draw", "away"))]
+        rows = []
+        for r in best:
+            row = {"match": f"{r['home_team']} vs {r['away_team']}", "date": r["key"][2],
+                   "home_team": r["home_team"], "away_team": r["away_team"], "bookmakers": r.get("books")}
+            for o in ("home", "draw", "away"):
+                row.update({f"best_{o}_odds": r[o]["price"], f"{o}_source": r[o]["book"],
+                            f"implied_prob_{o}": 100 / r[o]["price"]})
+            implied = sum(row[f"implied_prob_{o}"] for o in ("home", "draw", "away"))
+            row.update({"total_implied_prob": implied, "is_arbitrage": implied < 100,
+                        "profit_margin": max(0.0, (100 / implied - 1) * 100)})
+            rows.append(row)
+        if not rows:
+            return pd.DataFrame(columns=arb_core.MATCH_COLS)
+        return pd.DataFrame(rows).sort_values("total_implied_prob", ignore_index=True)
+
+
+# ---------------- benchmark ----------------
+
+def _bench_client(port: int, events: int, lags: List[float], ready: threading.Barrier):
+    """One raw viewer: read `events` messages after the snapshot, noting publish → receipt lag."""
+    with socket.create_connection(("127.0.0.1", port), timeout=60) as s:
+        s.sendall(b"GET /events HTTP/1.1\r\nHost: bench\r\n\r\n")
+        stream = s.makefile("rb")
+        for line in iter(stream.readline, b"\r\n"):
+            pass    # response headers
+        ready.wait()
+        got, mine = -1, []      # the snapshot counts as -1
+        for seq, event, data in read_events(stream):
+            if event != "snapshot":
+                mine.append(time.time() - data["sent"])
+            got += 1
+            if got >= events:
+                break
+    lags.extend(mine)
+
+
+def bench(clients: int = 200, events: int = 2000, rate: float = 1000.0, port: int = 8791) -> Dict:
+    """`clients` local viewers, `events` synthetic updates published at `rate`/s; delivery lag and throughput.
+
+    Viewers run as threads in this process, so they share its CPU with the server: the
+    numbers are a floor for what separate viewer processes would see.
+    """
+    feed = Feed()
+    server = serve(feed, port)
+    lags: List[float] = []
+    ready = threading.Barrier(clients + 1)
+    threads = [threading.Thread(target=_bench_client, args=(port, events, lags, ready), daemon=True)
+               for _ in range(clients)]
+    try:
+        for t in threads:
+            t.start()
+        ready.wait()
+        while feed.clients < clients:
+            time.sleep(0.01)
+        cpu0, t0 = time.process_time(), time.perf_counter()
+        step = max(1, int(rate / 100))      # publish in 10 ms batches
+        for n in range(0, events, step):
+            feed.publish([{"type": "update", "key": [f"home {i % 500}", f"away {i % 500}", "2026-01-01"],
+                           "market": "1X2", "profit_margin": 1.0 + (i % 7) / 10, "sent": time.time()}
+                          for i in range(n, min(events, n + step))])
+            time.sleep(max(0.0, t0 + (n + step) / rate - time.perf_counter()))
+        for t in threads:
+            t.join(timeout=60)
+        wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+    finally:
+        server.shutdown()
+    lags.sort()
+    q = lambda p: round(lags[min(len(lags) - 1, int(len(lags) * p))] * 1000, 1) if lags else None
+    return {"clients": clients, "events": events, "rate": rate, "delivered": len(lags),
+            "expected": clients * events, "wall_s": round(wall, 2),
+            "deliveries_per_s": round(len(lags) / wall), "cpu_s": round(cpu, 2),
+            "lag_ms": {"p50": q(0.5), "p95": q(0.95), "p99": q(0.99), "max": q(1.0),
+                       "mean": round(statistics.mean(lags) * 1000, 1) if lags else None}}
+
+
+def main(argv: List[str] = None):
+    ap = argparse.ArgumentParser(description="Push live best prices and opportunities to many viewers (SSE).")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8790)
+    ap.add_argument("--interval", type=float, default=1.0, help="seconds between polls of the snapshots")
+    ap.add_argument("--min-margin", type=float, default=0.0, help="only push opportunities above this profit %%")
+    ap.add_argument("--max-age", type=float, help="minutes before a book's prices count as stale")
+    ap.add_argument("--bench", type=int, metavar="CLIENTS", help="fan-out benchmark with this many local viewers")
+    ap.add_argument("--events", type=int, default=2000, help="--bench: synthetic events to publish")
+    ap.add_argument("--rate", type=float, default=1000.0, help="--bench: events per second")
+    args = ap.parse_args(argv)
+    if args.max_age is not None:
+        arb_core.DEFAULT_STALENESS = pd.Timedelta(minutes=args.max_age)
+
+    if args.bench:
+        print(json.dumps(bench(args.bench, args.events, args.rate, args.port), indent=2))
+        return
+    feed = Feed()
+    serve(feed, args.port, args.host)
+    print(f"watching {arb_core.OUT_DIR}; viewers: http://{args.host}:{args.port}/events", file=sys.stderr)
+    try:
+        watch(feed, args.interval, args.min_margin)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
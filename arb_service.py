@@ -0,0 +1,156 @@
+# Headless arbitrage service: watch the output folder, emit opportunities as NDJSON
+# No browser or Streamlit needed, same core as the dashboard (arb_core.py)
+# run: python arb_service.py                            (NDJSON to stdout)
+#      python arb_service.py --out alerts.ndjson        (append to a file)
+#      python arb_service.py --webhook http://127.0.0.1:8000/arbs
+#      python arb_service.py --once                     (one pass, then exit)
+#      python betjets2.py --stream - | python arb_service.py --stream -   (rows as they're parsed, no files)
+#      python arb_service.py --stream unix:/tmp/arb.sock   (every scraper run with the same --stream)
+
+import argparse, json, sys, time
+import urllib.request
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+import arb_core, row_stream
+
+Sink = Callable[[List[Dict]], None]
+
+
+def _json_default(o):
+    # numpy scalars from the pandas rows
+    return o.item() if hasattr(o, "item") else str(o)
+
+
+def to_ndjson(records: List[Dict]) -> str:
+    return "".join(json.dumps(r, ensure_ascii=False, default=_json_default) + "\n" for r in records)
+
+
+def stdout_sink(records: List[Dict]):
+    sys.stdout.write(to_ndjson(records))
+    sys.stdout.flush()
+
+
+def file_sink(path: str) -> Sink:
+    def write(records: List[Dict]):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(to_ndjson(records))
+    return write
+
+
+def webhook_sink(url: str, timeout: float = 2.0) -> Sink:
+    def post(records: List[Dict]):
+        req = urllib.request.Request(url, data=to_ndjson(records).encode("utf-8"), method="POST",
+                                     headers={"Content-Type": "application/x-ndjson"})
+        try:
+            urllib.request.urlopen(req, timeout=timeout).close()
+        except Exception as e:
+            # an unreachable hook must not stop detection
+            print(f"webhook {url} failed: {e}", file=sys.stderr)
+    return post
+
+
+def to_records(changes: List[Dict], detect_ms: float, min_margin: float = 0.0,
+               sent: Optional[set] = None) -> List[Dict]:
+    """One alert record per LiveAnalysis.poll() change (opens/updates below `min_margin` left out).
+
+    `sent` holds the (key, market)s this caller's receivers have open: one that
+    drops below `min_margin` goes out as a close, one that rises to it as an
+    open, and closes of ones never sent are left out.
+    """
+    records = []
+    for c in changes:
+        opp, kind = c["opportunity"], c["type"]
+        below = kind != "close" and opp["profit_margin"] < min_margin
+        if sent is not None:
+            at = (tuple(c["key"]), c["market"])
+            if kind == "close" or below:
+                if at not in sent:
+                    continue
+                sent.discard(at)
+                kind = "close"
+            else:
+                kind = "update" if at in sent else "open"
+                sent.add(at)
+        elif below:
+            continue
+        records.append({"type": kind, "ts": datetime.now(timezone.utc).isoformat(),
+                        "key": c["key"], "market": c["market"],
+                        "latency_ms": round(c["latency_ms"], 1), "detect_ms": round(detect_ms, 1),
+                        **opp})
+    return records
+
+
+def run(sinks: List[Sink], interval: float = 1.0, once: bool = False, min_margin: float = 0.0,
+        state: arb_core.LiveAnalysis = None):
+    """Poll the snapshots, push open/update/close records to every sink."""
+    state = state or arb_core.LiveAnalysis()
+    latencies, sent = deque(maxlen=1000), set()
+    while True:
+        t0 = time.perf_counter()
+        changes = state.poll()
+        detect_ms = (time.perf_counter() - t0) * 1000
+        records = to_records(changes, detect_ms, min_margin, sent)
+        latencies.extend(r["latency_ms"] for r in records)
+        if records:
+            for sink in sinks:
+                sink(records)
+            lat = sorted(latencies)
+            print(f"{len(records)} alert(s) · latency p50 {lat[len(lat) // 2]:.0f}ms "
+                  f"p95 {lat[int(len(lat) * 0.95)]:.0f}ms · detect {detect_ms:.0f}ms", file=sys.stderr)
+        if once:
+            return
+        time.sleep(max(0.0, interval - (time.perf_counter() - t0)))
+
+
+def run_stream(sinks: List[Sink], target: str, min_margin: float = 0.0, state: arb_core.LiveAnalysis = None):
+    """Detect over rows streamed by the scrapers as they arrive (row_stream.py), not over their files."""
+    state, sent = state or arb_core.LiveAnalysis(), set()
+    for batch in row_stream.batches(target):
+        t0 = time.perf_counter()
+        changes = state.ingest(batch)
+        detect_ms = (time.perf_counter() - t0) * 1000
+        records = to_records(changes, detect_ms, min_margin, sent)
+        if records:
+            for sink in sinks:
+                sink(records)
+            print(f"{len(records)} alert(s) from {len(batch)} streamed record(s) · detect {detect_ms:.0f}ms",
+                  file=sys.stderr)
+
+
+def main(argv: List[str] = None):
+    ap = argparse.ArgumentParser(description="Headless arbitrage detection over the scraper output.")
+    ap.add_argument("--interval", type=float, default=1.0, help="seconds between polls")
+    ap.add_argument("--out", help="append NDJSON records to this file")
+    ap.add_argument("--webhook", help="POST NDJSON batches to this URL")
+    ap.add_argument("--quiet", action="store_true", help="don't write records to stdout")
+    ap.add_argument("--min-margin", type=float, default=0.0, help="only alert above this profit %%")
+    ap.add_argument("--once", action="store_true", help="one pass over the current files, then exit")
+    ap.add_argument("--max-age", type=float, help="minutes before a book's prices count as stale")
+    ap.add_argument("--stream", metavar="SOURCE",
+                    help="read scraper rows as they're parsed instead of the files: - (stdin) or unix:PATH")
+    args = ap.parse_args(argv)
+    if args.max_age is not None:
+        arb_core.DEFAULT_STALENESS = pd.Timedelta(minutes=args.max_age)
+
+    sinks: List[Sink] = [] if args.quiet else [stdout_sink]
+    if args.out:
+        sinks.append(file_sink(args.out))
+    if args.webhook:
+        sinks.append(webhook_sink(args.webhook))
+    try:
+        if args.stream:
+            print(f"reading rows from {'stdin' if args.stream == '-' else args.stream}", file=sys.stderr)
+            run_stream(sinks, args.stream, args.min_margin)
+        else:
+            print(f"watching {arb_core.OUT_DIR}", file=sys.stderr)
+            run(sinks, args.interval, args.once, args.min_margin)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
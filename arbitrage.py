@@ -0,0 +1,187 @@
+# Generic N-outcome arbitrage over a long price table
+# One row per quoted price: (event, market, outcome, book, price)
+# run: python arbitrage.py --bench 2000000   (synthetic benchmark)
+#      python arbitrage.py --check           (to_long/solve edge cases)
+
+import sys, time
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+
+from markets import CROSS_COVERS, MARKET_OUTCOMES, PRICE_COLS, market_family  # noqa: F401 (re-exported)
+
+def cover_legs(markets) -> pd.DataFrame:
+    """Every outcome set that covers the result space, for the markets present."""
+    rows = []
+    present = set(markets)
+    for m in present:
+        fam = market_family(m)
+        if fam == "Double Chance":
+            continue  # 1X/12/X2 overlap, they only cover in CROSS_COVERS
+        for o in MARKET_OUTCOMES.get(fam, ()):
+            rows.append((m, m, o))
+    for name, legs in CROSS_COVERS.items():
+        if all(m in present for m, _ in legs):
+            rows.extend((name, m, o) for m, o in legs)
+    legs = pd.DataFrame(rows, columns=["cover", "market", "outcome"])
+    legs["n_legs"] = legs.groupby("cover")["outcome"].transform("size")
+    return legs
+
+
+def best_prices(prices: pd.DataFrame) -> pd.DataFrame:
+    """Highest price (and the book quoting it) per (event, market, outcome).
+
+    Extra columns (e.g. scraped_at) ride along with the winning row.
+    """
+    cols = PRICE_COLS + [c for c in prices.columns if c not in PRICE_COLS]
+    p = prices[prices["price"] > 1.0]
+    if p.empty:
+        return p[cols].iloc[:0]
+    idx = p.groupby(["event", "market", "outcome"], sort=False, observed=True)["price"].idxmax()
+    return p.loc[idx.to_numpy(), cols].reset_index(drop=True)
+
+
+def solve(prices: pd.DataFrame, total_stake: float = 100.0,
+          only_arbs: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Margin and proportional stakes for every complete cover of every event.
+
+    Returns (opportunities, legs). opportunities has one row per (event, cover)
+    with the implied probability sum and profit; legs has the book, price and
+    stake for each outcome of those covers.
+    """
+    best = best_prices(prices)
+    opp_cols = ["event", "cover", "n_legs", "implied", "profit_margin",
+                "guaranteed_return", "profit_amount", "total_stake"]
+    extra = [c for c in prices.columns if c not in PRICE_COLS]
+    leg_cols = ["event", "cover"] + PRICE_COLS[1:] + extra + ["stake", "payout"]
+    if best.empty:
+        return pd.DataFrame(columns=opp_cols), pd.DataFrame(columns=leg_cols)
+
+    legs = best.merge(cover_legs(best["market"].unique()), on=["market", "outcome"])
+    legs["inv"] = 1.0 / legs["price"].to_numpy()
+    g = legs.groupby(["event", "cover"], sort=False, observed=True)
+    legs["n"] = g["inv"].transform("size")
+    legs["implied"] = g["inv"].transform("sum")
+    legs = legs[legs["n"] == legs["n_legs"]]
+    if only_arbs:
+        legs = legs[legs["implied"] < 1.0]
+
+    # stake_i ∝ 1/price_i so every leg pays the same amount
+    implied = legs["implied"].to_numpy()
+    legs = legs.assign(stake=total_stake * legs["inv"].to_numpy() / implied,
+                       payout=total_stake / implied)
+
+    opps = legs.drop_duplicates(["event", "cover"])[["event", "cover", "n_legs", "implied"]].copy()
+    opps["profit_margin"] = (1.0 / opps["implied"] - 1.0) * 100
+    opps["guaranteed_return"] = total_stake / opps["implied"]
+    opps["profit_amount"] = opps["guaranteed_return"] - total_stake
+    opps["total_stake"] = total_stake
+    opps = opps.sort_values("profit_margin", ascending=False, kind="stable").reset_index(drop=True)
+    return opps[opp_cols], legs[leg_cols].reset_index(drop=True)
+
+
+def to_long(df: pd.DataFrame, event_keys: List[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Scraper rows (one per match per book) → long price table + event lookup.
+
+    1X2 comes from odds_home/draw/away; over/under become "Total <line>" when
+    the row carries a total_line. scraped_at is carried through when present.
+    Rows missing any event key are dropped: ngroup() would put them all in one
+    event (-1) and pair up unrelated fixtures.
+    """
+    event_keys = event_keys or ["normalized_home", "normalized_away", "date"]
+    df = df.dropna(subset=event_keys)
+    event = df.groupby(event_keys, sort=False).ngroup().to_numpy()
+    events = df.assign(event=event).drop_duplicates("event").set_index("event")
+    stamp = {"scraped_at": df["scraped_at"].to_numpy()} if "scraped_at" in df.columns else {}
+    parts = []
+    for col, outcome in [("odds_home", "home"), ("odds_draw", "draw"), ("odds_away", "away")]:
+        parts.append(pd.DataFrame({"event": event, "market": "1X2", "outcome": outcome,
+                                   "book": df["source"].to_numpy(),
+                                   "price": pd.to_numeric(df[col], errors="coerce").to_numpy(),
+                                   **stamp}))
+    line = pd.to_numeric(df["total_line"], errors="coerce") if "total_line" in df.columns else None
+    has = line.notna().to_numpy() if line is not None else None
+    if has is not None and has.any():
+        # formatted before the prefix: "Total " + an empty or all-NaN series has no string loop
+        market = line[has].map("Total {:g}".format).to_numpy()
+        for col in ["over", "under"]:
+            parts.append(pd.DataFrame({"event": event[has], "market": market, "outcome": col,
+                                       "book": df["source"].to_numpy()[has],
+                                       "price": pd.to_numeric(df[col], errors="coerce").to_numpy()[has],
+                                       **{k: v[has] for k, v in stamp.items()}}))
+    prices = pd.concat(parts, ignore_index=True).dropna(subset=["price"])
+    return prices, events
+
+
+def synthetic_prices(n_rows: int, n_books: int = 8, seed: int = 0) -> pd.DataFrame:
+    """Margined, noisy book prices: 1X2, double chance and two totals lines per event."""
+    rng = np.random.default_rng(seed)
+    spec = [("1X2", o) for o in MARKET_OUTCOMES["1X2"]] + \
+           [("Double Chance", o) for o in MARKET_OUTCOMES["Double Chance"]] + \
+           [(f"Total {ln}", o) for ln in ("2.5", "3.5") for o in MARKET_OUTCOMES["Total"]]
+    n_events = max(1, n_rows // (len(spec) * n_books))
+
+    # fair probabilities per event, in spec order
+    h, d, a = rng.dirichlet([4, 2.5, 3], n_events).T
+    o25, o35 = rng.uniform(0.35, 0.65, n_events), rng.uniform(0.15, 0.4, n_events)
+    fair = np.stack([h, d, a, h + d, h + a, d + a, o25, 1 - o25, o35, 1 - o35], axis=1)
+
+    # each book adds its margin plus its own opinion
+    margin = rng.uniform(0.03, 0.08, (n_events, 1, n_books))
+    noise = rng.normal(0, 0.015, (n_events, len(spec), n_books))
+    price = np.round(1.0 / (fair[:, :, None] * (1 + margin) * (1 + noise)), 2)
+
+    markets = pd.Categorical([m for m, _ in spec])
+    outcomes = pd.Categorical([o for _, o in spec])
+    slot = np.tile(np.repeat(np.arange(len(spec)), n_books), n_events)
+    return pd.DataFrame({
+        "event": np.repeat(np.arange(n_events), len(spec) * n_books),
+        "market": markets[slot],
+        "outcome": outcomes[slot],
+        "book": np.tile(np.arange(n_books), n_events * len(spec)),
+        "price": price.reshape(-1),
+    })
+
+
+def check():
+    """to_long → solve on the frames the scrapers actually produce, including the degenerate ones."""
+    def rows(**cols):
+        base = {"normalized_home": ["a", "a"], "normalized_away": ["b", "b"], "date": ["d", "d"],
+                "source": ["X", "Y"], "odds_home": [2.1, 1.9], "odds_draw": [3.6, 3.9],
+                "odds_away": [4.2, 4.6]}
+        return pd.DataFrame({**base, **cols})
+
+    cases = {
+        "no totals column": (rows(), 6),
+        "all-NaN totals": (rows(total_line=[np.nan, np.nan], over=[np.nan, np.nan],
+                                under=[np.nan, np.nan]), 6),
+        "one book with totals": (rows(total_line=[2.5, np.nan], over=[2.0, np.nan],
+                                      under=[1.9, np.nan]), 8),
+        "empty": (rows().iloc[:0].assign(total_line=[], over=[], under=[]), 0),
+        "NaN event key": (rows(normalized_home=["a", np.nan], date=[np.nan, "d"]), 0),
+        "one row without a date": (rows(date=["d", np.nan]), 3),
+    }
+    for name, (df, n_prices) in cases.items():
+        prices, events = to_long(df)
+        assert len(prices) == n_prices, (name, len(prices))
+        assert prices["market"].str.startswith("Total").sum() == (2 if n_prices == 8 else 0), name
+        solve(prices)
+        print(f"ok  {name}: {len(prices)} prices, {len(events)} events")
+
+
+def bench(n_rows: int):
+    prices = synthetic_prices(n_rows)
+    t0 = time.perf_counter()
+    opps, legs = solve(prices)
+    dt = time.perf_counter() - t0
+    print(f"{len(prices):,} price rows → {len(opps):,} arbs / {prices['event'].nunique():,} events "
+          f"in {dt:.2f}s ({len(prices) / dt / 1e6:.2f}M rows/s)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--bench":
+        bench(int(sys.argv[2]))
+    elif sys.argv[1:] == ["--check"]:
+        check()
+    else:
+        print("usage: python arbitrage.py --bench N_ROWS | --check")
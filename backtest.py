@@ -0,0 +1,222 @@
+# Backtest: replay the odds history to see how often arbs appear, how long they last,
+# and which bookmaker combinations produce them
+# run: python backtest.py                      (replays output/history/*.csv)
+#      python backtest.py --bench-days 30      (synthetic minute-level history)
+
+import argparse, os, sys, tempfile, time
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+import pandas as pd
+
+import arb_core
+from arb_core import EVENT_KEYS
+
+
+def iter_history(paths: List[str], chunksize: int = 200_000) -> Iterator[pd.DataFrame]:
+    """Rows from several time-ordered history files, merged into time order, chunk by chunk.
+
+    Each file is read `chunksize` rows at a time; a batch is released up to (not
+    including) the earliest last timestamp of any file with more to read, so one
+    scrape's rows are never split across batches and memory stays at ~one chunk per file.
+    """
+    readers, buf = {}, {}
+    for p in paths:
+        if os.path.exists(p):
+            readers[p] = pd.read_csv(p, chunksize=chunksize)
+            buf[p] = pd.DataFrame()
+
+    def pull(p: str):
+        """Append the file's next chunk to its buffer, or retire the reader at the end of the file."""
+        try:
+            chunk = next(readers[p])
+        except StopIteration:
+            del readers[p]
+            return
+        chunk["scraped_at"] = arb_core.parse_scraped_at(chunk)
+        chunk = chunk.dropna(subset=["scraped_at"])
+        buf[p] = chunk if buf[p].empty else pd.concat([buf[p], chunk], ignore_index=True)
+
+    while True:
+        for p in list(readers):
+            # a file with more to read must show two timestamps: rows at its last one may
+            # carry on into the next chunk, and a chunk without any time leaves nothing to go by
+            while p in readers and (buf[p].empty or buf[p]["scraped_at"].iloc[0] == buf[p]["scraped_at"].iloc[-1]):
+                pull(p)
+        if not readers and all(b.empty for b in buf.values()):
+            return
+        mark = min((buf[p]["scraped_at"].iloc[-1] for p in readers), default=None)
+        out = []
+        for p, b in buf.items():
+            if b.empty:
+                continue
+            take = (b["scraped_at"] < mark).to_numpy() if mark is not None else np.ones(len(b), dtype=bool)
+            out.append(b[take])
+            buf[p] = b[~take]
+        batch = pd.concat(out, ignore_index=True)
+        if not batch.empty:
+            yield batch.sort_values("scraped_at", kind="stable", ignore_index=True)
+
+
+class Backtest:
+    """Open/close tracking of every (event, cover) arbitrage across replayed snapshots."""
+
+    def __init__(self, max_staleness: Dict[str, pd.Timedelta] = None, default: pd.Timedelta = None):
+        self.max_staleness = max_staleness
+        self.default = default
+        limits = {**arb_core.MAX_STALENESS, **(max_staleness or {})}
+        self.window = max([arb_core.DEFAULT_STALENESS if default is None else default] + list(limits.values()))
+        self.context = pd.DataFrame()   # latest row per (event, book), still within staleness
+        self.open: Dict[tuple, Dict] = {}
+        self.closed: List[Dict] = []
+        self.ticks = 0
+
+    def feed(self, batch: pd.DataFrame):
+        """Replay one time-ordered batch of history rows."""
+        batch = batch.copy()
+        batch["normalized_home"] = arb_core.normalize_teams(batch["home_team"])
+        batch["normalized_away"] = arb_core.normalize_teams(batch["away_team"])
+        ticks = batch["scraped_at"].drop_duplicates()
+        data = pd.concat([self.context, batch], ignore_index=True)
+
+        # book prices as of every scrape time in the batch, then one solve over all of them
+        view = arb_core.asof_view(data, ticks, self.max_staleness, self.default)
+        arbs = pd.DataFrame(columns=["asof", "ident", "profit_margin", "books"])
+        if not view.empty:
+            opps, legs, events = arb_core.solve_frame(view, event_keys=EVENT_KEYS + ["asof"])
+            if not opps.empty:
+                books = legs.groupby(["event", "cover"])["book"].agg(lambda b: " + ".join(sorted(set(b))))
+                ev = events.loc[opps["event"], EVENT_KEYS + ["asof", "home_team", "away_team"]].reset_index(drop=True)
+                arbs = pd.DataFrame({
+                    "asof": ev["asof"],
+                    "ident": list(zip(ev["normalized_home"], ev["normalized_away"], ev["date"], opps["cover"])),
+                    "match": ev["home_team"] + " vs " + ev["away_team"],
+                    "profit_margin": opps["profit_margin"].to_numpy(),
+                    "books": books.loc[list(zip(opps["event"], opps["cover"]))].to_numpy(),
+                })
+        by_tick = {t: g for t, g in arbs.groupby("asof")} if not arbs.empty else {}
+
+        for t in ticks:
+            now = by_tick.get(t)
+            seen = set() if now is None else set(now["ident"])
+            for ident in [i for i in self.open if i not in seen]:
+                self._close(ident, t)
+            if now is not None:
+                for r in now.itertuples(index=False):
+                    o = self.open.get(r.ident)
+                    if o is None:
+                        self.open[r.ident] = {"event": r.ident[:3], "cover": r.ident[3], "match": r.match,
+                                              "opened": t, "books": r.books, "open_margin": r.profit_margin,
+                                              "max_margin": r.profit_margin, "ticks": 1}
+                    else:
+                        o["max_margin"] = max(o["max_margin"], r.profit_margin)
+                        o["ticks"] += 1
+            self.ticks += 1
+
+        # only each book's latest row per event can still matter for the next batch
+        last = data.drop_duplicates(EVENT_KEYS + ["source"], keep="last")
+        self.context = last[last["scraped_at"] > ticks.iloc[-1] - self.window].reset_index(drop=True)
+
+    def _close(self, ident: tuple, at: pd.Timestamp):
+        o = self.open.pop(ident)
+        o["closed"] = at
+        o["lifetime_s"] = (at - o["opened"]).total_seconds()
+        self.closed.append(o)
+
+    def results(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """(every opportunity, lifetime distribution, stats per book combination).
+
+        Opportunities still open at the end of the history are kept with no close
+        time and left out of the lifetime distribution (their lifetime is unknown).
+        Covers whose legs all come from one book stay in the opportunities but are
+        not a book combination, so they're left out of the per-combination stats.
+        """
+        rows = self.closed + [{**o, "closed": pd.NaT, "lifetime_s": np.nan} for o in self.open.values()]
+        opps = pd.DataFrame(rows, columns=["event", "cover", "match", "books", "opened", "closed",
+                                           "lifetime_s", "open_margin", "max_margin", "ticks"])
+        life = opps["lifetime_s"].dropna()
+        dist = life.describe(percentiles=[0.1, 0.25, 0.5, 0.75, 0.9, 0.99]).to_frame("lifetime_s")
+        cross = opps["books"].astype(str).str.contains(" + ", regex=False)
+        pairs = opps[cross].groupby("books").agg(
+            opportunities=("cover", "size"),
+            mean_margin=("open_margin", "mean"),
+            max_margin=("max_margin", "max"),
+            profit_per_r100=("open_margin", "sum"),   # R100 placed at the opening price of each
+            median_lifetime_s=("lifetime_s", "median"),
+        ).sort_values("profit_per_r100", ascending=False)
+        return opps, dist, pairs
+
+
+def run(paths: List[str], chunksize: int = 200_000, **kw) -> Backtest:
+    bt = Backtest(**kw)
+    for batch in iter_history(paths, chunksize):
+        bt.feed(batch)
+    return bt
+
+
+def synthetic_history(out_dir: str, days: int, events: int = 20, seed: int = 0) -> List[str]:
+    """Minute-level history for three books, written in the scrapers' history format."""
+    rng = np.random.default_rng(seed)
+    books = {"SuperSportBET": 0, "SunBet": 20, "Betjets": 40}   # seconds past the minute each book lands
+    fair = rng.dirichlet([4, 2.5, 3], events)
+    minutes = pd.date_range("2026-01-01", periods=days * 24 * 60, freq="min", tz="UTC")
+    paths = []
+    for book, offset in books.items():
+        path = os.path.join(out_dir, f"{book.lower()}.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("home_team,away_team,start_time,date,odds_home,odds_draw,odds_away,source,scraped_at\n")
+            for day in range(days):
+                block = minutes[day * 1440:(day + 1) * 1440]
+                n = len(block) * events
+                noise = 1 + rng.normal(0, 0.02, (n, 3))
+                odds = np.round(1 / (np.tile(fair, (len(block), 1)) * 1.05 * noise), 2)
+                stamps = np.repeat((block + pd.Timedelta(seconds=offset)).strftime("%Y-%m-%dT%H:%M:%S+00:00"), events)
+                ev = np.tile(np.arange(events), len(block))
+                pd.DataFrame({"home_team": [f"Home {e}" for e in ev], "away_team": [f"Away {e}" for e in ev],
+                              "start_time": "15:00", "date": "Sat (01 Jan)",
+                              "odds_home": odds[:, 0], "odds_draw": odds[:, 1], "odds_away": odds[:, 2],
+                              "source": book, "scraped_at": stamps}).to_csv(f, header=False, index=False)
+        paths.append(path)
+    return paths
+
+
+def report(bt: Backtest, out_dir: str = None):
+    opps, dist, pairs = bt.results()
+    same = len(opps) - pairs["opportunities"].sum()
+    print(f"{bt.ticks:,} snapshots replayed · {len(opps):,} arbitrage opportunities "
+          f"({len(bt.open)} still open at the end, {same} within a single book)")
+    print("\nLifetime (seconds):")
+    print(dist.round(1).to_string())
+    print("\nBy bookmaker combination:")
+    print(pairs.round(2).to_string())
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        opps.to_csv(os.path.join(out_dir, "backtest_opportunities.csv"), index=False)
+        pairs.to_csv(os.path.join(out_dir, "backtest_pairs.csv"))
+
+
+def main(argv: List[str] = None):
+    ap = argparse.ArgumentParser(description="Replay the odds history through the arbitrage logic.")
+    ap.add_argument("--chunksize", type=int, default=200_000, help="history rows read per file per step")
+    ap.add_argument("--max-age", type=float, help="minutes before a book's price counts as stale")
+    ap.add_argument("--out", help="write backtest_opportunities.csv and backtest_pairs.csv here")
+    ap.add_argument("--bench-days", type=int, help="replay this many days of synthetic minute-level history")
+    args = ap.parse_args(argv)
+    default = pd.Timedelta(minutes=args.max_age) if args.max_age is not None else None
+
+    if args.bench_days:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = synthetic_history(tmp, args.bench_days)
+            rows = sum(1 for p in paths for _ in open(p)) - len(paths)
+            t0 = time.perf_counter()
+            bt = run(paths, args.chunksize, default=default)
+            dt = time.perf_counter() - t0
+        report(bt, args.out)
+        print(f"\n{rows:,} history rows in {dt:.1f}s ({rows / dt:,.0f} rows/s)", file=sys.stderr)
+        return
+
+    paths = [f["history"] for f in arb_core.FILES.values()]
+    report(run(paths, args.chunksize, default=default), args.out)
+
+
+if __name__ == "__main__":
+    main()
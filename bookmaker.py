@@ -0,0 +1,475 @@
+# Shared scrape → parse → write pipeline for the bookmaker sites
+# A site is a Bookmaker subclass: URL, output files and page quirks as class attributes,
+# plus whichever hooks it needs (navigate, locate_root, extract / extract_sections; parse
+# is required).
+# The engine owns the browser, consent clicks, scrolling, timing, dedupe, retries and
+# the CSV/JSON/history files, so a fix here reaches every site at once
+# Standard library only; playwright is imported when a browser is first needed
+# run: python betjets2.py / sunbet2.py / supersport2.py   (each one runs its BOOK)
+
+import atexit, os, re, sys, time
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+import instrument, page_cache, paths, profiling, resilience, row_stream
+from fixtures import Batch
+if TYPE_CHECKING:
+    import requests
+    from playwright.sync_api import Browser, Frame, Page, Playwright
+
+OUT_DIR = paths.out_dir()
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+re_team = re.compile(r"[A-Za-z0-9'.\-&/]+(?:\s+[A-Za-z0-9'.\-&/]+){0,3}")
+
+# URL/breadcrumb tokens → category names
+TOKEN_NAMES = {"epl": "Premier League", "premier league": "Premier League", "football": "Football",
+               "soccer": "Soccer", "england": "England", "english": "England"}
+# hostname → how the site writes its own name
+BRANDS = {"sunbet": "SunBet", "betjets": "Betjets"}
+
+# innerText of sections [a, b) matching a selector, keeping those whose first lines match `keep`
+SECTION_TEXT_JS = """([sel, a, b, keep]) => {
+  const re = keep ? new RegExp(keep, "i") : null;
+  return Array.from(document.querySelectorAll(sel)).slice(a, b)
+    .map(e => e.innerText).filter(t => !re || re.test(t.slice(0, 300)));
+}"""
+
+
+# ---------------- page text helpers ----------------
+
+def brand_from_url(url: str) -> str:
+    host = (urlparse(url).hostname or "").replace("www.", "")
+    root = host.split(".")[0] if host else ""
+    return BRANDS.get(root, root.capitalize() or "Unknown")
+
+def token_name(tok: str) -> str:
+    # map short codes → nice names
+    t = tok.strip().lower().replace("-", " ").replace("_", " ")
+    return TOKEN_NAMES.get(t) or t.title()
+
+def category_from_url(url: str) -> str:
+    # /sports/football/england/epl/1195 → Football / England / Premier League
+    u = urlparse(url)
+    # SunBet puts the path in the hash fragment
+    parts = [p for p in (u.fragment or u.path).split("/") if p]
+    for marker in ("sports", "sports-hub"):
+        if marker in parts:
+            parts = parts[parts.index(marker)+1:]
+    if parts and parts[-1].isdigit():
+        parts = parts[:-1]
+    return " / ".join(p for p in (token_name(p) for p in parts[:3]) if p)
+
+def category_from_text(lines: List[str], url: str, scan: int = 200) -> str:
+    # breadcrumbs/headers in the first `scan` lines, then the URL for anything missing
+    sport = country = league = None
+    for s in lines[:scan]:
+        low = s.lower()
+        if not sport and ("soccer" in low or "football" in low):
+            sport = "Soccer" if "soccer" in low else "Football"
+        if not country and ("england" in low or "english" in low):
+            country = "England"
+        if not league and (low == "epl" or "premier league" in low):
+            league = "Premier League"
+        if sport and country and league:
+            break
+    if not (sport and country and league):
+        from_url = category_from_url(url).split(" / ")
+        if not sport   and len(from_url)>0: sport   = from_url[0]
+        if not country and len(from_url)>1: country = from_url[1]
+        if not league  and len(from_url)>2: league  = from_url[2]
+    parts = [p for p in [sport, country, league] if p]
+    return " / ".join(parts) if parts else category_from_url(url)
+
+def detect_market(lines: List[str]) -> str:
+    # prefer the label shown on the page
+    for s in lines[:200]:
+        low = s.lower().strip()
+        if "match result" in low: return "Match Result"
+        if low == "1x2": return "1X2"
+    return "Match Result"
+
+def is_team(s: str, min_len: int = 2) -> bool:
+    return bool(re_team.fullmatch(s)) and min_len <= len(s) <= 40
+
+
+# ---------------- browser pool ----------------
+
+# one Playwright driver and one Chromium per process (per headless flag), reused by
+# every fetch in it (retries, several books) and closed at exit; each fetch gets its own context
+_playwright: Optional["Playwright"] = None
+_browsers: Dict[bool, "Browser"] = {}
+
+def browser(headless: bool = True) -> "Browser":
+    """This process's shared Chromium, launched on first use and relaunched if it has died."""
+    global _playwright
+    b = _browsers.get(headless)
+    if b is not None and b.is_connected():
+        return b
+    if _playwright is None:
+        from playwright.sync_api import sync_playwright
+        _playwright = sync_playwright().start()
+        atexit.register(close_browsers)
+    with instrument.stage("launch"):
+        b = _browsers[headless] = _playwright.chromium.launch(headless=headless)
+    return b
+
+def close_browsers():
+    global _playwright
+    for b in _browsers.values():
+        try: b.close()
+        except Exception: pass
+    _browsers.clear()
+    if _playwright is not None:
+        _playwright.stop()
+        _playwright = None
+
+def click_first(target: Union["Page", "Frame"], selectors: Sequence[str], timeout_ms: int = 1500) -> bool:
+    """Click the first selector that matches (cookie banners, tabs); False when none did."""
+    for sel in selectors:
+        try:
+            target.locator(sel).first.click(timeout=timeout_ms)
+            return True
+        except Exception:
+            pass
+    return False
+
+
+# ---------------- http pool ----------------
+
+# the browserless fast path: one keep-alive session per process, its connections reused by
+# every request in it (retries, several books) like the browser above
+_session: Optional["requests.Session"] = None
+
+def session() -> "requests.Session":
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        _session = requests.Session()
+        for scheme in ("https://", "http://"):
+            _session.mount(scheme, HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        _session.headers["User-Agent"] = USER_AGENT
+        atexit.register(_session.close)
+    return _session
+
+def http_enabled() -> bool:
+    return os.environ.get("ARB_HTTP", "1").lower() not in ("0", "off", "false", "no")
+
+def html_text(el) -> str:
+    """Visible text of parsed HTML, one text node per line (how inner_text reads these pages)."""
+    for tag in el.find_all(("script", "style", "noscript", "template")):
+        tag.decompose()
+    return el.get_text("\n", strip=True)
+
+
+# ---------------- the adapter ----------------
+
+class Bookmaker:
+    """One bookmaker site plugged into the shared pipeline.
+
+    Subclasses set `name`, `label`, `url` and `stem` and implement parse();
+    navigate, locate_root and extract have defaults that suit a plain page.
+    """
+    name = ""               # run/status/metrics name, e.g. "betjets"
+    label = ""              # for log lines, e.g. "BetJets"
+    url = ""
+    stem = ""               # output file name: <out_dir>/<stem>.csv, .json, history/<stem>.csv
+    out_dir = OUT_DIR
+
+    locale = "en-ZA"
+    viewport = {"width": 1366, "height": 960}
+    page_timeout_ms = 70000
+    wait_until = "domcontentloaded"
+    consent: Tuple[str, ...] = ("button:has-text('Accept')", "text=Accept")
+
+    # long pages: read `sections` (a CSS selector for competition containers) a batch at a
+    # time, only those whose heading matches `keep_sections`, parsing and dropping each section
+    # before the next, instead of the whole body at once; nothing kept → the whole body
+    sections: Optional[str] = None
+    keep_sections: Optional[str] = None
+    section_batch = 8
+
+    # parsed pages/sections kept by content hash (page_cache.py); 0 turns the cache off
+    cache_entries = 256
+
+    # browserless fast path: a server-rendered page (its fixtures in the HTML, no JS needed)
+    # read over a pooled keep-alive session with conditional requests; Chromium when it
+    # fails or gives no rows. None → Chromium only; ARB_HTTP=0 turns it off everywhere
+    http_url: Optional[str] = None
+    http_timeout_s = 15
+
+    # --stream TARGET / ARB_STREAM (row_stream.py): set by run(), rows go out as each chunk is parsed
+    stream: Optional[row_stream.Writer] = None
+
+    # scroll until the page height stops changing for `flat_scrolls` steps in a row
+    max_scrolls = 240
+    scroll_px = 1800
+    scroll_pause_ms = 250
+    flat_scrolls = 6
+    height_js = "document.body.scrollHeight"
+
+    @property
+    def csv_path(self) -> str:
+        return os.path.join(self.out_dir, f"{self.stem}.csv")
+
+    @property
+    def json_path(self) -> str:
+        return os.path.join(self.out_dir, f"{self.stem}.json")
+
+    @property
+    def history_path(self) -> str:
+        return os.path.join(self.out_dir, "history", f"{self.stem}.csv")
+
+    # --- hooks ---
+
+    def navigate(self, page: "Page"):
+        page.goto(self.url, wait_until=self.wait_until)
+
+    def locate_root(self, page: "Page") -> Union["Page", "Frame"]:
+        """Where the fixtures live: the page itself, or a frame inside it."""
+        return page
+
+    def extract(self, page: "Page", root: Union["Page", "Frame"]) -> str:
+        from playwright.sync_api import TimeoutError as PWTimeout
+        try:
+            return root.locator("body").inner_text(timeout=5000)
+        except PWTimeout:
+            return page.content()
+
+    def extract_sections(self, page: "Page", root: Union["Page", "Frame"]) -> Iterator[str]:
+        total = root.locator(self.sections).count()
+        instrument.count("sections", total)
+        for a in range(0, total, self.section_batch):
+            with instrument.stage("inner_text"):
+                texts = root.evaluate(SECTION_TEXT_JS, [self.sections, a, a + self.section_batch, self.keep_sections])
+            yield from texts
+
+    def http_text(self, html: str) -> Iterator[str]:
+        """Text of the fast path's HTML: each kept `sections` element, or the whole body."""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, "html.parser")
+        if self.sections:
+            keep = re.compile(self.keep_sections, re.I) if self.keep_sections else None
+            found = soup.select(self.sections)
+            instrument.count("sections", len(found))
+            texts = [t for t in map(html_text, found) if not keep or keep.search(t[:300])]
+            if texts:
+                yield from texts
+                return
+        yield html_text(soup.body or soup)
+
+    def parse(self, txt: str, url: str) -> Batch:
+        raise NotImplementedError
+
+    # --- engine ---
+
+    def scroll(self, page: "Page", root: Union["Page", "Frame"]):
+        flat, last_h = 0, 0
+        for _ in range(self.max_scrolls):
+            instrument.count("scrolls")
+            try:
+                if root is page: page.mouse.wheel(0, self.scroll_px)
+                else: root.evaluate(f"window.scrollBy(0, {self.scroll_px})")
+            except Exception:
+                pass
+            page.wait_for_timeout(self.scroll_pause_ms)
+            try: h = root.evaluate(self.height_js)
+            except Exception: h = 0
+            if h == last_h:
+                flat += 1
+                if flat >= self.flat_scrolls: break
+            else:
+                flat = 0
+            last_h = h
+
+    def fetch(self, headless: bool = True) -> Iterator[Tuple[str, str]]:
+        """(visible text, final url) of the fully scrolled page: one chunk, or one per section."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        ctx = browser(headless).new_context(viewport=self.viewport, locale=self.locale, user_agent=USER_AGENT)
+        try:
+            page = ctx.new_page()
+            page.set_default_timeout(self.page_timeout_ms)
+            with instrument.stage("goto"):
+                self.navigate(page)
+            with instrument.stage("consent"):
+                click_first(page, self.consent)
+            root = self.locate_root(page)
+            with instrument.stage("scroll"):
+                self.scroll(page, root)
+            if self.sections:
+                got = False
+                for txt in self.extract_sections(page, root):
+                    got = True
+                    yield txt, page.url
+                if got:
+                    return
+            with instrument.stage("inner_text"):
+                txt = self.extract(page, root)
+            yield txt, page.url
+        finally:
+            ctx.close()
+
+    def fetch_http(self) -> Iterator[Tuple[str, str]]:
+        """(text, url) like fetch(), from `http_url`; a 304 replays the body kept from the last 200.
+
+        The text is passed on with the landing `url`, which is what parse() reads the source
+        and category from after a browser fetch too.
+        """
+        cache = self.cache
+        kept = cache.response(self.http_url) if cache else None
+        headers = {"Accept-Language": self.locale}
+        if kept:
+            if kept["etag"]: headers["If-None-Match"] = kept["etag"]
+            if kept["last_modified"]: headers["If-Modified-Since"] = kept["last_modified"]
+        with instrument.stage("http"):
+            resp = session().get(self.http_url, headers=headers, timeout=self.http_timeout_s)
+        if resp.status_code == 304 and kept:
+            instrument.count("http_not_modified")
+            body = kept["body"]
+        else:
+            resp.raise_for_status()
+            body = resp.text
+            etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+            if cache and (etag or modified):
+                cache.keep_response(self.http_url, etag, modified, body)
+        instrument.count("http_bytes", len(resp.content))
+        for txt in self.http_text(body):
+            yield txt, self.url
+
+    @property
+    def cache(self) -> Optional[page_cache.PageCache]:
+        if not (self.cache_entries and page_cache.enabled()):
+            return None
+        if getattr(self, "_cache", None) is None or self._cache.path != os.path.join(self.out_dir, "cache", self.name):
+            self._cache = page_cache.PageCache(os.path.join(self.out_dir, "cache", self.name), self.cache_entries)
+        return self._cache
+
+    def parser_tag(self) -> str:
+        """Changes whenever the parser's code does, so cached rows never outlive the parser that made them.
+
+        That is the site's module plus the shared helpers it parses with (this module's
+        is_team/html_text, fixtures' row and batch types).
+        """
+        parts = [type(self).__qualname__]
+        for mod in (type(self).__module__, __name__, Batch.__module__):
+            st = os.stat(sys.modules[mod].__file__)
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        return ":".join(parts)
+
+    def parse_cached(self, txt: str, final_url: str) -> Batch:
+        """parse(), or the rows this exact text parsed to before (same parser, same local day)."""
+        cache = self.cache
+        if cache is None:
+            with instrument.stage("parse"):
+                return self.parse(txt, final_url)
+        # the day is part of the key: "Today"/weekday-only kickoffs parse relative to it
+        k = page_cache.key(self.parser_tag(), datetime.now().strftime("%Y-%m-%d"), final_url, txt)
+        hit = cache.get(k)
+        if hit is not None:
+            instrument.count("cache_hits")
+            instrument.count("cache_saved_s", hit[1])
+            return hit[0]
+        instrument.count("cache_misses")
+        t0 = time.perf_counter()
+        with instrument.stage("parse"):
+            parsed = self.parse(txt, final_url)
+        if parsed:
+            cache.put(k, parsed, time.perf_counter() - t0)
+        return parsed
+
+    def scrape(self) -> Batch:
+        """One fetch + parse attempt: the HTTP fast path when the site has one, else (or when it fails) Chromium."""
+        if self.http_url and http_enabled():
+            try:
+                rows = self.parse_chunks(self.fetch_http())
+                if rows:
+                    instrument.count("http_fast")
+                    return rows
+                reason = "no rows"
+            except Exception as e:
+                reason = f"{type(e).__name__}: {e}"
+            instrument.count("http_fallbacks")
+            print(f"{self.label}: http fast path failed ({reason}), using Chromium", file=sys.stderr)
+        return self.parse_chunks(self.fetch())
+
+    def parse_chunks(self, fetched: Iterator[Tuple[str, str]]) -> Batch:
+        # chunk by chunk: each is parsed (or found in the cache) and let go before the next
+        # is pulled; the batch drops fixtures repeated across chunks
+        rows = Batch()
+        size = lines = chunks = biggest = 0
+        with closing(fetched) as pages:
+            while True:
+                with instrument.stage("fetch"):
+                    chunk = next(pages, None)
+                if chunk is None:
+                    break
+                txt, final_url = chunk
+                n = len(txt.encode("utf-8"))
+                size, biggest, chunks = size + n, max(biggest, n), chunks + 1
+                lines += txt.count("\n") + 1 if txt else 0
+                before = len(rows)
+                rows.extend(self.parse_cached(txt, final_url))
+                if self.stream is not None and len(rows) > before:
+                    self.stream.rows(rows.records(before), datetime.now(timezone.utc).isoformat(timespec="milliseconds"))
+                del txt, chunk
+        for key, value in (("text_bytes", size), ("lines", lines), ("chunks", chunks), ("max_chunk_bytes", biggest)):
+            instrument.set(key, value)
+        return rows
+
+    def write(self, rows: Batch):
+        os.makedirs(self.out_dir, exist_ok=True)
+        with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
+            rows.write_csv(f)
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            rows.write_json(f)
+        # append to the site's history table (time-ordered, one file per site)
+        new = not os.path.exists(self.history_path)
+        os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+        with open(self.history_path, "a", newline="", encoding="utf-8") as f:
+            rows.write_csv(f, header=new)
+
+    def run(self, retries: int = 2) -> Tuple[Batch, Dict]:
+        """Scrape (retried with backoff), stamp and write; returns the rows and the run's metrics record.
+
+        Failed or empty attempts never reach write, so the last good files stay in place.
+        --profile[=cprofile,tracemalloc] or ARB_PROFILE=... → <out_dir>/profiles
+        --stream -|unix:PATH or ARB_STREAM=... → rows as NDJSON while they're parsed (row_stream.py)
+        """
+        self.stream = row_stream.open_writer(row_stream.target())
+        try:
+            with profiling.profiled(self.name, self.out_dir), instrument.Run(self.name, self.out_dir) as run:
+                rows = resilience.retrying(self.name, self.out_dir, self.scrape, retries)
+                scraped_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                rows.stamp(scraped_at)
+                run.set("rows", len(rows))
+                looked_up = run.counts.get("cache_hits", 0) + run.counts.get("cache_misses", 0)
+                if looked_up:
+                    run.set("cache_hit_rate", round(run.counts.get("cache_hits", 0) / looked_up, 4))
+                if self.stream is not None:
+                    # complete: readers can drop this book's rows it no longer shows, without waiting for the files
+                    self.stream.end(self.name, sorted(set(rows.cols["source"])), len(rows))
+                with run.stage("write"):
+                    try:
+                        self.write(rows)
+                    except Exception as e:
+                        resilience.record_failure(self.out_dir, self.name, f"{type(e).__name__}: {e}", None)
+                        raise
+                resilience.record_ok(self.out_dir, self.name, len(rows))
+        finally:
+            if self.stream is not None:
+                self.stream.close()
+            self.stream = None
+        return rows, run.record()
+
+    def main(self) -> Dict:
+        rows, record = self.run()
+        counts = record["counts"]
+        cached = (f" (cache {counts['cache_hit_rate']:.0%} hits, {counts.get('cache_saved_s', 0):.2f}s parse saved)"
+                  if "cache_hit_rate" in counts else "")
+        # stdout may be carrying the row stream
+        print(f"{self.label}: saved {len(rows)}{cached}", file=sys.stderr if row_stream.target() == "-" else sys.stdout)
+        return record
@@ -0,0 +1,151 @@
+# Consensus fair odds and value bets over a long price table
+# Each book's margin is removed per market, the fair probabilities are averaged
+# across books, and every quote is priced against that consensus
+# run: python fair_odds.py --bench 2000000   (synthetic benchmark)
+
+import sys, time
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+from arbitrage import MARKET_OUTCOMES, PRICE_COLS, market_family
+
+METHODS = ("proportional", "power", "shin")
+
+# markets whose outcomes are exclusive and exhaustive, so one book's fair
+# probabilities must sum to 1 (double chance outcomes overlap)
+FAIR_FAMILIES = ("1X2", "Total", "Draw No Bet")
+
+CONSENSUS_COLS = ["event", "market", "outcome", "fair_prob", "fair_odds", "n_books"]
+
+
+def _sums(g: np.ndarray, x: np.ndarray, n: int) -> np.ndarray:
+    return np.bincount(g, weights=x, minlength=n)
+
+
+def _power(q: np.ndarray, g: np.ndarray, n: int, iters: int = 30) -> np.ndarray:
+    """p_i = q_i ** k with k per group so that sum(p) == 1 (Newton from k = 1)."""
+    k = np.ones(n)
+    logq = np.log(q)
+    for _ in range(iters):
+        p = q ** k[g]
+        f = _sums(g, p, n) - 1.0
+        if np.abs(f).max() < 1e-12:
+            break
+        k -= f / _sums(g, p * logq, n)
+    return q ** k[g]
+
+
+def _shin(q: np.ndarray, g: np.ndarray, n: int, iters: int = 50) -> np.ndarray:
+    """Shin's insider-trading model: bisection on z per group.
+
+    p_i(z) = (sqrt(z² + 4(1 - z) q_i² / Q) - z) / (2(1 - z)), Q = sum(q).
+    sum(p) falls from sqrt(Q) at z = 0 to sum(q²)/Q < 1 as z → 1, so a
+    root exists whenever the book is overround; otherwise z stays 0 and
+    the result is renormalised proportionally.
+    """
+    big_q = _sums(g, q, n)
+    a = q * q / big_q[g]
+    lo, hi = np.zeros(n), np.full(n, 1.0 - 1e-9)
+    for _ in range(iters):
+        z = (lo + hi) / 2
+        zg = z[g]
+        over = _sums(g, (np.sqrt(zg * zg + 4 * (1 - zg) * a) - zg) / (2 * (1 - zg)), n) > 1.0
+        lo = np.where(over, z, lo)
+        hi = np.where(over, hi, z)
+    z = np.where(big_q > 1.0, (lo + hi) / 2, 0.0)[g]
+    p = (np.sqrt(z * z + 4 * (1 - z) * a) - z) / (2 * (1 - z))
+    return p / _sums(g, p, n)[g]
+
+
+def fair_probabilities(prices: pd.DataFrame, method: str = "proportional") -> pd.DataFrame:
+    """Each book's margin-free probabilities for every complete market it quotes.
+
+    prices is a long table (arbitrage.PRICE_COLS). Only FAIR_FAMILIES markets
+    where the book prices every outcome are kept. Adds `fair_prob` and the
+    book's `overround` (sum of implied probabilities, 1.05 = 5% margin).
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+    cols = PRICE_COLS + ["fair_prob", "overround"]
+    p = prices[prices["price"] > 1.0]
+    fam = p["market"].map({m: market_family(m) for m in p["market"].unique()})
+    p = p[fam.isin(FAIR_FAMILIES).to_numpy()].drop_duplicates(["event", "market", "outcome", "book"], keep="last")
+    if p.empty:
+        return pd.DataFrame(columns=cols)
+    fam = fam.loc[p.index]
+
+    g = p.groupby(["event", "market", "book"], sort=False, observed=True).ngroup().to_numpy()
+    n = int(g.max()) + 1
+    need = fam.map({f: len(MARKET_OUTCOMES[f]) for f in FAIR_FAMILIES}).to_numpy()
+    complete = np.bincount(g, minlength=n)[g] == need
+    p, g = p[complete], g[complete]
+    if p.empty:
+        return pd.DataFrame(columns=cols)
+    g = np.unique(g, return_inverse=True)[1]
+    n = int(g.max()) + 1
+
+    q = 1.0 / p["price"].to_numpy(dtype=float)
+    overround = _sums(g, q, n)
+    if method == "proportional":
+        fair = q / overround[g]
+    elif method == "power":
+        fair = _power(q, g, n)
+    else:
+        fair = _shin(q, g, n)
+    out = p[PRICE_COLS].reset_index(drop=True)
+    out["fair_prob"] = fair
+    out["overround"] = overround[g]
+    return out
+
+
+def consensus(fair: pd.DataFrame, min_books: int = 2) -> pd.DataFrame:
+    """Mean fair probability per (event, market, outcome) across books, renormalised per market.
+
+    A market is left out whole when any of its outcomes has fewer than min_books
+    books: renormalising what's left would inflate the remaining outcomes.
+    """
+    if fair.empty:
+        return pd.DataFrame(columns=CONSENSUS_COLS)
+    c = fair.groupby(["event", "market", "outcome"], sort=False, observed=True).agg(
+        fair_prob=("fair_prob", "mean"), n_books=("book", "nunique")).reset_index()
+    by_market = c.groupby(["event", "market"], sort=False, observed=True)
+    c = c[(by_market["n_books"].transform("min") >= min_books).to_numpy()].copy()
+    c["fair_prob"] /= c.groupby(["event", "market"], sort=False, observed=True)["fair_prob"].transform("sum")
+    c["fair_odds"] = 1.0 / c["fair_prob"]
+    return c[CONSENSUS_COLS].reset_index(drop=True)
+
+
+def value_bets(prices: pd.DataFrame, method: str = "proportional", min_edge: float = 0.0,
+               min_books: int = 2) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Quotes with positive expected value against the consensus.
+
+    Returns (consensus, bets). bets has every quote whose edge,
+    price × fair_prob - 1 in percent, is above min_edge, best first;
+    extra price columns (e.g. scraped_at) ride along.
+    """
+    cons = consensus(fair_probabilities(prices, method), min_books)
+    extra = [c for c in prices.columns if c not in PRICE_COLS]
+    bets = prices[prices["price"] > 1.0].merge(cons, on=["event", "market", "outcome"])
+    bets["edge"] = (bets["price"] * bets["fair_prob"] - 1.0) * 100
+    bets = bets[bets["edge"] > min_edge]
+    bets = bets.sort_values("edge", ascending=False, kind="stable").reset_index(drop=True)
+    return cons, bets[PRICE_COLS + extra + ["fair_prob", "fair_odds", "n_books", "edge"]]
+
+
+def bench(n_rows: int):
+    import arbitrage
+    prices = arbitrage.synthetic_prices(n_rows)
+    for method in METHODS:
+        t0 = time.perf_counter()
+        cons, bets = value_bets(prices, method)
+        dt = time.perf_counter() - t0
+        print(f"{method:>12}: {len(prices):,} price rows → {len(cons):,} fair prices, {len(bets):,} value bets "
+              f"in {dt:.2f}s ({len(prices) / dt / 1e6:.2f}M rows/s)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--bench":
+        bench(int(sys.argv[2]))
+    else:
+        print("usage: python fair_odds.py --bench N_ROWS")
@@ -0,0 +1,125 @@
+# Fixture rows shared by the scrapers, the file writers and the analyzer
+# A parser fills a Batch column by column: prices go into array('d') with NaN when missing,
+# strings are interned so a page's repeated category/market/source/date are stored once,
+# and duplicate fixtures are dropped as they're added. Reading a row gives a Fixture
+# (__slots__, attribute access); the CSV/JSON files keep their format ("" for a missing price)
+# Standard library only; to_frame() imports pandas when it's called
+
+import csv, json, sys
+from array import array
+from collections.abc import Sequence
+from typing import IO, Dict, Iterable, Iterator, List, Tuple
+
+COLS = ["home_team","away_team","start_time","date",
+        "odds_home","odds_draw","odds_away",
+        "category","market","over","under","total_line","source","scraped_at"]
+FLOAT_COLS = ("odds_home", "odds_draw", "odds_away", "over", "under", "total_line")
+NA = float("nan")
+
+
+def _cell(v):
+    # NaN → "" as the files have always written a missing price
+    return "" if v != v else v
+
+
+class Fixture:
+    """One fixture row; prices are floats, NaN when the page didn't show them."""
+    __slots__ = tuple(COLS)
+
+    def __init__(self, home_team: str, away_team: str, start_time: str, date: str,
+                 odds_home: float, odds_draw: float, odds_away: float, category: str, market: str,
+                 over: float = NA, under: float = NA, total_line: float = NA, source: str = "",
+                 scraped_at: str = ""):
+        self.home_team, self.away_team, self.start_time, self.date = home_team, away_team, start_time, date
+        self.odds_home, self.odds_draw, self.odds_away = odds_home, odds_draw, odds_away
+        self.category, self.market = category, market
+        self.over, self.under, self.total_line = over, under, total_line
+        self.source, self.scraped_at = source, scraped_at
+
+    def key(self) -> Tuple[str, str, str, str]:
+        return self.home_team.lower(), self.away_team.lower(), self.date, self.start_time
+
+    def as_dict(self) -> Dict:
+        return {k: _cell(getattr(self, k)) for k in COLS}
+
+    def __repr__(self) -> str:
+        return f"Fixture({self.home_team!r} v {self.away_team!r}, {self.date} {self.start_time}, {self.source})"
+
+
+class Batch(Sequence):
+    """Fixtures as columns (struct of arrays); the first row per (home, away, date, kickoff) wins."""
+
+    def __init__(self, rows: Iterable = ()):
+        self.cols: Dict[str, list] = {c: array("d") if c in FLOAT_COLS else [] for c in COLS}
+        self._seen = set()
+        for r in rows:
+            self.add(**(r.as_dict() if isinstance(r, Fixture) else r))
+
+    def add(self, home_team: str, away_team: str, start_time: str, date: str,
+            odds_home: float, odds_draw: float, odds_away: float, category: str, market: str,
+            over=NA, under=NA, total_line=NA, source: str = "", scraped_at: str = "") -> bool:
+        """Append one fixture; False (and nothing added) when it's already in the batch."""
+        key = (home_team.lower(), away_team.lower(), date, start_time)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        c, intern = self.cols, sys.intern
+        c["home_team"].append(intern(home_team)); c["away_team"].append(intern(away_team))
+        c["start_time"].append(intern(start_time)); c["date"].append(intern(date))
+        c["category"].append(intern(category)); c["market"].append(intern(market))
+        c["source"].append(intern(source)); c["scraped_at"].append(scraped_at)
+        for k, v in (("odds_home", odds_home), ("odds_draw", odds_draw), ("odds_away", odds_away),
+                     ("over", over), ("under", under), ("total_line", total_line)):
+            c[k].append(NA if v == "" or v is None else v)
+        return True
+
+    def columns(self) -> Dict[str, list]:
+        """Plain lists per column (JSON-able; NaN stays NaN)."""
+        return {k: list(v) for k, v in self.cols.items()}
+
+    @classmethod
+    def from_columns(cls, cols: Dict[str, list]) -> "Batch":
+        b = cls()
+        for vals in zip(*(cols[k] for k in COLS)):
+            b.add(*vals)
+        return b
+
+    def extend(self, other: "Batch"):
+        for vals in zip(*(other.cols[k] for k in COLS)):
+            self.add(*vals)
+
+    def stamp(self, scraped_at: str):
+        """Same scrape time on every row (the whole batch comes from one scrape)."""
+        self.cols["scraped_at"] = [scraped_at] * len(self)
+
+    def __len__(self) -> int:
+        return len(self.cols["home_team"])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return Fixture(*(self.cols[k][i] for k in COLS))
+
+    def __iter__(self) -> Iterator[Fixture]:
+        return map(Fixture, *(self.cols[k] for k in COLS))
+
+    def records(self, start: int = 0) -> List[Dict]:
+        """Rows from `start` on as plain dicts, the way the JSON file has them."""
+        cols = (self.cols[k][start:] if start else self.cols[k] for k in COLS)
+        return [dict(zip(COLS, map(_cell, vals))) for vals in zip(*cols)]
+
+    def write_csv(self, f: IO, header: bool = True):
+        w = csv.writer(f)
+        if header:
+            w.writerow(COLS)
+        w.writerows(zip(*(map(_cell, self.cols[k]) if k in FLOAT_COLS else self.cols[k] for k in COLS)))
+
+    def write_json(self, f: IO):
+        json.dump(self.records(), f, ensure_ascii=False, indent=2)
+
+    def to_frame(self):
+        """A DataFrame with the dtypes read_csv gives the files (float64, NaN for missing)."""
+        import numpy as np
+        import pandas as pd
+        return pd.DataFrame({k: np.array(v, dtype=np.float64) if k in FLOAT_COLS else v
+                             for k, v in self.cols.items()})
@@ -0,0 +1,144 @@
+# Run instrumentation for the scrapers and the dashboard: per-stage wall time,
+# counters (scroll iterations, text bytes, lines, rows) and peak RSS
+# Each finished run appends one JSON line to <out>/metrics/<name>.jsonl and rewrites
+# <out>/metrics/<name>.prom (Prometheus textfile format, e.g. node_exporter's textfile collector)
+# Standard library only, so the scrapers don't pick up new dependencies
+
+import json, os, sys, time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# the run in progress for this thread / context, so deep helpers (scroll loops,
+# frame polling) can count without a run being passed down to them
+_current: ContextVar[Optional["Run"]] = ContextVar("instrument_run", default=None)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident memory of this process, None where the platform doesn't report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024   # Linux reports KiB
+
+
+class Run:
+    """One instrumented run; use as a context manager around the whole run.
+
+        with Run("betjets", OUT_DIR) as run:
+            with run.stage("parse"):
+                rows = parse_epl(txt, url)
+            run.set("rows", len(rows))
+    """
+
+    def __init__(self, name: str, out_dir: str):
+        self.name = name
+        self.dir = os.path.join(out_dir, "metrics")
+        self.started = datetime.now(timezone.utc)
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, float] = {}
+        self.ok, self.error = True, None
+        self._t0 = time.perf_counter()
+        self.wall_s = 0.0
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+    def count(self, key: str, n: float = 1):
+        self.counts[key] = self.counts.get(key, 0) + n
+
+    def set(self, key: str, value: float):
+        self.counts[key] = value
+
+    def text(self, txt: str):
+        """Size of the pulled page text."""
+        self.set("text_bytes", len(txt.encode("utf-8")))
+        self.set("lines", txt.count("\n") + 1 if txt else 0)
+
+    def record(self) -> Dict:
+        return {"run": self.name, "started": self.started.isoformat(timespec="seconds"),
+                "ok": self.ok, "error": self.error, "wall_s": round(self.wall_s, 4),
+                "stages": {k: round(v, 4) for k, v in self.stages.items()},
+                "counts": self.counts, "peak_rss_bytes": peak_rss_bytes()}
+
+    def prometheus(self) -> str:
+        lbl = f'run="{self.name}"'
+        out = ["# HELP arb_run_stage_seconds Wall time per stage of the last run.",
+               "# TYPE arb_run_stage_seconds gauge"]
+        out += [f'arb_run_stage_seconds{{{lbl},stage="{k}"}} {v:.6f}' for k, v in self.stages.items()]
+        out += ["# HELP arb_run_count Counters of the last run (rows, lines, text_bytes, scrolls, ...).",
+                "# TYPE arb_run_count gauge"]
+        out += [f'arb_run_count{{{lbl},key="{k}"}} {v}' for k, v in self.counts.items()]
+        out += ["# TYPE arb_run_seconds gauge", f"arb_run_seconds{{{lbl}}} {self.wall_s:.6f}",
+                "# TYPE arb_run_success gauge", f"arb_run_success{{{lbl}}} {int(self.ok)}",
+                "# TYPE arb_run_last_timestamp_seconds gauge",
+                f"arb_run_last_timestamp_seconds{{{lbl}}} {self.started.timestamp():.0f}"]
+        rss = peak_rss_bytes()
+        if rss is not None:
+            out += ["# TYPE arb_run_peak_rss_bytes gauge", f"arb_run_peak_rss_bytes{{{lbl}}} {rss}"]
+        return "\n".join(out) + "\n"
+
+    def write(self):
+        os.makedirs(self.dir, exist_ok=True)
+        with open(os.path.join(self.dir, f"{self.name}.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.record()) + "\n")
+        # textfile collectors may read at any moment: write aside, then swap in
+        prom = os.path.join(self.dir, f"{self.name}.prom")
+        with open(prom + ".tmp", "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(prom + ".tmp", prom)
+
+    def __enter__(self) -> "Run":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        self.wall_s = time.perf_counter() - self._t0
+        if exc is not None:
+            self.ok, self.error = False, f"{exc_type.__name__}: {exc}"
+        try:
+            self.write()
+        except OSError as e:
+            # metrics must never fail the run itself
+            print(f"instrument: could not write metrics for {self.name}: {e}", file=sys.stderr)
+        return False
+
+
+def current() -> Optional[Run]:
+    return _current.get()
+
+
+def stage(name: str):
+    """Time a stage of the current run; a no-op outside one."""
+    run = _current.get()
+    return run.stage(name) if run is not None else nullcontext()
+
+
+def count(key: str, n: float = 1):
+    run = _current.get()
+    if run is not None:
+        run.count(key, n)
+
+
+def set(key: str, value: float):
+    run = _current.get()
+    if run is not None:
+        run.set(key, value)
+
+
+def text(txt: str):
+    run = _current.get()
+    if run is not None:
+        run.text(txt)
@@ -0,0 +1,30 @@
+# Market definitions shared by the batch solver (arbitrage.py) and the incremental
+# index (price_index.py); no pandas here, so the streaming paths start fast
+
+import re
+from typing import Dict, List, Tuple
+
+PRICE_COLS = ["event", "market", "outcome", "book", "price"]
+
+# outcomes that make up each market family; a market only counts as covered
+# when every outcome has a price (a missing draw must never look like an arb)
+MARKET_OUTCOMES: Dict[str, Tuple[str, ...]] = {
+    "1X2": ("home", "draw", "away"),
+    "Total": ("over", "under"),
+    "Double Chance": ("1X", "12", "X2"),
+    "Draw No Bet": ("home", "away"),
+}
+
+# covers built from more than one market, e.g. double chance vs the opposite single outcome
+CROSS_COVERS: Dict[str, List[Tuple[str, str]]] = {
+    "1X + 2": [("Double Chance", "1X"), ("1X2", "away")],
+    "12 + X": [("Double Chance", "12"), ("1X2", "draw")],
+    "X2 + 1": [("Double Chance", "X2"), ("1X2", "home")],
+}
+
+# "Total 2.5" → "Total"
+re_line_suffix = re.compile(r"\s+-?\d+(?:\.\d+)?$")
+
+
+def market_family(market: str) -> str:
+    return re_line_suffix.sub("", str(market))
@@ -0,0 +1,387 @@
+# Local stand-in sportsbook for load-testing the scrapers offline
+# Serves pages laid out like Betjets, SunBet (hash-routed shell + sportsbook iframe) and
+# SuperSportBET (league sections behind a Soccer tab) with infinite scroll, any number of
+# fixtures, injected latency and odds that keep moving while the page is open
+# Sites are told apart by hostname (betjets.localhost, sunbet.localhost, supersportbet.localhost;
+# Chromium resolves *.localhost itself) or by a path prefix (127.0.0.1:8765/betjets/...)
+# Standard library only
+# run: python mock_book.py                                     (serve on 127.0.0.1:8765)
+#      python mock_book.py --fixtures 2000 --latency-ms 150 --jitter-ms 100 --mutate 0.05
+#      python mock_book.py --bench --scale 10 --watch 5        (scrape every site against it)
+#      python mock_book.py --bench --http --watch 5            (same, over the HTTP fast path)
+
+import argparse, hashlib, html, itertools, json, random, statistics, sys, tempfile, threading, time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import instrument
+from fixtures import Batch
+
+# site → (hostname label, landing path the scraper opens)
+SITES = {
+    "Betjets": ("betjets", "/en/sports/football/england/epl/1195"),
+    "SunBet": ("sunbet", "/sports-landing/#sports-hub/football/england/premier_league"),
+    "SuperSportBET": ("supersportbet", "/sportsbook/"),
+}
+HOSTS = {host: site for site, (host, _) in SITES.items()}
+
+BATCH = 20              # fixtures per page load / infinite-scroll request
+POLL_MS = 1000          # how often an open page pulls moved odds
+# SuperSport's first section is the Premier League; more competitions cycle through these
+OTHER_LEAGUES = ["La Liga", "Bundesliga", "Serie A", "Ligue 1"]
+
+CITIES = ["Ashford", "Barnsley", "Carlisle", "Darlington", "Exeter", "Farnham", "Gillingham", "Halifax",
+          "Ipswich", "Kendal", "Lincoln", "Morecambe", "Newport", "Oldham", "Preston", "Reading",
+          "Salford", "Telford", "Walsall", "Yeovil", "Bristol", "Chester", "Dover", "Grimsby"]
+SUFFIXES = ["United", "City", "Town", "Rovers", "Athletic", "Albion", "Wanderers", "County"]
+
+
+# ---------------- fixtures ----------------
+
+def make_fixtures(n: int, leagues: List[str], seed: int = 0, now: datetime = None) -> List[Dict]:
+    """`n` fixtures per league, kickoffs spread over the next two weeks, unique team pairs."""
+    rng = random.Random(seed)
+    now = (now or datetime.now()).replace(second=0, microsecond=0)
+    teams = [f"{c} {s}" for c in CITIES for s in SUFFIXES]
+    # past ~36k fixtures, reserve sides ("Exeter City II") keep every pairing unique
+    while len(teams) * (len(teams) - 1) < n * len(leagues):
+        teams += [f"{t} {'I' * (len(teams) // (len(CITIES) * len(SUFFIXES)) + 1)}" for t in teams[:len(CITIES) * len(SUFFIXES)]]
+    pairs = rng.sample(list(itertools.permutations(teams, 2)), n * len(leagues))
+    out = []
+    for k, (home, away) in enumerate(pairs):
+        ko = now + timedelta(minutes=15 * rng.randint(8, 14 * 96))
+        margin = rng.uniform(1.03, 1.08)
+        p = [rng.uniform(0.25, 0.55), rng.uniform(0.2, 0.3)]
+        p.append(max(0.08, 1 - sum(p)))
+        over = rng.uniform(0.4, 0.6)
+        out.append({"id": k, "league": leagues[k // n], "home": home, "away": away, "kickoff": ko,
+                    "prices": [round(1 / (q * margin), 2) for q in p] +
+                              [round(1 / (q * margin), 2) for q in (over, 1 - over)],
+                    "version": 0, "changed_at": time.time()})
+    out.sort(key=lambda f: (leagues.index(f["league"]), f["kickoff"]))
+    return out
+
+
+class Book:
+    """One mock site's fixtures; mutate() walks some prices, remembering when each one moved."""
+
+    def __init__(self, site: str, fixtures: int, leagues: int = 1, seed: int = 0):
+        self.site = site
+        names = ["Premier League"] + [
+            OTHER_LEAGUES[i % len(OTHER_LEAGUES)] + (f" {i // len(OTHER_LEAGUES) + 1}" if i >= len(OTHER_LEAGUES) else "")
+            for i in range(leagues - 1)]
+        self.fixtures = make_fixtures(fixtures, names, seed)
+        self.by_teams = {(f["home"], f["away"]): f for f in self.fixtures}
+        self.version = 0
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed + 1)
+
+    def mutate(self, share: float):
+        """Move the prices of `share` of the fixtures by up to ±6% each."""
+        expected = share * len(self.fixtures)
+        k = min(len(self.fixtures), int(expected) + (self.rng.random() < expected % 1))
+        if not k:
+            return
+        with self.lock:
+            self.version += 1
+            for f in self.rng.sample(self.fixtures, k):
+                f["prices"] = [max(1.01, round(p * self.rng.uniform(0.94, 1.06), 2)) for p in f["prices"]]
+                f["version"], f["changed_at"] = self.version, time.time()
+
+    def changed_since(self, version: int) -> Tuple[int, List]:
+        with self.lock:
+            return self.version, [[f["id"], [f"{p:.2f}" for p in f["prices"]]]
+                                  for f in self.fixtures if f["version"] > version]
+
+
+# ---------------- rendering ----------------
+
+def _ord(d: int) -> str:
+    return f"{d}{'th' if 10 <= d % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(d % 10, 'th')}"
+
+def _lines(*lines: str) -> str:
+    return "".join(f"<div>{html.escape(s)}</div>" for s in lines)
+
+def _odd(p: float) -> str:
+    return f'<div class="odd">{p:.2f}</div>'
+
+def render_fixture(site: str, f: Dict, prev: Optional[Dict]) -> str:
+    """One fixture as each site lays it out, plus the date/league header it opens, if any."""
+    ko, (h, d, a, ov, un) = f["kickoff"], f["prices"]
+    head = ""
+    if site == "Betjets":
+        if prev is None or prev["kickoff"].date() != ko.date():
+            head = _lines(ko.strftime("%d/%m/%Y"))
+        t = f"{ko.hour % 12 or 12}:{ko:%M} {'AM' if ko.hour < 12 else 'PM'}"
+        body = (_lines(t, f["home"], f["away"], "1") + _odd(h) + _lines("X") + _odd(d) + _lines("2") + _odd(a)
+                + _lines("Over 2.5") + _odd(ov) + _lines("Under 2.5") + _odd(un) + _lines("+197"))
+    elif site == "SunBet":
+        body = (_lines(f"{ko.day} {ko:%b}", f"{ko:%H:%M}", f["home"], f["away"]) + _odd(h) + _odd(d) + _odd(a)
+                + f'<div>Over 2.5 <span class="odd">{ov:.2f}</span></div>'
+                + f'<div>Under 2.5 <span class="odd">{un:.2f}</span></div>' + _lines("More Bets"))
+    else:
+        body = (_lines(f"{_ord(ko.day)} {ko:%b}, {ko:%H:%M}", f["home"], f["away"]) + _odd(h) + _odd(d) + _odd(a)
+                + _lines("Over 2.5") + _odd(ov) + _lines("Under 2.5") + _odd(un))
+    return f'{head}<div class="fx" data-f="{f["id"]}">{body}</div>'
+
+def render_batch(book: Book, offset: int, limit: int = BATCH) -> Tuple[str, Optional[int]]:
+    with book.lock:
+        fx = book.fixtures
+        if book.site == "SuperSportBET":
+            # one <section> per competition; the page script merges a batch into the section it continues
+            part = "".join(
+                f'<section class="competition" data-league="{html.escape(lg)}"><h3>{html.escape(lg)}</h3>'
+                + "".join(render_fixture(book.site, f, None) for f in group) + "</section>"
+                for lg, group in itertools.groupby(fx[offset:offset + limit], key=lambda f: f["league"]))
+        else:
+            part = "".join(render_fixture(book.site, f, fx[i - 1] if i else None)
+                           for i, f in enumerate(fx[offset:offset + limit], start=offset))
+    nxt = offset + limit
+    return part, (nxt if nxt < len(fx) else None)
+
+# appends the next batch when the reader nears the bottom, and pulls moved odds every POLL_MS
+SCRIPT = """<script>
+const API = "%(api)s", list = document.getElementById("list");
+let next = %(next)s, busy = false, version = %(version)d;
+async function more() {
+  if (busy || next === null) return;
+  busy = true;
+  const j = await (await fetch(`${API}/fixtures?offset=${next}`)).json();
+  const t = document.createElement("template");
+  t.innerHTML = j.html;
+  for (const el of [...t.content.children]) {
+    const last = list.lastElementChild;
+    if (el.dataset.league && last && last.dataset.league === el.dataset.league) {
+      el.querySelector("h3").remove(); last.append(...el.childNodes);
+    } else list.append(el);
+  }
+  next = j.next; busy = false;
+}
+addEventListener("scroll", () => { if (innerHeight + scrollY >= document.body.scrollHeight - 2000) more(); });
+setInterval(async () => {
+  const j = await (await fetch(`${API}/odds?since=${version}`)).json();
+  version = j.version;
+  for (const [id, ps] of j.changed)
+    document.querySelectorAll(`[data-f="${id}"] .odd`).forEach((e, i) => { e.textContent = ps[i]; });
+}, %(poll)d);
+</script>"""
+
+CONSENT = ('<div id="cookies">We use cookies <button onclick="this.parentNode.remove()">Accept</button></div>')
+
+def render_page(book: Book, kind: str, base: str, static: bool) -> str:
+    """Landing page (or SunBet's shell / frame); `static` inlines every fixture and drops the scripts."""
+    if kind == "shell":
+        # SunBet: the sportsbook lives in an iframe the shell routes from its #hash
+        return (f"<html><body>{CONSENT}<div>SunBet</div><div>Sports</div>"
+                f'<iframe id="book" style="width:100%;height:900px" src="{base}/frame"></iframe>'
+                "<script>const fr = document.getElementById('book');"
+                f"const route = () => {{ fr.src = '{base}/frame?route=' + encodeURIComponent(location.hash.slice(1)); }};"
+                "addEventListener('hashchange', route); route();</script></body></html>")
+    batch, nxt = render_batch(book, 0, len(book.fixtures) if static else BATCH)
+    script = "" if static else SCRIPT % {"api": f"{base}/api", "next": json.dumps(nxt),
+                                          "version": book.version, "poll": POLL_MS}
+    if book.site == "Betjets":
+        top = _lines("Football", "England", "EPL", "Match Result")
+        hidden = ""
+    elif book.site == "SunBet":
+        top = _lines("Football", "England", "Premier League", "Matches", "Match Result")
+        hidden = ""
+    else:
+        # fixtures stay hidden until the Soccer tab is picked
+        top = ('<button onclick="document.getElementById(\'list\').style.display=\'block\'">Soccer</button>'
+               + _lines("Highlights"))
+        hidden = "" if static else ' style="display:none"'
+    return (f"<html><head><title>{book.site}</title></head><body>{CONSENT if kind != 'frame' else ''}"
+            f'{top}<div id="list"{hidden}>{batch}</div>{script}</body></html>')
+
+
+# ---------------- server ----------------
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, as the real sites serve
+    books: Dict[str, Book] = {}
+    latency_ms = 0.0
+    jitter_ms = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def _site(self, path: str) -> Tuple[Optional[str], str, str]:
+        """(site, path within the site, base prefix) from the Host header or the first path segment."""
+        host = (self.headers.get("Host") or "").split(":")[0].split(".")[0]
+        if host in HOSTS:
+            return HOSTS[host], path, ""
+        first, _, rest = path.lstrip("/").partition("/")
+        if first in HOSTS:
+            return HOSTS[first], "/" + rest, "/" + first
+        return None, path, ""
+
+    def _send(self, body: str, ctype: str = "text/html", status: int = 200, etag: bool = False):
+        """`etag`: validate by content (304 on a matching If-None-Match) instead of no-store."""
+        data = body.encode("utf-8")
+        tag = f'"{hashlib.blake2b(data, digest_size=8).hexdigest()}"' if etag else None
+        if tag and self.headers.get("If-None-Match") == tag:
+            self.send_response(304)
+            self.send_header("ETag", tag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if tag:
+            self.send_header("ETag", tag)
+        else:
+            self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        u = urlparse(self.path)
+        q = {k: v[-1] for k, v in parse_qs(u.query).items()}
+        site, path, base = self._site(u.path)
+        if site is None:
+            index = "".join(f'<div><a href="/{h}{p}">{s}</a></div>' for s, (h, p) in SITES.items())
+            return self._send(f"<html><body>{index}</body></html>")
+        book = self.books[site]
+        if path == "/api/fixtures":
+            part, nxt = render_batch(book, int(q.get("offset", 0)), int(q.get("limit", BATCH)))
+            return self._send(json.dumps({"html": part, "next": nxt}), "application/json")
+        if path == "/api/odds":
+            version, changed = book.changed_since(int(q.get("since", 0)))
+            return self._send(json.dumps({"version": version, "changed": changed}), "application/json")
+        if path.startswith("/api/"):
+            return self._send("not found", "text/plain", 404)
+        if site == "SunBet":
+            kind = "frame" if path == "/frame" else "shell"
+        else:
+            kind = "page"
+        static = q.get("static") == "1"
+        self._send(render_page(book, kind, base, static), etag=static)
+
+
+def serve(port: int = 8765, host: str = "127.0.0.1", fixtures: int = 20, leagues: int = 5,
+          latency_ms: float = 0.0, jitter_ms: float = 0.0, mutate: float = 0.0, seed: int = 0) -> ThreadingHTTPServer:
+    """Start the mock in background threads and return the server (shutdown() to stop).
+
+    `fixtures` is per competition; SuperSport gets `leagues` competitions, the others one.
+    `mutate` is the share of fixtures whose odds move per second.
+    """
+    books = {site: Book(site, fixtures, leagues if site == "SuperSportBET" else 1, seed + k)
+             for k, site in enumerate(SITES)}
+    handler = type("MockHandler", (Handler,), {"books": books, "latency_ms": latency_ms, "jitter_ms": jitter_ms})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.books = books
+    threading.Thread(target=server.serve_forever, name="mock-book", daemon=True).start()
+    if mutate > 0:
+        def tick():
+            while True:
+                time.sleep(0.25)
+                for b in books.values():
+                    b.mutate(mutate * 0.25)
+        threading.Thread(target=tick, name="mock-odds", daemon=True).start()
+    return server
+
+
+def urls(port: int) -> Dict[str, str]:
+    """What each site's BOOK.url becomes when scraping the mock."""
+    return {site: f"http://{h}.localhost:{port}{p}" for site, (h, p) in SITES.items()}
+
+
+def http_urls(port: int) -> Dict[str, str]:
+    """Each site's server-rendered page (BOOK.http_url) on the mock; SunBet's is the sportsbook frame."""
+    return {site: f"http://127.0.0.1:{port}/{h}{'/frame' if site == 'SunBet' else p}?static=1"
+            for site, (h, p) in SITES.items()}
+
+
+# ---------------- benchmark ----------------
+
+def check(book: Book, rows: Batch, started: float) -> Dict:
+    """Recall against the served fixtures; moved odds the scrape saw (with their age) or missed."""
+    hits, stale, lag = 0, 0, []
+    with book.lock:
+        for r in rows:
+            f = book.by_teams.get((r.home_team, r.away_team))
+            if f is None:
+                continue
+            hits += 1
+            got = [r.odds_home, r.odds_draw, r.odds_away, r.over, r.under, r.total_line]
+            want = f["prices"] + [2.5]
+            if f["changed_at"] < started and got != want:
+                stale += 1          # moved before the scrape began, old price still read (or misread)
+            elif f["version"] and got == want:
+                lag.append(time.time() - f["changed_at"])
+    return {"served": len(book.fixtures), "rows": len(rows), "recall": round(hits / len(book.fixtures), 3),
+            "stale": stale, "update_lag_s": round(statistics.median(lag), 2) if lag else None}
+
+
+def bench(scale: int = 1, watch: int = 1, port: int = 8765, http: bool = False, **mock) -> List[Dict]:
+    """Scrape every site against the mock at `scale`× its real fixture count, `watch` times in a row.
+
+    `http`: over the browserless fast path (each site's static page) instead of Chromium.
+    """
+    import scrape_all
+    server = serve(port, fixtures=20 * scale, **mock)
+    out_dir = tempfile.mkdtemp(prefix="mock_book-")
+    results = []
+    try:
+        for site, url in urls(port).items():
+            book = scrape_all.book(site)
+            book.url, book.out_dir = url, out_dir
+            book.http_url = http_urls(port)[site] if http else None
+            for n in range(watch):
+                started = time.time()
+                with instrument.Run(f"mock-{book.name}", out_dir) as run:
+                    rows = book.scrape()
+                seconds = time.time() - started
+                res = {"site": site, "pass": n + 1, "seconds": round(seconds, 2),
+                       "rows_per_s": round(len(rows) / seconds, 1), "scrolls": run.counts.get("scrolls", 0),
+                       "http": {k: v for k, v in run.counts.items() if k.startswith("http_")} or None,
+                       "max_chunk_bytes": run.counts.get("max_chunk_bytes"), "peak_rss_bytes": instrument.peak_rss_bytes(),
+                       **check(server.books[site], rows, started)}
+                results.append(res)
+                print(json.dumps(res), file=sys.stderr)
+    finally:
+        server.shutdown()
+    return results
+
+
+def main(argv: List[str] = None):
+    ap = argparse.ArgumentParser(description="Local mock sportsbook for load-testing the scrapers.")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--fixtures", type=int, default=20, help="fixtures per competition")
+    ap.add_argument("--leagues", type=int, default=5, help="competitions on the SuperSport page")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency, up to this")
+    ap.add_argument("--mutate", type=float, default=0.0, help="share of fixtures whose odds move per second")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--bench", action="store_true", help="scrape every site against the mock and report")
+    ap.add_argument("--scale", type=int, default=1, help="--bench: fixtures per competition = 20 × this")
+    ap.add_argument("--watch", type=int, default=1, help="--bench: back-to-back scrapes per site")
+    ap.add_argument("--http", action="store_true", help="--bench: over the HTTP fast path, not Chromium")
+    args = ap.parse_args(argv)
+    mock = {"leagues": args.leagues, "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+            "mutate": args.mutate, "seed": args.seed}
+
+    if args.bench:
+        print(json.dumps(bench(args.scale, args.watch, args.port, args.http, **mock), indent=2))
+        return
+    serve(args.port, args.host, args.fixtures, **mock)
+    for site, url in urls(args.port).items():
+        print(f"{site:>14}: {url}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
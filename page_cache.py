@@ -0,0 +1,99 @@
+# Content-addressed cache of parsed page text for the scrapers
+# Key: hash of (parser, local day, url, text) → the rows that text parsed to. Between
+# refreshes far-off fixtures often show the very same text, so an unchanged page, or an
+# unchanged competition on sectioned sites, skips parsing and its cached rows are merged in.
+# A small LRU in memory, backed by <out_dir>/cache/<site>/<hash>.json (least recently used
+# files evicted past the same limit); ARB_PAGE_CACHE=0 turns it off
+# Also keeps the last response of each HTTP fast-path URL (validators + body) for conditional requests
+# Standard library only
+
+import hashlib, json, os
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from fixtures import Batch
+
+
+def key(*parts: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for p in parts:
+        h.update(p.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def enabled() -> bool:
+    return os.environ.get("ARB_PAGE_CACHE", "1").lower() not in ("0", "off", "false", "no")
+
+
+class PageCache:
+    """hash → (parsed rows, seconds the parse took), in memory and on disk."""
+
+    def __init__(self, path: str, max_entries: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.mem: "OrderedDict[str, Tuple[Batch, float]]" = OrderedDict()
+
+    def _file(self, k: str) -> str:
+        return os.path.join(self.path, f"{k}.json")
+
+    def _remember(self, k: str, entry: Tuple[Batch, float]):
+        self.mem[k] = entry
+        self.mem.move_to_end(k)
+        while len(self.mem) > self.max_entries:
+            self.mem.popitem(last=False)
+
+    def get(self, k: str) -> Optional[Tuple[Batch, float]]:
+        entry = self.mem.get(k)
+        if entry is not None:
+            self.mem.move_to_end(k)
+            return entry
+        try:
+            with open(self._file(k), encoding="utf-8") as f:
+                doc = json.load(f)
+            os.utime(self._file(k))   # recently used, for eviction
+            entry = (Batch.from_columns(doc["cols"]), doc["parse_s"])
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(k, entry)
+        return entry
+
+    def put(self, k: str, rows: Batch, parse_s: float):
+        self._remember(k, (rows, parse_s))
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(self._file(k) + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"parse_s": parse_s, "cols": rows.columns()}, f)
+            os.replace(self._file(k) + ".tmp", self._file(k))
+            self._evict()
+        except OSError:
+            pass   # a cache that can't be written is only a slower scrape
+
+    def response(self, url: str) -> Optional[Dict]:
+        """{etag, last_modified, body} of the last 200 kept for `url`."""
+        try:
+            with open(self._file("http-" + key(url)), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def keep_response(self, url: str, etag: Optional[str], last_modified: Optional[str], body: str):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            path = self._file("http-" + key(url))
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"etag": etag, "last_modified": last_modified, "body": body}, f)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        files = [e for e in os.scandir(self.path) if e.name.endswith(".json")]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime)
+        for e in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
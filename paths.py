@@ -0,0 +1,11 @@
+# Where every entry point reads and writes its files
+# ARB_OUTPUT_DIR when set, else output/ next to this file: the folder the scheduled workflow
+# commits, whatever directory a scraper, the service or the dashboard is started from
+# Standard library only
+
+import os
+
+
+def out_dir() -> str:
+    """The output directory: ARB_OUTPUT_DIR, else <repo>/output."""
+    return os.environ.get("ARB_OUTPUT_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "output")
@@ -0,0 +1,155 @@
+# Incremental best-price index: one price update → only that event's covers re-checked
+# Same markets and covers as arbitrage.py, but fed one price at a time
+# run: python price_index.py --bench 500000   (synthetic update stream)
+
+import sys, time
+from heapq import heapify, heappop, heappush
+from typing import Callable, Dict, List, Optional, Tuple
+
+from markets import CROSS_COVERS, MARKET_OUTCOMES, market_family
+
+Subscriber = Callable[[str, Dict], None]
+
+
+class BestPrice:
+    """Every book's price for one outcome, best on top.
+
+    Max-heap with lazy deletion: updates push, stale entries are dropped
+    when they surface, so set/remove/best are O(log k) amortised.
+    """
+    __slots__ = ("prices", "heap")
+
+    def __init__(self):
+        self.prices: Dict[str, float] = {}
+        self.heap: List[Tuple[float, str]] = []
+
+    def set(self, book: str, price: float):
+        self.prices[book] = price
+        heappush(self.heap, (-price, book))
+        if len(self.heap) > 2 * len(self.prices) + 8:
+            self.heap = [(-p, b) for b, p in self.prices.items()]
+            heapify(self.heap)
+
+    def remove(self, book: str):
+        self.prices.pop(book, None)
+
+    def best(self) -> Optional[Tuple[float, str]]:
+        heap = self.heap
+        while heap:
+            p, b = heap[0]
+            if self.prices.get(b) == -p:
+                return -p, b
+            heappop(heap)
+        return None
+
+
+class PriceIndex:
+    """Best prices keyed by (event, market, outcome), with open opportunities per cover.
+
+    update() touches one outcome, then re-sums only the covers that include
+    it for that event. Subscribers get ("open" | "update" | "close", opportunity)
+    when a cover crosses the arbitrage line or its legs change while open.
+    """
+
+    def __init__(self):
+        self.outcomes: Dict[tuple, BestPrice] = {}
+        self.open: Dict[tuple, Dict] = {}
+        self.subscribers: List[Subscriber] = []
+        self._covers: Dict[tuple, List[Tuple[str, List[Tuple[str, str]]]]] = {}
+
+    def subscribe(self, fn: Subscriber):
+        self.subscribers.append(fn)
+
+    def covers_for(self, market: str, outcome: str) -> List[Tuple[str, List[Tuple[str, str]]]]:
+        """(cover name, legs) for every cover this outcome belongs to, cached per market."""
+        key = (market, outcome)
+        if key not in self._covers:
+            covers = []
+            fam = market_family(market)
+            outs = MARKET_OUTCOMES.get(fam, ())
+            if fam != "Double Chance" and outcome in outs:
+                covers.append((market, [(market, o) for o in outs]))
+            for name, legs in CROSS_COVERS.items():
+                if key in legs:
+                    covers.append((name, legs))
+            self._covers[key] = covers
+        return self._covers[key]
+
+    def update(self, event, market: str, outcome: str, book: str, price: Optional[float]):
+        """Apply one quote; a missing price or one ≤ 1.0 withdraws the book's quote."""
+        slot = self.outcomes.get((event, market, outcome))
+        if slot is None:
+            slot = self.outcomes[(event, market, outcome)] = BestPrice()
+        if price is None or not price > 1.0:
+            slot.remove(book)
+        else:
+            slot.set(book, float(price))
+        for cover, legs in self.covers_for(market, outcome):
+            self._evaluate(event, cover, legs)
+
+    def _evaluate(self, event, cover: str, legs: List[Tuple[str, str]]):
+        best = []
+        for m, o in legs:
+            slot = self.outcomes.get((event, m, o))
+            top = slot.best() if slot is not None else None
+            if top is None:
+                break
+            best.append((m, o, top[1], top[0]))
+        key = (event, cover)
+        was = self.open.get(key)
+        implied = sum(1.0 / p for *_, p in best) if len(best) == len(legs) else None
+        if implied is None or implied >= 1.0:
+            if was is not None:
+                del self.open[key]
+                self._notify("close", was)
+            return
+        opp = {"event": event, "cover": cover, "implied": implied,
+               "profit_margin": (1.0 / implied - 1.0) * 100,
+               "legs": [{"market": m, "outcome": o, "book": b, "price": p,
+                         "stake_fraction": (1.0 / p) / implied} for m, o, b, p in best]}
+        self.open[key] = opp
+        if was is None:
+            self._notify("open", opp)
+        elif was["legs"] != opp["legs"]:
+            self._notify("update", opp)
+
+    def _notify(self, kind: str, opp: Dict):
+        for fn in self.subscribers:
+            fn(kind, opp)
+
+    def load(self, prices) -> "PriceIndex":
+        """Seed from a long price table (arbitrage.PRICE_COLS), e.g. arbitrage.to_long output."""
+        for event, market, outcome, book, price in prices[["event", "market", "outcome", "book", "price"]].itertuples(index=False):
+            self.update(event, market, outcome, book, price)
+        return self
+
+
+def bench(n_updates: int, n_events: int = 2000, n_books: int = 8):
+    import numpy as np
+    import arbitrage
+    seed = arbitrage.synthetic_prices(n_events * 10 * n_books, n_books=n_books)
+    t0 = time.perf_counter()
+    index = PriceIndex().load(seed)
+    load_s = time.perf_counter() - t0
+    counts = {"open": 0, "update": 0, "close": 0}
+    index.subscribe(lambda kind, opp: counts.__setitem__(kind, counts[kind] + 1))
+
+    # random walk on random existing quotes
+    rng = np.random.default_rng(1)
+    rows = rng.integers(0, len(seed), n_updates)
+    moves = rng.normal(1.0, 0.02, n_updates)
+    ev, mk, oc, bk, pr = (seed[c].to_numpy() for c in ["event", "market", "outcome", "book", "price"])
+    stream = [(ev[r], mk[r], oc[r], bk[r], round(float(pr[r] * mv), 2)) for r, mv in zip(rows, moves)]
+    t0 = time.perf_counter()
+    for u in stream:
+        index.update(*u)
+    dt = time.perf_counter() - t0
+    print(f"seeded {len(seed):,} quotes in {load_s:.2f}s; {n_updates:,} updates in {dt:.2f}s "
+          f"({n_updates / dt:,.0f}/s); {counts} · {len(index.open)} open")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--bench":
+        bench(int(sys.argv[2]))
+    else:
+        print("usage: python price_index.py --bench N_UPDATES")
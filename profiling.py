@@ -0,0 +1,91 @@
+# Opt-in profiling for the scraper and dashboard entry points
+# Off unless asked for, via the command line or the ARB_PROFILE environment variable:
+#   python betjets2.py --profile                     (cProfile)
+#   python sunbet2.py --profile=cprofile,tracemalloc
+#   python scrape_all.py --profile tracemalloc
+#   ARB_PROFILE=tracemalloc python supersport2.py
+#   streamlit run ui.py -- --profile                 (one .prof per rerun)
+# Output goes to <OUT_DIR>/profiles (or ARB_PROFILE_DIR):
+#   <name>-<time>.prof        open with snakeviz, or python -m pstats
+#   <name>-<time>.txt         top functions by cumulative time
+#   <name>-<time>-alloc.txt   top allocation sites (tracemalloc)
+# For sampling instead (no code change): py-spy record -o profile.svg -- python betjets2.py
+
+import io, os, sys
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Set
+
+MODES = ("cprofile", "tracemalloc")
+ALL = ("1", "all", "on", "true")
+TOP_N = 40
+
+
+def modes(argv: List[str] = None) -> Set[str]:
+    """Profilers asked for by `--profile [a,b]` / `--profile=a,b` in argv, else by ARB_PROFILE; empty when off.
+
+    A bare `--profile` takes the next argument when that is a list of modes
+    (as scrape_all.py's own option does), otherwise it means cProfile.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    spec = os.environ.get("ARB_PROFILE", "")
+    for i, arg in enumerate(argv):
+        if arg == "--profile":
+            nxt = argv[i + 1] if i + 1 < len(argv) else ""
+            listed = [m.strip().lower() for m in nxt.split(",") if m.strip()]
+            spec = nxt if listed and all(m in MODES or m in ALL for m in listed) else "cprofile"
+        elif arg.startswith("--profile="):
+            spec = arg.split("=", 1)[1]
+    picked = {m.strip().lower() for m in spec.split(",") if m.strip()}
+    if picked & set(ALL):
+        return set(MODES)
+    unknown = picked - set(MODES)
+    if unknown:
+        print(f"profiling: ignoring unknown mode(s) {sorted(unknown)}, expected {MODES}", file=sys.stderr)
+    return picked & set(MODES)
+
+
+@contextmanager
+def profiled(name: str, out_dir: str, argv: List[str] = None):
+    """Run the block under the profilers picked by modes(argv); a no-op when none are."""
+    picked = modes(argv)
+    if not picked:
+        yield
+        return
+    import cProfile, pstats, tracemalloc
+    prof_dir = os.environ.get("ARB_PROFILE_DIR") or os.path.join(out_dir, "profiles")
+    os.makedirs(prof_dir, exist_ok=True)
+    base = os.path.join(prof_dir, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}")
+
+    prof = cProfile.Profile() if "cprofile" in picked else None
+    started_tm = "tracemalloc" in picked and not tracemalloc.is_tracing()
+    if started_tm:
+        tracemalloc.start(25)
+    if prof is not None:
+        prof.enable()
+    try:
+        yield
+    finally:
+        if prof is not None:
+            prof.disable()
+        if "tracemalloc" in picked:
+            # snapshot before writing the cProfile report, so its allocations don't show up
+            snap = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ])
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tm:
+                tracemalloc.stop()
+            with open(base + "-alloc.txt", "w", encoding="utf-8") as f:
+                f.write(f"current {current / 1e6:.1f} MB · peak {peak / 1e6:.1f} MB\n\n")
+                for stat in snap.statistics("lineno")[:TOP_N]:
+                    f.write(f"{stat}\n")
+        if prof is not None:
+            prof.dump_stats(base + ".prof")
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(TOP_N)
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(buf.getvalue())
+        print(f"profiling: wrote {base}.*", file=sys.stderr)
@@ -0,0 +1,103 @@
+# Last-good snapshot protection for the scrapers
+# A failed or empty scrape is retried with jittered exponential backoff and never
+# overwrites the site's previous files; <OUT_DIR>/status/<site>.json records the
+# last good scrape, the last error and when the next retry is due
+# Standard library only, like the scrapers
+
+import json, os, random, sys, time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Sequence
+
+BACKOFF_BASE = 5.0      # seconds before the first retry (upper bound, see backoff_delay)
+BACKOFF_CAP = 300.0
+
+
+class EmptyScrape(RuntimeError):
+    """The page loaded but yielded no rows (e.g. SunBet's frame never appeared)."""
+
+
+def backoff_delay(failures: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP,
+                  rng: random.Random = random) -> float:
+    """Seconds to wait after `failures` consecutive failures: base·2^(n-1), capped, with equal jitter.
+
+    The jitter keeps sites (and reruns) that failed together from retrying in lockstep.
+    """
+    ceiling = min(cap, base * 2 ** max(0, failures - 1))
+    return ceiling / 2 + rng.uniform(0, ceiling / 2)
+
+
+def status_path(out_dir: str, site: str) -> str:
+    return os.path.join(out_dir, "status", f"{site}.json")
+
+
+def read_status(out_dir: str, site: str) -> Dict:
+    try:
+        with open(status_path(out_dir, site), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_status(out_dir: str, site: str, status: Dict):
+    path = status_path(out_dir, site)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def record_ok(out_dir: str, site: str, rows: int) -> Dict:
+    status = {**read_status(out_dir, site), "last_ok": _now(), "last_rows": rows,
+              "failures": 0, "last_error": None, "next_retry": None}
+    write_status(out_dir, site, status)
+    return status
+
+
+def _at(seconds: Optional[float]) -> Optional[str]:
+    if seconds is None:
+        return None
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).isoformat(timespec="seconds")
+
+
+def record_failure(out_dir: str, site: str, error: str, retry_in: Optional[float]) -> Dict:
+    status = read_status(out_dir, site)
+    status.update(failures=status.get("failures", 0) + 1, last_error=error, failed_at=_now(),
+                  next_retry=_at(retry_in))
+    write_status(out_dir, site, status)
+    return status
+
+
+def record_retry(out_dir: str, site: str, retry_in: float) -> Dict:
+    """When a scheduler (rather than retrying() itself) will try a failed site again."""
+    status = {**read_status(out_dir, site), "next_retry": _at(retry_in)}
+    write_status(out_dir, site, status)
+    return status
+
+
+def retrying(site: str, out_dir: str, attempt: Callable[[], Sequence], retries: int = 2,
+             sleep: Callable[[float], None] = time.sleep) -> Sequence:
+    """Rows from attempt(), retried up to `retries` times with backoff on an error or no rows.
+
+    Only returns non-empty rows, so the caller's write can't replace the last
+    good snapshot with nothing. The final failure is re-raised after being
+    recorded in the site's status file; success is the caller's to record
+    (record_ok) once the rows are written.
+    """
+    for n in range(retries + 1):
+        try:
+            rows = attempt()
+            if not rows:
+                raise EmptyScrape(f"{site}: scrape returned no rows")
+            return rows
+        except Exception as e:
+            delay = backoff_delay(n + 1) if n < retries else None
+            record_failure(out_dir, site, f"{type(e).__name__}: {e}", delay)
+            if delay is None:
+                raise
+            print(f"{site}: {type(e).__name__}: {e} · retry {n + 1}/{retries} in {delay:.0f}s "
+                  f"(keeping the last good snapshot)", file=sys.stderr)
+            sleep(delay)
@@ -0,0 +1,142 @@
+# NDJSON row stream from the scrapers straight into the analyzer, no files in between
+# A scraper run with --stream writes each fixture row as one JSON line as soon as its chunk is
+# parsed (the JSON file's fields, scraped_at = when it was read), then one
+# {"end": <site>, "sources": [...], "rows": n} line once the scrape is complete, before its
+# files are written. arb_service.py --stream reads it and re-solves only the events it touches
+# Targets: "-"                  stdout (scraper) / stdin (analyzer)
+#          "unix:/path/to.sock" the analyzer listens, each scraper process connects (POSIX only)
+# run: python betjets2.py --stream - | python arb_service.py --stream -
+#      python arb_service.py --stream unix:/tmp/arb.sock &  python scrape_all.py --stream unix:/tmp/arb.sock
+# Standard library only
+
+import json, os, queue, socket, sys, threading
+from typing import Dict, Iterator, List, Optional
+
+
+def target(argv: List[str] = None) -> Optional[str]:
+    """Where rows go, from `--stream TARGET` / `--stream=TARGET` in argv, else ARB_STREAM; None when off."""
+    argv = sys.argv[1:] if argv is None else argv
+    found = os.environ.get("ARB_STREAM") or None
+    for i, arg in enumerate(argv):
+        if arg == "--stream" and i + 1 < len(argv):
+            found = argv[i + 1]
+        elif arg.startswith("--stream="):
+            found = arg.split("=", 1)[1]
+    return found
+
+
+def _unix_path(target: str) -> str:
+    if not target.startswith("unix:"):
+        raise ValueError(f"stream target must be '-' or 'unix:/path', not {target!r}")
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError("unix sockets aren't available on this platform; stream to '-' and pipe it")
+    return target[len("unix:"):]
+
+
+class Writer:
+    """One scraper's end of the stream; a lost reader turns it off instead of failing the scrape."""
+
+    def __init__(self, target: str):
+        self.target = target
+        self.sock = None
+        if target != "-":
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(_unix_path(target))
+
+    def _send(self, lines: List[bytes]):
+        if self.sock is not None:
+            self.sock.sendall(b"".join(lines))
+        else:
+            # one write per line: lines under PIPE_BUF reach a shared pipe whole, so several
+            # scraper processes can stream into the same stdout
+            for line in lines:
+                os.write(sys.stdout.fileno(), line)
+
+    def send(self, records: List[Dict]):
+        if self.target is None:
+            return
+        try:
+            self._send([(json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in records])
+        except OSError as e:
+            print(f"row stream to {self.target} lost ({e}); rows still go to the files", file=sys.stderr)
+            self.close()
+
+    def rows(self, records: List[Dict], scraped_at: str):
+        for r in records:
+            r["scraped_at"] = scraped_at
+        self.send(records)
+
+    def end(self, site: str, sources: List[str], rows: int):
+        self.send([{"end": site, "sources": sources, "rows": rows}])
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+        self.target, self.sock = None, None
+
+
+def open_writer(target: Optional[str]) -> Optional[Writer]:
+    """A Writer for `target`, or None when streaming is off or the reader can't be reached."""
+    if not target:
+        return None
+    try:
+        return Writer(target)
+    except (OSError, ValueError) as e:
+        print(f"row stream to {target} unavailable ({e}); writing files only", file=sys.stderr)
+        return None
+
+
+# ---------------- reading ----------------
+
+_DONE = object()
+
+def _read(stream, q: "queue.Queue", done: bool):
+    for raw in stream:
+        try:
+            q.put(json.loads(raw))
+        except ValueError:
+            print(f"row stream: skipped a malformed line ({raw[:80]!r})", file=sys.stderr)
+    if done:
+        q.put(_DONE)
+
+
+def _accept(server: socket.socket, q: "queue.Queue"):
+    while True:
+        conn, _ = server.accept()
+        threading.Thread(target=_read, args=(conn.makefile("rb"), q, False), daemon=True).start()
+
+
+def batches(target: str, max_rows: int = 5000) -> Iterator[List[Dict]]:
+    """Records as they arrive, in batches of whatever is waiting (at most `max_rows`).
+
+    "-" ends when stdin does; a unix socket keeps accepting scrapers until interrupted.
+    """
+    q: "queue.Queue" = queue.Queue()
+    if target == "-":
+        threading.Thread(target=_read, args=(sys.stdin.buffer, q, True), daemon=True).start()
+    else:
+        path = _unix_path(target)
+        if os.path.exists(path):
+            os.remove(path)     # left over from an analyzer that didn't shut down cleanly
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(64)
+        threading.Thread(target=_accept, args=(server, q), daemon=True).start()
+    while True:
+        item = q.get()
+        batch = []
+        while item is not _DONE:
+            batch.append(item)
+            if len(batch) >= max_rows:
+                break
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                break
+        if batch:
+            yield batch
+        if item is _DONE:
+            return
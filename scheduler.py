@@ -0,0 +1,222 @@
+# Adaptive scrape scheduler: each (bookmaker, league) gets its own refresh interval
+# Intervals shrink as kickoff gets close and where the last scrapes moved prices,
+# and grow for quiet fixtures days away; at most --max-browsers scrapes run at once
+# run: python scheduler.py                    (run forever)
+#      python scheduler.py --plan             (print the current intervals and exit)
+#      python scheduler.py --max-browsers 1
+
+import argparse, os, sys, time
+from datetime import datetime
+from io import BytesIO
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import arb_core
+import resilience
+import scrape_all
+
+MIN_INTERVAL = 30.0        # seconds
+MAX_INTERVAL = 30 * 60.0
+
+# (hours to the next kickoff up to, base interval in seconds); in-play counts as 0 hours
+KICKOFF_BANDS = [(0.5, 30.0), (2, 60.0), (6, 180.0), (24, 600.0), (72, 1200.0)]
+
+# mean absolute log price move between the last two scrapes that halves the interval
+VOL_REF = 0.01
+
+PRICE_FIELDS = ["odds_home", "odds_draw", "odds_away", "over", "under"]
+PLAN_COLS = ["site", "league", "events", "hours_to_kickoff", "volatility", "interval_s"]
+
+
+def league_of(category) -> str:
+    """"Football / England / Premier League" → "Premier League"."""
+    return str(category).split("/")[-1].strip() if isinstance(category, str) and category else "Unknown"
+
+
+def kickoffs(df: pd.DataFrame, now: datetime) -> pd.Series:
+    """Local kickoff times from the scrapers' "Sat (02 Oct)" + "15:00" columns."""
+    day = df["date"].astype(str).str.extract(r"(\d{1,2} \w{3})")[0]
+    ko = pd.to_datetime(day + f" {now.year} " + df["start_time"].astype(str), format="%d %b %Y %H:%M", errors="coerce")
+    # dates carry no year: early January fixtures seen in late December belong to next year
+    return ko.where(ko > pd.Timestamp(now) - pd.Timedelta(days=180), ko + pd.DateOffset(years=1))
+
+
+def hours_to_kickoff(df: pd.DataFrame, now: datetime) -> Optional[float]:
+    """Hours until the next kickoff; matches that started under 2h ago count as 0."""
+    if df.empty:
+        return None
+    ko = kickoffs(df, now).dropna()
+    ko = ko[ko > pd.Timestamp(now) - pd.Timedelta(hours=2)]
+    if ko.empty:
+        return None
+    return max(0.0, (ko.min() - pd.Timestamp(now)).total_seconds() / 3600)
+
+
+def volatility(history: pd.DataFrame) -> float:
+    """Mean absolute log price move per quote between the last two scrapes."""
+    if history.empty or "scraped_at" not in history.columns:
+        return 0.0
+    times = history["scraped_at"].dropna().unique()
+    if len(times) < 2:
+        return 0.0
+    last, prev = np.sort(times)[-2:][::-1]
+    fields = [c for c in PRICE_FIELDS if c in history.columns]
+    keys = ["home_team", "away_team", "date"]
+    new = history[history["scraped_at"] == last].drop_duplicates(keys).set_index(keys)[fields]
+    old = history[history["scraped_at"] == prev].drop_duplicates(keys).set_index(keys)[fields]
+    new, old = new.align(old, join="inner")
+    moves = np.abs(np.log(new.apply(pd.to_numeric, errors="coerce") / old.apply(pd.to_numeric, errors="coerce")))
+    moves = moves.to_numpy(dtype=float)
+    moves = moves[np.isfinite(moves)]
+    return float(moves.mean()) if moves.size else 0.0
+
+
+def interval_for(hours: Optional[float], vol: float,
+                 min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL) -> float:
+    """Refresh interval in seconds for a league, from its next kickoff and recent price movement."""
+    base = max_interval
+    if hours is not None:
+        for upto, seconds in KICKOFF_BANDS:
+            if hours <= upto:
+                base = seconds
+                break
+    return float(min(max_interval, max(min_interval, base / (1.0 + vol / VOL_REF))))
+
+
+def tail_csv(path: str, max_bytes: int = 1 << 20) -> pd.DataFrame:
+    """The last `max_bytes` of a growing CSV (header kept), enough for the latest scrapes."""
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    with open(path, "rb") as f:
+        header = f.readline()
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(len(header), size - max_bytes))
+        if f.tell() > len(header):
+            f.readline()  # partial line
+        body = f.read()
+    df = pd.read_csv(BytesIO(header + body))
+    df["scraped_at"] = arb_core.parse_scraped_at(df)
+    return df
+
+
+def plan(sites: List[str], now: datetime = None, **limits) -> pd.DataFrame:
+    """One row per (site, league): next kickoff, recent volatility and the resulting interval."""
+    now = now or datetime.now()
+    rows = []
+    for site in sites:
+        paths = arb_core.FILES[site]
+        cur = pd.read_csv(paths["csv"]) if os.path.exists(paths["csv"]) else pd.DataFrame()
+        hist = tail_csv(paths["history"])
+        if cur.empty:
+            rows.append((site, "Unknown", 0, None, 0.0, limits.get("min_interval", MIN_INTERVAL)))
+            continue
+        cur = cur.assign(league=cur.get("category", pd.Series(index=cur.index, dtype=object)).map(league_of))
+        if not hist.empty:
+            hist = hist.assign(league=hist.get("category", pd.Series(index=hist.index, dtype=object)).map(league_of))
+        for league, g in cur.groupby("league"):
+            hours = hours_to_kickoff(g, now)
+            vol = volatility(hist[hist["league"] == league]) if not hist.empty else 0.0
+            rows.append((site, league, len(g), hours, vol, interval_for(hours, vol, **limits)))
+    return pd.DataFrame(rows, columns=PLAN_COLS)
+
+
+class Scheduler:
+    """Runs each site's scraper when its most urgent league is due, within a browser budget.
+
+    Every site module scrapes a whole page (one league, or every competition
+    for SuperSport), so a site's interval is the shortest of its leagues'. The plan for a site is
+    recomputed from its files each time its scrape finishes; a failed site
+    comes back after a jittered backoff (resilience.backoff_delay) instead,
+    while its last good files keep serving the dashboard.
+    """
+
+    def __init__(self, sites: List[str], max_browsers: int = 2, timeout: float = 180.0,
+                 min_interval: float = MIN_INTERVAL, max_interval: float = MAX_INTERVAL):
+        self.sites = sites
+        self.max_browsers = max_browsers
+        self.timeout = timeout
+        self.limits = {"min_interval": min_interval, "max_interval": max_interval}
+        self.due: Dict[str, float] = {s: 0.0 for s in sites}   # monotonic time; never scraped → now
+        self.running: Dict[str, tuple] = {}
+        self.results: List[Dict] = []
+
+    def reschedule(self, site: str, now: float, failed: bool = False) -> pd.DataFrame:
+        """Next run from the site's plan; after a failure, retry on the backoff if that comes sooner."""
+        p = plan([site], **self.limits)
+        interval = p["interval_s"].min() if not p.empty else self.limits["min_interval"]
+        if failed:
+            failures = resilience.read_status(arb_core.OUT_DIR, site.lower()).get("failures", 1)
+            interval = min(interval, resilience.backoff_delay(failures))
+            resilience.record_retry(arb_core.OUT_DIR, site.lower(), interval)
+        self.due[site] = now + interval
+        return p
+
+    def step(self) -> float:
+        """Collect finished scrapes, start due ones; returns seconds until something can happen."""
+        now = time.monotonic()
+        for site, (p, conn, started) in list(self.running.items()):
+            res = None
+            if conn.poll(0):
+                try:
+                    res = conn.recv()
+                except EOFError:
+                    res = {"site": site, "ok": False, "rows": 0, "error": f"worker exited with code {p.exitcode}"}
+            elif now - started > self.timeout:
+                p.terminate()
+                res = {"site": site, "ok": False, "rows": 0, "error": f"timed out after {self.timeout:g}s"}
+                resilience.record_failure(arb_core.OUT_DIR, site.lower(), res["error"], None)
+            if res is None:
+                continue
+            p.join(5)
+            del self.running[site]
+            res.setdefault("duration_s", round(now - started, 2))
+            p_site = self.reschedule(site, time.monotonic(), failed=not res["ok"])
+            res["next_in_s"] = round(self.due[site] - time.monotonic(), 1)
+            self.results.append(res)
+            status = f"{res['rows']} rows" if res["ok"] else f"FAILED ({res['error']})"
+            leagues = ", ".join(f"{r.league} {r.interval_s:.0f}s" for r in p_site.itertuples())
+            print(f"{site}: {status} in {res['duration_s']:.1f}s · next in {res['next_in_s']:.0f}s ({leagues})",
+                  file=sys.stderr)
+
+        # most overdue first, while browsers are free
+        for site in sorted((s for s in self.sites if s not in self.running), key=self.due.get):
+            if len(self.running) >= self.max_browsers or self.due[site] > now:
+                break
+            p, conn = scrape_all.start(site, retries=0)   # retries are scheduled here, not slept on
+            self.running[site] = (p, conn, now)
+
+        waits = [self.due[s] - now for s in self.sites if s not in self.running]
+        if self.running:
+            waits.append(0.5)   # poll running scrapes
+        return max(0.0, min(waits, default=1.0))
+
+    def run(self, duration: float = None):
+        end = None if duration is None else time.monotonic() + duration
+        while end is None or time.monotonic() < end:
+            time.sleep(min(self.step(), 5.0))
+
+
+def main(argv: List[str] = None):
+    ap = argparse.ArgumentParser(description="Scrape each bookmaker as often as its fixtures need.")
+    ap.add_argument("--sites", nargs="+", choices=list(scrape_all.SITES), default=list(scrape_all.SITES))
+    ap.add_argument("--max-browsers", type=int, default=2, help="scrapes (browsers) running at once")
+    ap.add_argument("--timeout", type=float, default=180.0, help="seconds before a scrape is killed")
+    ap.add_argument("--min-interval", type=float, default=MIN_INTERVAL)
+    ap.add_argument("--max-interval", type=float, default=MAX_INTERVAL)
+    ap.add_argument("--plan", action="store_true", help="print the intervals from the current files and exit")
+    args = ap.parse_args(argv)
+    limits = {"min_interval": args.min_interval, "max_interval": args.max_interval}
+
+    if args.plan:
+        print(plan(args.sites, **limits).round({"hours_to_kickoff": 1, "volatility": 4, "interval_s": 0}).to_string(index=False))
+        return
+    try:
+        Scheduler(args.sites, args.max_browsers, args.timeout, **limits).run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
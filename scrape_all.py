@@ -0,0 +1,118 @@
+# Run every site's scraper in its own process and write one run report
+# A slow or crashing site only loses its own rows; a full refresh takes as long as the slowest site
+# run: python scrape_all.py                          (all sites)
+#      python scrape_all.py --sites SunBet Betjets   (some of them)
+#      python scrape_all.py --report output/run_report.json
+#      python scrape_all.py --profile=cprofile,tracemalloc
+#      python scrape_all.py --stream unix:/tmp/arb.sock   (rows to arb_service.py --stream as they're parsed)
+
+import argparse, importlib, json, os, sys, time
+import multiprocessing as mp
+from datetime import datetime, timezone
+from multiprocessing.connection import Connection
+from typing import Dict, List, Tuple
+
+from bookmaker import Bookmaker
+
+# site → module defining its BOOK (a bookmaker.Bookmaker); a new site is one more line here
+SITES = {
+    "SuperSportBET": "supersport2",
+    "SunBet": "sunbet2",
+    "Betjets": "betjets2",
+}
+
+
+def book(site: str) -> Bookmaker:
+    return importlib.import_module(SITES[site]).BOOK
+
+
+def scrape_site(site: str, retries: int = 2) -> Dict:
+    """One site's fetch → parse → write (its Bookmaker's run(), as `book(site).run(retries)`), as a run-report entry.
+
+    Failed or empty attempts are retried with backoff and never reach write,
+    so the site's last good files stay in place.
+    """
+    rows, rec = book(site).run(retries)
+    return {"site": site, "ok": True, "rows": len(rows), "scraped_at": rows[0].scraped_at,
+            **{f"{k}_s": round(v, 2) for k, v in rec["stages"].items()},
+            "counts": rec["counts"], "peak_rss_bytes": rec["peak_rss_bytes"]}
+
+
+def _worker(site: str, retries: int, conn):
+    t0 = time.perf_counter()
+    try:
+        result = scrape_site(site, retries)
+    except BaseException as e:
+        result = {"site": site, "ok": False, "rows": 0, "error": f"{type(e).__name__}: {e}"}
+    result["duration_s"] = round(time.perf_counter() - t0, 2)
+    conn.send(result)
+    conn.close()
+
+
+def start(site: str, retries: int = 2) -> Tuple[mp.Process, Connection]:
+    """Launch one site's scrape in a new process; its result dict arrives on the returned pipe."""
+    recv, send = mp.Pipe(duplex=False)
+    p = mp.Process(target=_worker, args=(site, retries, send), name=f"scrape-{site}", daemon=True)
+    p.start()
+    send.close()
+    return p, recv
+
+
+def run(sites: List[str], timeout: float = 180.0, retries: int = 2) -> Dict:
+    """Scrape `sites` in parallel processes; sites still running after `timeout` seconds are killed."""
+    started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    t0 = time.perf_counter()
+    procs = {site: start(site, retries) for site in sites}
+
+    results = []
+    for site, (p, recv) in procs.items():
+        left = max(0.0, timeout - (time.perf_counter() - t0))
+        if recv.poll(left):
+            try:
+                res = recv.recv()
+            except EOFError:
+                res = {"site": site, "ok": False, "rows": 0, "error": f"worker exited with code {p.exitcode}",
+                       "duration_s": round(time.perf_counter() - t0, 2)}
+        else:
+            p.terminate()
+            res = {"site": site, "ok": False, "rows": 0, "error": f"timed out after {timeout:g}s",
+                   "duration_s": timeout}
+        p.join(5)
+        results.append(res)
+
+    return {"started": started, "duration_s": round(time.perf_counter() - t0, 2),
+            "rows": sum(r["rows"] for r in results), "sites": results}
+
+
+def main(argv: List[str] = None) -> int:
+    ap = argparse.ArgumentParser(description="Run the bookmaker scrapers in parallel.")
+    ap.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES))
+    ap.add_argument("--timeout", type=float, default=180.0, help="seconds before a site's scrape is killed")
+    ap.add_argument("--retries", type=int, default=2, help="retries per site after a failed or empty scrape")
+    ap.add_argument("--report", help="also write the run report (JSON) to this file")
+    ap.add_argument("--profile", nargs="?", const="cprofile", metavar="MODES",
+                    help="profile each site's scrape: cprofile, tracemalloc or both (comma-separated)")
+    ap.add_argument("--stream", metavar="TARGET",
+                    help="also stream rows as NDJSON while they're parsed: - (stdout) or unix:PATH (see row_stream.py)")
+    args = ap.parse_args(argv)
+    if args.profile:
+        os.environ["ARB_PROFILE"] = args.profile   # picked up inside each site's process
+    if args.stream:
+        os.environ["ARB_STREAM"] = args.stream
+
+    report = run(args.sites, args.timeout, args.retries)
+    for r in report["sites"]:
+        status = f"{r['rows']} rows" if r["ok"] else f"FAILED ({r['error']})"
+        print(f"{r['site']:>14}: {status} in {r['duration_s']:.1f}s", file=sys.stderr)
+    print(f"{'total':>14}: {report['rows']} rows in {report['duration_s']:.1f}s", file=sys.stderr)
+    # with rows streaming to stdout, the report goes beside the progress lines
+    print(json.dumps(report, indent=2), file=sys.stderr if args.stream == "-" else sys.stdout)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    # one site failing shouldn't stop the others' data being committed
+    return 0 if any(r["ok"] for r in report["sites"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
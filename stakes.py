@@ -0,0 +1,122 @@
+# Placeable stakes for a batch of arbitrage opportunities
+# Whole-rand stakes, per-book max bet, per-book account balance
+# run: python stakes.py --bench 300   (synthetic benchmark)
+
+import math, sys, time
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+
+PLAN_COLS = ["event", "cover", "legs", "placed_total", "min_payout", "placed_profit"]
+
+
+def _round_legs(stakes: List[float], prices: List[float], books: List[str],
+                limits: Dict[str, float], free: Dict[str, float], unit: float) -> Tuple[List[float], float]:
+    """Best floor/ceil combination of continuous stakes, by worst-case profit."""
+    lo = [math.floor(s / unit) * unit for s in stakes]
+    best, best_profit = None, 0.0
+    choices = product((0, 1), repeat=len(stakes)) if len(stakes) <= 6 else [(0,) * len(stakes)]
+    for up in choices:
+        cand = [lo[i] + unit * up[i] for i in range(len(stakes))]
+        used: Dict[str, float] = {}
+        ok = True
+        for s, b in zip(cand, books):
+            used[b] = used.get(b, 0.0) + s
+            if s > limits.get(b, math.inf) or used[b] > free.get(b, 0.0):
+                ok = False
+                break
+        if not ok:
+            continue
+        profit = min(s * p for s, p in zip(cand, prices)) - sum(cand)
+        if profit > best_profit:
+            best, best_profit = cand, profit
+    return best, best_profit
+
+
+def optimize_stakes(legs: pd.DataFrame, balances: Dict[str, float],
+                    limits: Optional[Dict[str, float]] = None,
+                    max_total: Optional[float] = None,
+                    unit: float = 1.0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Rounded stakes that maximise total worst-case profit across all opportunities.
+
+    legs is the leg table from arbitrage.solve (event, cover, book, price).
+    Opportunities share each book's balance, so they are filled greedily in
+    order of margin: each gets the largest total its legs' limits and the
+    remaining balances allow, split proportionally, then rounded to `unit`
+    by trying every floor/ceil combination of its legs and keeping the one
+    with the best guaranteed profit. Opportunities that can't be placed at a
+    profit after rounding get no stake and release their balance.
+
+    Returns (legs with a `placed` column, one plan row per opportunity).
+    """
+    limits = limits or {}
+    free = {b: float(v) for b, v in balances.items()}
+    legs = legs.reset_index(drop=True)
+    placed = [0.0] * len(legs)
+    plan = []
+    if legs.empty:
+        return legs.assign(placed=[]), pd.DataFrame(columns=PLAN_COLS)
+
+    inv = 1.0 / legs["price"].to_numpy()
+    key = list(zip(legs["event"], legs["cover"]))
+    groups: Dict[tuple, List[int]] = {}
+    for i, k in enumerate(key):
+        groups.setdefault(k, []).append(i)
+    implied = {k: sum(inv[i] for i in ix) for k, ix in groups.items()}
+    books, prices = legs["book"].tolist(), legs["price"].tolist()
+
+    for k in sorted(groups, key=implied.get):  # lowest implied sum = highest margin first
+        ix = groups[k]
+        if implied[k] >= 1.0:
+            continue
+        frac = [inv[i] / implied[k] for i in ix]
+        # the largest total stake every leg can still take
+        need: Dict[str, float] = {}
+        for f, i in zip(frac, ix):
+            need[books[i]] = need.get(books[i], 0.0) + f
+        total = max_total if max_total is not None else math.inf
+        for f, i in zip(frac, ix):
+            total = min(total, limits.get(books[i], math.inf) / f)
+        for b, f in need.items():
+            total = min(total, free.get(b, 0.0) / f)
+        if not total > 0 or math.isinf(total):
+            continue
+
+        cand, profit = _round_legs([f * total for f in frac], [prices[i] for i in ix],
+                                   [books[i] for i in ix], limits, free, unit)
+        if cand is None:
+            continue
+        for s, i in zip(cand, ix):
+            placed[i] = s
+            free[books[i]] -= s
+        min_payout = min(s * prices[i] for s, i in zip(cand, ix))
+        plan.append((k[0], k[1], len(ix), sum(cand), min_payout, profit))
+
+    return legs.assign(placed=placed), pd.DataFrame(plan, columns=PLAN_COLS)
+
+
+def bench(n_opps: int):
+    import random
+    import arbitrage
+    rows = 20000
+    opps, legs = arbitrage.solve(arbitrage.synthetic_prices(rows))
+    while len(opps) < n_opps:
+        rows *= 2
+        opps, legs = arbitrage.solve(arbitrage.synthetic_prices(rows))
+    keep = set(zip(opps["event"].head(n_opps), opps["cover"].head(n_opps)))
+    legs = legs[[k in keep for k in zip(legs["event"], legs["cover"])]]
+    books = legs["book"].unique().tolist()
+    balances = {b: random.uniform(2000, 20000) for b in books}
+    limits = {b: random.choice([500, 1000, 5000]) for b in books}
+    t0 = time.perf_counter()
+    placed, plan = optimize_stakes(legs, balances, limits)
+    dt = time.perf_counter() - t0
+    print(f"{len(keep)} opportunities / {len(legs)} legs → {len(plan)} placed, "
+          f"R{plan['placed_profit'].sum():.0f} worst-case profit in {dt * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--bench":
+        bench(int(sys.argv[2]))
+    else:
+        print("usage: python stakes.py --bench N_OPPORTUNITIES")
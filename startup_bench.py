@@ -0,0 +1,94 @@
+# Cold-start gate: import time of each entry point, measured with python -X importtime
+# Fails (exit 1) when an entry point imports a module it must not (Playwright or
+# Streamlit on parse/analysis/replay paths, pandas on the scraper and streaming paths)
+# or when its import time goes over budget
+# run: python startup_bench.py             (best of 3 per module)
+#      python startup_bench.py --runs 7 ui
+
+import argparse, os, subprocess, sys
+from typing import Dict, List, Set, Tuple
+
+BROWSER_UI = {"playwright", "streamlit"}
+HEAVY = BROWSER_UI | {"pandas", "numpy"}
+
+# module → (budget in ms, top-level packages it must not import)
+# budgets are loose (machines differ); the import checks are the strict part
+ENTRY_POINTS: Dict[str, Tuple[float, Set[str]]] = {
+    "betjets2": (250, HEAVY),
+    "sunbet2": (250, HEAVY),
+    "supersport2": (250, HEAVY),
+    "scrape_all": (250, HEAVY),
+    "bookmaker": (250, HEAVY),
+    "fixtures": (50, HEAVY),
+    "paths": (50, HEAVY),
+    "page_cache": (50, HEAVY),
+    "row_stream": (50, HEAVY),
+    "markets": (50, HEAVY),
+    "price_index": (50, HEAVY),
+    "arbitrage": (1500, BROWSER_UI),
+    "fair_odds": (1500, BROWSER_UI),
+    "stakes": (1500, BROWSER_UI),
+    "arb_core": (1500, BROWSER_UI),
+    "arb_service": (1500, BROWSER_UI),
+    "arb_push": (1500, BROWSER_UI),
+    "backtest": (1500, BROWSER_UI),
+    "scheduler": (1500, BROWSER_UI),
+    "ui": (4000, {"playwright"}),
+}
+
+
+def import_profile(module: str) -> Tuple[float, List[str]]:
+    """(cumulative import ms of `module`, every module it imported) from one fresh interpreter."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=here, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    total, names = None, []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue   # header row
+        names.append(name.strip())
+        if name.strip() == module:
+            total = int(cumulative) / 1000
+    return total or 0.0, names
+
+
+def check(modules: List[str], runs: int = 3) -> List[Dict]:
+    results = []
+    for module in modules:
+        budget, forbidden = ENTRY_POINTS[module]
+        import_profile(module)   # warm the bytecode cache
+        best, names = min(import_profile(module) for _ in range(runs))
+        leaked = sorted({n.split(".")[0] for n in names} & forbidden)
+        results.append({"module": module, "ms": best, "budget_ms": budget, "forbidden": leaked,
+                        "ok": best <= budget and not leaked})
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    ap = argparse.ArgumentParser(description="Import-time budget and import-graph check per entry point.")
+    ap.add_argument("modules", nargs="*", help=f"default: all of {', '.join(ENTRY_POINTS)}")
+    ap.add_argument("--runs", type=int, default=3, help="fresh interpreters per module; the best counts")
+    args = ap.parse_args(argv)
+    unknown = [m for m in args.modules if m not in ENTRY_POINTS]
+    if unknown:
+        ap.error(f"not an entry point: {', '.join(unknown)}")
+
+    results = check(args.modules or list(ENTRY_POINTS), args.runs)
+    for r in results:
+        note = "ok" if r["ok"] else "FAIL"
+        if r["forbidden"]:
+            note += f" (imports {', '.join(r['forbidden'])})"
+        print(f"{r['module']:>12}: {r['ms']:7.1f} ms / {r['budget_ms']:6.0f} ms budget  {note}")
+    failed = [r["module"] for r in results if not r["ok"]]
+    if failed:
+        print(f"startup gate failed: {', '.join(failed)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
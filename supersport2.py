@@ -1,16 +1,15 @@
 # SuperSportBET → Premier League (CSV + JSON)
 #Same instructions
-import os, re, csv, json, time
+# run: python supersport2.py --check   (parse() on the totals layouts)
+import re, sys
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from typing import List, Tuple, Optional
+import bookmaker, instrument
+from bookmaker import Bookmaker
+from fixtures import NA, Batch
 
 URL = "https://www.supersportbet.com/sportsbook/?utm_source=supersport&utm_campaign=navigation&utm_medium=megaMenu"
 
-OUT_DIR = r"C:\Users\User\Downloads\Arbitrage Website\output"
-CSV_PATH = os.path.join(OUT_DIR, "supersport_premier.csv")
-JSON_PATH = os.path.join(OUT_DIR, "supersport_premier.json")
-
 # prices like 1.95 / 2.5
 re_price = re.compile(r"\b(\d{1,2}\.\d{1,2}|\d{1,2}\.\d)\b")
 # "3rd Oct, 21:00"
@@ -19,8 +18,16 @@ re_ord   = re.compile(r"^(\d{1,2})(?:st|nd|rd|th)?\s+(Jan|Feb|Mar|Apr|May|Jun|Ju
 re_daytm = re.compile(r"^(Today|Tomorrow|Mon|Tue|Wed|Thu|Fri|Sat|Sun)\s+([01]?\d|2[0-3]):([0-5]\d)$", re.I)
 # plain time "21:00"
 re_time  = re.compile(r"^([01]?\d|2[0-3]):([0-5]\d)$")
-# section headers to fence EPL block
-re_hdr   = re.compile(r"(premier league|english premier league|la liga|bundesliga|ligue 1|serie a|premier soccer league)", re.I)
+# totals line, only when the page labels it ("Over 2.5", "O/U 2.5")
+re_line  = re.compile(r"\b(?:over|under|o/u|total)\s*(\d{1,2}\.5)\b", re.I)
+# competition headers → (country, league); each header opens a section that runs to the next one
+COMPETITIONS = {"premier league":("England","Premier League"), "english premier league":("England","Premier League"),
+                "premier soccer league":("South Africa","Premier Soccer League"), "la liga":("Spain","La Liga"),
+                "bundesliga":("Germany","Bundesliga"), "serie a":("Italy","Serie A"), "ligue 1":("France","Ligue 1")}
+re_hdr   = re.compile(r"\b(" + "|".join(sorted(map(re.escape, COMPETITIONS), key=len, reverse=True)) + r")\b", re.I)
+# any other competition's header: ends the block before it, and its own block is skipped
+re_comp  = re.compile(r"\b(league|liga|ligue|serie|bundesliga|premiership|eredivisie|championship|division|cup|copa|coppa|pokal|trophy)\b", re.I)
+DEFAULT_CATEGORY = "Football / England / Premier League"   # a page without any header at all
 
 mon = {"jan":1,"feb":2,"mar":3,"apr":4,"may":5,"jun":6,"jul":7,"aug":8,"sep":9,"oct":10,"nov":11,"dec":12}
 dow = {"mon":0,"tue":1,"wed":2,"thu":3,"fri":4,"sat":5,"sun":6}
@@ -35,154 +42,112 @@ def nice_dow(day:str, hh:str, mm:str)->str:
     if delta==0 and datetime(now.year,now.month,now.day,int(hh),int(mm))<now: delta=7
     return (now+timedelta(days=delta)).strftime("%a (%d %b)")
 
+def is_kickoff(s:str)->bool:
+    return bool(re_ord.match(s) or re_daytm.match(s) or re_time.match(s))
+
 def is_team(s:str)->bool:
-    return bool(re.fullmatch(r"[A-Za-z0-9'.\-&/]+(?:\s+[A-Za-z0-9'.\-&/]+){0,3}", s)) and 3<=len(s)<=40
-
-def pick_spans(lines:List[str])->List[Tuple[int,int]]:
-    heads=[i for i,s in enumerate(lines) if re.search(r"\bpremier league\b", s, re.I)]
-    if not heads: return []
-    nexts=[i for i,s in enumerate(lines) if re_hdr.search(s) and not re.search(r"premier league", s, re.I)]
-    spans=[]
-    for a in heads:
-        b=min([j for j in nexts if j>a], default=len(lines))
-        spans.append((a,b))
-    return spans
-
-def open_page()->str:
-    os.makedirs(OUT_DIR, exist_ok=True)
-    with sync_playwright() as p:
-        b=p.chromium.launch(headless=True)
-        ctx=b.new_context(viewport={"width":1366,"height":960}, locale="en-ZA",
-                          user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                                      "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"))
-        page=ctx.new_page(); page.set_default_timeout(70000)
-        page.goto(URL, wait_until="domcontentloaded")
-        for sel in ["button:has-text('Accept')","text=Accept","button:has-text('Got it')"]:
-            try: page.locator(sel).first.click(timeout=1500); break
-            except Exception: pass
-        for sel in ["text=Soccer","button:has-text('Soccer')","a:has-text('Soccer')"]:
-            try: page.locator(sel).first.click(timeout=1500); break
-            except Exception: pass
-        same,last=0,0
-        for _ in range(520):
-            page.mouse.wheel(0,1600); page.wait_for_timeout(200)
-            try: h=page.evaluate("document.body.scrollHeight")
-            except Exception: h=0
-            if h==last: same+=1
-            else: same=0
-            last=h
-            if same>=7: break
-        try: txt=page.locator("body").inner_text(timeout=5000)
-        except PWTimeout: txt=page.content()
-        ctx.close(); b.close()
-        return txt
-
-def parse(txt:str)->List[Dict]:
+    return bookmaker.is_team(s, min_len=3)
+
+def index_sections(lines:List[str])->List[Tuple[int,int,str]]:
+    """(start, end, category) of every known competition block, in one pass; a block ends where the next header starts.
+
+    Blocks under a competition missing from COMPETITIONS are dropped rather than read as the one above them.
+    """
+    starts, cats = [], []
+    for i,s in enumerate(lines):
+        m=re_hdr.search(s)
+        if m:
+            country,league=COMPETITIONS[m.group(1).lower()]
+            starts.append(i); cats.append(f"Football / {country} / {league}")
+        elif re_comp.search(s):
+            starts.append(i); cats.append(None)
+    if not starts: return [(0,len(lines),DEFAULT_CATEGORY)]
+    return [(a,b,c) for a,b,c in zip(starts, starts[1:]+[len(lines)], cats) if c]
+
+def parse(txt:str)->Batch:
     lines=[s.strip() for s in txt.splitlines() if s.strip()]
-    spans=pick_spans(lines) or [(0,len(lines))]
-    out=[]
-    for a,b in spans:
+    out=Batch()
+    for a,b,category in index_sections(lines):
         i=a
         last_date=None  # remember date for time-only rows
         while i<b:
             s=lines[i]
-
             m=re_ord.match(s)
+            m2=re_daytm.match(s) if not m else None
+            m3=re_time.match(s) if not (m or m2) else None
             if m:
                 d=int(m.group(1)); mth=mon[m.group(2)[:3].lower()]
                 start=f"{int(m.group(3)):02d}:{m.group(4)}"; date=nice_date(d,mth)
                 last_date=date
-                j=i+1
-                home=away=""
-                while j<b and not home:
-                    if is_team(lines[j]): home=lines[j]
-                    j+=1
-                while j<b and not away:
-                    if is_team(lines[j]): away=lines[j]
-                    j+=1
-                if home and away and home.lower()!=away.lower():
-                    window=" ".join(lines[j:min(b,j+80)])
-                    prices=[float(x) for x in re_price.findall(window)]
-                    if len(prices)>=3:
-                        over=prices[3] if len(prices)>3 else ""
-                        under=prices[4] if len(prices)>4 else ""
-                        out.append({"home_team":home,"away_team":away,"start_time":start,"date":date,
-                                    "odds_home":prices[0],"odds_draw":prices[1],"odds_away":prices[2],
-                                    "category":"Football / England / Premier League","market":"Match Result",
-                                    "over":over,"under":under,"source":"SuperSportBET"})
-                i=j; continue
-
-            m2=re_daytm.match(s)
-            if m2:
+            elif m2:
                 day,hh,mm=m2.groups(); start=f"{int(hh):02d}:{mm}"; date=nice_dow(day,hh,mm)
                 last_date=date
-                j=i+1
-                home=away=""
-                while j<b and not home:
-                    if is_team(lines[j]): home=lines[j]
-                    j+=1
-                while j<b and not away:
-                    if is_team(lines[j]): away=lines[j]
-                    j+=1
-                if home and away and home.lower()!=away.lower():
-                    window=" ".join(lines[j:min(b,j+80)])
-                    prices=[float(x) for x in re_price.findall(window)]
-                    if len(prices)>=3:
-                        over=prices[3] if len(prices)>3 else ""
-                        under=prices[4] if len(prices)>4 else ""
-                        out.append({"home_team":home,"away_team":away,"start_time":start,"date":date,
-                                    "odds_home":prices[0],"odds_draw":prices[1],"odds_away":prices[2],
-                                    "category":"Football / England / Premier League","market":"Match Result",
-                                    "over":over,"under":under,"source":"SuperSportBET"})
-                i=j; continue
-
-            m3=re_time.match(s)
-            if m3:  # fallback: time-only under the same date section
+            elif m3:  # fallback: time-only under the same date section
                 start=f"{int(m3.group(1)):02d}:{m3.group(2)}"
                 date = last_date or datetime.now().strftime("%a (%d %b)")
-                j=i+1
-                home=away=""
-                while j<b and not home:
-                    if is_team(lines[j]): home=lines[j]
-                    j+=1
-                while j<b and not away:
-                    if is_team(lines[j]): away=lines[j]
-                    j+=1
-                if home and away and home.lower()!=away.lower():
-                    window=" ".join(lines[j:min(b,j+80)])
-                    prices=[float(x) for x in re_price.findall(window)]
-                    if len(prices)>=3:
-                        over=prices[3] if len(prices)>3 else ""
-                        under=prices[4] if len(prices)>4 else ""
-                        out.append({"home_team":home,"away_team":away,"start_time":start,"date":date,
-                                    "odds_home":prices[0],"odds_draw":prices[1],"odds_away":prices[2],
-                                    "category":"Football / England / Premier League","market":"Match Result",
-                                    "over":over,"under":under,"source":"SuperSportBET"})
-                i=j; continue
-
-            i+=1
-
-    # dedupe
-    seen=set(); rows=[]
-    for r in out:
-        k=(r["home_team"].lower(), r["away_team"].lower(), r["date"], r["start_time"])
-        if k not in seen: seen.add(k); rows.append(r)
-    return rows
-
-def write(rows:List[Dict]):
-    cols=["home_team","away_team","start_time","date","odds_home","odds_draw","odds_away","category","market","over","under","source"]
-    os.makedirs(OUT_DIR, exist_ok=True)
-    with open(CSV_PATH,"w",newline="",encoding="utf-8") as f:
-        w=csv.DictWriter(f,fieldnames=cols); w.writeheader()
-        for r in rows: w.writerow({k:r.get(k,"") for k in cols})
-    with open(JSON_PATH,"w",encoding="utf-8") as f:
-        json.dump([{k:r.get(k,"") for k in cols} for r in rows], f, ensure_ascii=False, indent=2)
-
-def main():
-    txt=open_page()
-    rows=parse(txt)
-    write(rows)
-    print("supersportbet: saved", len(rows))
+            else:
+                i+=1; continue
+
+            j=i+1
+            home=away=""
+            while j<b and not home:
+                if is_team(lines[j]): home=lines[j]
+                j+=1
+            while j<b and not away:
+                if is_team(lines[j]): away=lines[j]
+                j+=1
+            if home and away and home.lower()!=away.lower():
+                # this fixture's prices only: up to the next kickoff line
+                end=next((k for k in range(j,min(b,j+80)) if is_kickoff(lines[k])),min(b,j+80))
+                window=" ".join(lines[j:end])
+                # "Over 2.5" / "O/U 2.5": the line itself isn't a price
+                prices=[float(x) for x in re_price.findall(re_line.sub(" ",window))]
+                if len(prices)>=3:
+                    over=prices[3] if len(prices)>3 else NA
+                    under=prices[4] if len(prices)>4 else NA
+                    ml=re_line.search(window)
+                    line=float(ml.group(1)) if (ml and len(prices)>3) else NA
+                    out.add(home,away,start,date,prices[0],prices[1],prices[2],category,"Match Result",
+                            over,under,line,"SuperSportBET")
+            i=j
+
+    return out
+
+
+class SuperSport(Bookmaker):
+    name, label, url, stem = "supersportbet", "SuperSportBET", URL, "supersport_premier"
+    consent=("button:has-text('Accept')","text=Accept","button:has-text('Got it')")
+    max_scrolls, scroll_px, scroll_pause_ms, flat_scrolls = 520, 1600, 200, 7
+    # the soccer book lists every competition: read the known ones a few at a time, each row tagged with its own
+    sections, keep_sections = "section", re_hdr.pattern
+
+    def locate_root(self, page):
+        # the sportsbook opens on its featured view; the league lists are under Soccer
+        with instrument.stage("soccer_tab"):
+            bookmaker.click_first(page, ["text=Soccer","button:has-text('Soccer')","a:has-text('Soccer')"])
+        return page
+
+    def parse(self, txt:str, url:str)->Batch:
+        return parse(txt)
+
+
+BOOK = SuperSport()
+
+def check():
+    """parse() on the totals layouts the page uses: labels before their prices, or the line after all five."""
+    head="Premier League\nSat 15:00\nArsenal\nChelsea\n2.10\n3.40\n3.60\n"
+    cases={"labels before prices": head+"Over 2.5\n1.85\nUnder 2.5\n1.95",
+           "line after prices": head+"1.85\n1.95\nO/U 2.5",
+           "no totals": head.rstrip(),
+           "next fixture has totals": head+"Sat 17:30\nLeeds United\nBurnley\n1.50\n3.20\n4.50\nOver 2.5\n1.70\nUnder 2.5\n2.10"}
+    want={"labels before prices":(1.85,1.95,2.5),"line after prices":(1.85,1.95,2.5),"no totals":(NA,NA,NA),"next fixture has totals":(NA,NA,NA)}
+    for name,txt in cases.items():
+        r=parse(txt)[0]
+        got=(r.over,r.under,r.total_line)
+        assert (r.odds_home,r.odds_draw,r.odds_away)==(2.10,3.40,3.60), (name,r)
+        assert all(g==w or (g!=g and w!=w) for g,w in zip(got,want[name])), (name,got)
+        print(f"ok  {name}: over {r.over} under {r.under} line {r.total_line}")
 
 if __name__=="__main__":
-    main()
+    if sys.argv[1:]==["--check"]: check()
+    else: BOOK.main()
@@ -1,89 +1,22 @@
 import streamlit as st
 import pandas as pd
-import json
 import os
 from datetime import datetime
 from typing import List, Dict, Tuple
-import re
 
-# Configuration - Try multiple possible locations
-POSSIBLE_DIRS = [
-    r"C:\Users\User\Downloads\Arbitrage Website\output",
-    "output",
-    "./output",
-    "../output",
-    os.path.join(os.getcwd(), "output"),
-]
+from arb_core import (
+    FILES, OUT_DIR, LiveAnalysis, analyze_matches, find_arbitrage_opportunities,
+    find_totals_opportunities, find_value_bets, fmt_age, load_frames, solve_covers,
+)
+from fair_odds import METHODS
+import arb_push, instrument, profiling
 
-def find_output_dir():
-    """Find the first valid output directory."""
-    for directory in POSSIBLE_DIRS:
-        if os.path.exists(directory):
-            return directory
-    return POSSIBLE_DIRS[0]  # Default to first option
-
-OUT_DIR = find_output_dir()
-
-# File paths for all three sites
-FILES = {
-    "SuperSportBET": {
-        "csv": os.path.join(OUT_DIR, "supersport_premier.csv"),
-        "json": os.path.join(OUT_DIR, "supersport_premier.json")
-    },
-    "SunBet": {
-        "csv": os.path.join(OUT_DIR, "sunbet_premier.csv"),
-        "json": os.path.join(OUT_DIR, "sunbet_premier.json")
-    },
-    "Betjets": {
-        "csv": os.path.join(OUT_DIR, "betjets_epl.csv"),
-        "json": os.path.join(OUT_DIR, "betjets_epl.json")
-    }
-}
-
-def normalize_team_name(team: str) -> str:
-    """Normalize team names for matching across different sites."""
-    team = team.lower().strip()
-    # Common abbreviations and variations
-    replacements = {
-        'man united': 'manchester united',
-        'man utd': 'manchester united',
-        'man city': 'manchester city',
-        'spurs': 'tottenham',
-        'tottenham hotspur': 'tottenham',
-        'newcastle united': 'newcastle',
-        'wolves': 'wolverhampton',
-        'brighton & hove albion': 'brighton',
-        'brighton and hove albion': 'brighton',
-        'nottingham forest': 'nott\'m forest',
-        'west ham united': 'west ham',
-        'leicester city': 'leicester',
-    }
-    for old, new in replacements.items():
-        if old in team:
-            team = team.replace(old, new)
-    return team
+# set → the page follows this arb_push.py feed instead of loading and analysing the files in this process
+PUSH_URL = os.environ.get("ARB_PUSH_URL")
 
 def load_data() -> pd.DataFrame:
     """Load and combine data from all three sites."""
-    dfs = []
-    found_files = []
-    missing_files = []
-    
-    for site, paths in FILES.items():
-        if os.path.exists(paths["csv"]):
-            try:
-                df = pd.read_csv(paths["csv"])
-                if not df.empty:
-                    df['normalized_home'] = df['home_team'].apply(normalize_team_name)
-                    df['normalized_away'] = df['away_team'].apply(normalize_team_name)
-                    dfs.append(df)
-                    found_files.append(f"{site}: {len(df)} matches")
-                else:
-                    missing_files.append(f"{site}: File exists but empty")
-            except Exception as e:
-                missing_files.append(f"{site}: Error - {e}")
-        else:
-            missing_files.append(f"{site}: File not found at {paths['csv']}")
+    df, found_files, missing_files = load_frames()
     
     # Show status in sidebar
     if found_files:
@@ -95,74 +28,549 @@ def load_data() -> pd.DataFrame:
         for f in missing_files:
             st.sidebar.text(f)
     
-    if dfs:
-        return pd.concat(dfs, ignore_index=True)
-    return pd.DataFrame()
+    return df
 
-def calculate_arbitrage(odds_home: float, odds_draw: float, odds_away: float) -> Tuple[float, bool]:
-    """Calculate if arbitrage exists and the profit margin."""
-    try:
-        implied_prob = (1/odds_home + 1/odds_draw + 1/odds_away)
-        profit_margin = (1/implied_prob - 1) * 100
-        is_arb = implied_prob < 1.0
-        return profit_margin, is_arb
-    except (ZeroDivisionError, TypeError):
-        return 0.0, False
+@st.cache_resource
+def live_state() -> LiveAnalysis:
+    """One LiveAnalysis per server process, not per session."""
+    return LiveAnalysis()
 
-def find_arbitrage_opportunities(df: pd.DataFrame) -> List[Dict]:
-    """Find arbitrage opportunities across different bookmakers."""
-    opportunities = []
-    
-    # Group by match (normalized team names and date)
-    matches = df.groupby(['normalized_home', 'normalized_away', 'date'])
-    
-    for (home, away, date), group in matches:
-        if len(group) < 2:  # Need at least 2 bookmakers
-            continue
-        
-        # Get best odds for each outcome across all bookmakers
-        best_home = group.loc[group['odds_home'].idxmax()]
-        best_draw = group.loc[group['odds_draw'].idxmax()]
-        best_away = group.loc[group['odds_away'].idxmax()]
-        
-        # Calculate arbitrage
-        profit_margin, is_arb = calculate_arbitrage(
-            best_home['odds_home'],
-            best_draw['odds_draw'],
-            best_away['odds_away']
-        )
+@st.cache_resource
+def push_follower(url: str) -> arb_push.Follower:
+    """One feed subscription per server process, read by every session."""
+    return arb_push.Follower(url)
+
+def live_view():
+    """Auto-refreshing opportunity panel; reruns on its own without a full-page rerun."""
+    st.subheader("⚡ Live Opportunities")
+    if PUSH_URL:
+        feed = push_follower(PUSH_URL)
+        if feed.updated_at is None:
+            st.info(f"Connecting to the live feed at {PUSH_URL}...")
+            return
+        st.caption(f"Feed event #{feed.seq} · last change {feed.updated_at.strftime('%H:%M:%S')}"
+                   + ("" if feed.connected else " · reconnecting..."))
+        show_live_table(feed.table())
+        return
+    state = live_state()
+    state.poll()
+    if state.updated_at is None:
+        st.info("Waiting for the first snapshot...")
+        return
+    st.caption(f"Snapshot v{state.version} · last change {state.updated_at.strftime('%H:%M:%S')} · "
+               f"{len(state.changed)} event(s) re-analysed")
+    show_live_table(state.table)
+
+def show_live_table(table: pd.DataFrame):
+    if table.empty:
+        st.info("No live arbitrage right now.")
+        return
+    st.dataframe(table, hide_index=True, use_container_width=True, column_config={
+        'new': st.column_config.TextColumn("", width="small"),
+        'market': "Market", 'home_team': "Home", 'away_team': "Away", 'date': "Date", 'start_time': "Time",
+        'profit_margin': st.column_config.NumberColumn("Profit %", format="%.2f%%"),
+        'profit_amount': st.column_config.NumberColumn("Profit on R100", format="R%.2f"),
+    })
+
+def show_placed(opp: Dict, outcomes: List[Tuple[str, str]]):
+    """Whole-rand stakes within the bankroll settings, under an opportunity."""
+    if 'placed_total' not in opp:
+        return  # no bankroll plan (opportunities from a push feed)
+    if pd.isna(opp['placed_total']):
+        st.caption("💼 No placeable stakes left within your balances and max bets.")
+        return
+    legs = " · ".join(f"{label}: R{opp[f'placed_{o}']:.0f}" for o, label in outcomes)
+    st.markdown(f"**💼 Placeable now:** {legs} → stake R{opp['placed_total']:.0f}, "
+                f"guaranteed profit **R{opp['placed_profit']:.2f}**")
+
+def pick_row(table: pd.DataFrame, key: str, columns: Dict) -> int:
+    """One sortable table with single-row selection; returns the selected position.
+    
+    Only the configured columns are shown. It's a single element however many
+    rows there are, so render cost doesn't grow with one expander per match.
+    """
+    event = st.dataframe(
+        table,
+        key=key,
+        column_config=columns,
+        column_order=[c for c in columns if c in table.columns],
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+    )
+    rows = event.selection.rows
+    return rows[0] if rows else None
+
+def show_opportunity(opp: Dict):
+    """Detail pane for one 1X2 opportunity."""
+    st.markdown(f"#### {opp['home_team']} vs {opp['away_team']} - Profit: {opp['profit_margin']:.2f}% (R{opp['profit_amount']:.2f})")
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown(f"**Match Details**")
+        st.write(f"📅 {opp['date']}")
+        st.write(f"⏰ {opp['start_time']}")
+        st.write(f"💰 Profit Margin: **{opp['profit_margin']:.2f}%**")
+        st.write(f"💵 Profit on R100: **R{opp['profit_amount']:.2f}**")
+    
+    with col2:
+        st.markdown("**Betting Strategy (for R100 total stake)**")
         
-        if is_arb:
-            # Calculate stake distribution for 100 total stake
-            total_stake = 100
-            stake_home = total_stake / (best_home['odds_home'] * (1/best_home['odds_home'] + 1/best_draw['odds_draw'] + 1/best_away['odds_away']))
-            stake_draw = total_stake / (best_draw['odds_draw'] * (1/best_home['odds_home'] + 1/best_draw['odds_draw'] + 1/best_away['odds_away']))
-            stake_away = total_stake / (best_away['odds_away'] * (1/best_home['odds_home'] + 1/best_draw['odds_draw'] + 1/best_away['odds_away']))
-            
-            guaranteed_return = stake_home * best_home['odds_home']
-            profit = guaranteed_return - total_stake
-            
-            opportunities.append({
-                'home_team': best_home['home_team'],
-                'away_team': best_away['away_team'],
-                'date': date,
-                'start_time': best_home['start_time'],
-                'profit_margin': profit_margin,
-                'profit_amount': profit,
-                'best_home_odds': best_home['odds_home'],
-                'best_home_source': best_home['source'],
-                'stake_home': stake_home,
-                'best_draw_odds': best_draw['odds_draw'],
-                'best_draw_source': best_draw['source'],
-                'stake_draw': stake_draw,
-                'best_away_odds': best_away['odds_away'],
-                'best_away_source': best_away['source'],
-                'stake_away': stake_away,
-                'total_stake': total_stake,
-                'guaranteed_return': guaranteed_return
-            })
+        # Create three columns for each bet
+        bet_col1, bet_col2, bet_col3 = st.columns(3)
+        
+        with bet_col1:
+            st.markdown(f"**🏠 Home Win**")
+            st.write(f"Team: {opp['home_team']}")
+            st.write(f"Bookmaker: {opp['best_home_source']}")
+            st.write(f"Odds: {opp['best_home_odds']}")
+            st.write(f"Stake: R{opp['stake_home']:.2f}")
+            st.write(f"Return: R{opp['guaranteed_return']:.2f}")
+            if 'age_home_s' in opp:
+                st.caption(f"Price age: {fmt_age(opp['age_home_s'])}")
+        
+        with bet_col2:
+            st.markdown(f"**🤝 Draw**")
+            st.write(f"Bookmaker: {opp['best_draw_source']}")
+            st.write(f"Odds: {opp['best_draw_odds']}")
+            st.write(f"Stake: R{opp['stake_draw']:.2f}")
+            st.write(f"Return: R{opp['guaranteed_return']:.2f}")
+            if 'age_draw_s' in opp:
+                st.caption(f"Price age: {fmt_age(opp['age_draw_s'])}")
+        
+        with bet_col3:
+            st.markdown(f"**✈️ Away Win**")
+            st.write(f"Team: {opp['away_team']}")
+            st.write(f"Bookmaker: {opp['best_away_source']}")
+            st.write(f"Odds: {opp['best_away_odds']}")
+            st.write(f"Stake: R{opp['stake_away']:.2f}")
+            st.write(f"Return: R{opp['guaranteed_return']:.2f}")
+            if 'age_away_s' in opp:
+                st.caption(f"Price age: {fmt_age(opp['age_away_s'])}")
+        
+        show_placed(opp, [('home', '🏠 Home'), ('draw', '🤝 Draw'), ('away', '✈️ Away')])
+
+def show_totals_opportunity(opp: Dict):
+    """Detail pane for one over/under opportunity."""
+    st.markdown(f"#### {opp['home_team']} vs {opp['away_team']} (O/U {opp['total_line']:g}) - Profit: {opp['profit_margin']:.2f}% (R{opp['profit_amount']:.2f})")
+    col1, col2, col3 = st.columns([1, 1, 1])
+    
+    with col1:
+        st.markdown(f"**Match Details**")
+        st.write(f"📅 {opp['date']}")
+        st.write(f"⏰ {opp['start_time']}")
+        st.write(f"🎯 Line: {opp['total_line']:g} goals")
+        st.write(f"💵 Profit on R100: **R{opp['profit_amount']:.2f}**")
+    
+    with col2:
+        st.markdown(f"**⬆️ Over {opp['total_line']:g}**")
+        st.write(f"Bookmaker: {opp['best_over_source']}")
+        st.write(f"Odds: {opp['best_over_odds']}")
+        st.write(f"Stake: R{opp['stake_over']:.2f}")
+        st.write(f"Return: R{opp['guaranteed_return']:.2f}")
+        if 'age_over_s' in opp:
+            st.caption(f"Price age: {fmt_age(opp['age_over_s'])}")
+    
+    with col3:
+        st.markdown(f"**⬇️ Under {opp['total_line']:g}**")
+        st.write(f"Bookmaker: {opp['best_under_source']}")
+        st.write(f"Odds: {opp['best_under_odds']}")
+        st.write(f"Stake: R{opp['stake_under']:.2f}")
+        st.write(f"Return: R{opp['guaranteed_return']:.2f}")
+        if 'age_under_s' in opp:
+            st.caption(f"Price age: {fmt_age(opp['age_under_s'])}")
+    
+    show_placed(opp, [('over', '⬆️ Over'), ('under', '⬇️ Under')])
+
+def show_match_analysis(analysis: Dict):
+    """Step-by-step arbitrage breakdown for one match."""
+    st.markdown(f"#### {'🟢' if analysis['is_arbitrage'] else '🔴'} {analysis['match']} ({analysis['date']})")
+    st.markdown(f"**Match has {analysis['bookmakers']} bookmaker(s) offering odds**")
+    
+    # Show best odds from each bookmaker
+    st.markdown("##### Best Odds Available:")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.info(f"**🏠 {analysis['home_team']} Win**\n\n"
+               f"Best Odds: **{analysis['best_home_odds']}**\n\n"
+               f"Source: {analysis['home_source']}\n\n"
+               f"Implied Probability: {analysis['implied_prob_home']:.2f}%")
+    
+    with col2:
+        st.info(f"**🤝 Draw**\n\n"
+               f"Best Odds: **{analysis['best_draw_odds']}**\n\n"
+               f"Source: {analysis['draw_source']}\n\n"
+               f"Implied Probability: {analysis['implied_prob_draw']:.2f}%")
+    
+    with col3:
+        st.info(f"**✈️ {analysis['away_team']} Win**\n\n"
+               f"Best Odds: **{analysis['best_away_odds']}**\n\n"
+               f"Source: {analysis['away_source']}\n\n"
+               f"Implied Probability: {analysis['implied_prob_away']:.2f}%")
+    
+    st.markdown("---")
+    st.markdown("##### Arbitrage Calculation:")
+    
+    # Show the calculation
+    st.code(f"""
+Step 1: Calculate Implied Probabilities
+  Home: 1 ÷ {analysis['best_home_odds']} = {analysis['implied_prob_home']:.4f}% 
+  Draw: 1 ÷ {analysis['best_draw_odds']} = {analysis['implied_prob_draw']:.4f}%
+  Away: 1 ÷ {analysis['best_away_odds']} = {analysis['implied_prob_away']:.4f}%
+
+Step 2: Sum Total Implied Probability
+  Total = {analysis['implied_prob_home']:.2f}% + {analysis['implied_prob_draw']:.2f}% + {analysis['implied_prob_away']:.2f}%
+  Total = {analysis['total_implied_prob']:.2f}%
+
+Step 3: Check for Arbitrage
+  {analysis['total_implied_prob']:.2f}% {'<' if analysis['is_arbitrage'] else '>'} 100%
+  Result: {'✅ ARBITRAGE EXISTS!' if analysis['is_arbitrage'] else '❌ No arbitrage (bookmaker margin)'}
+
+  {'Profit Margin: ' + f"{analysis['profit_margin']:.2f}%" if analysis['is_arbitrage'] else 'Bookmaker Margin: ' + f"{analysis['total_implied_prob'] - 100:.2f}%"}
+    """)
+    
+    if analysis['is_arbitrage']:
+        # Calculate stake distribution
+        total_stake = 1000
+        stake_home = total_stake / (analysis['best_home_odds'] * (analysis['total_implied_prob']/100))
+        stake_draw = total_stake / (analysis['best_draw_odds'] * (analysis['total_implied_prob']/100))
+        stake_away = total_stake / (analysis['best_away_odds'] * (analysis['total_implied_prob']/100))
+        guaranteed_return = stake_home * analysis['best_home_odds']
+        profit = guaranteed_return - total_stake
+        
+        st.success(f"""
+**💰 Profit Opportunity:**
+
+For a R1,000 total investment:
+- Bet R{stake_home:.2f} on {analysis['home_team']} at {analysis['home_source']}
+- Bet R{stake_draw:.2f} on Draw at {analysis['draw_source']}
+- Bet R{stake_away:.2f} on {analysis['away_team']} at {analysis['away_source']}
+
+**Guaranteed Return: R{guaranteed_return:.2f}**
+**Guaranteed Profit: R{profit:.2f}**
+**ROI: {analysis['profit_margin']:.2f}%**
+        """)
+    else:
+        st.warning(f"""
+**Why No Arbitrage?**
+
+The total implied probability ({analysis['total_implied_prob']:.2f}%) is greater than 100%, 
+meaning the bookmakers have built in a {analysis['total_implied_prob'] - 100:.2f}% margin.
+
+This is the normal situation - bookmakers price their odds to guarantee themselves profit.
+To find arbitrage, we need the combined best odds to total less than 100%.
+        """)
+
+def show_opportunities_tab(opportunities: List[Dict]):
+    """The 1X2 arbitrage tab: a selectable table and the picked opportunity's stakes."""
+    st.header("Arbitrage Opportunities")
+    st.markdown("These are guaranteed profit opportunities by betting on all outcomes across different bookmakers.")
+    
+    if opportunities:
+        st.success(f"Found {len(opportunities)} arbitrage opportunities!")
+        
+        i = pick_row(pd.DataFrame(opportunities), "opportunities_table", {
+            'home_team': "Home", 'away_team': "Away", 'date': "Date", 'start_time': "Time",
+            'profit_margin': st.column_config.NumberColumn("Profit %", format="%.2f%%"),
+            'profit_amount': st.column_config.NumberColumn("Profit on R100", format="R%.2f"),
+            'best_home_odds': st.column_config.NumberColumn("Home Odds", format="%.2f"),
+            'best_home_source': "Home Book",
+            'best_draw_odds': st.column_config.NumberColumn("Draw Odds", format="%.2f"),
+            'best_draw_source': "Draw Book",
+            'best_away_odds': st.column_config.NumberColumn("Away Odds", format="%.2f"),
+            'best_away_source': "Away Book",
+            'placed_profit': st.column_config.NumberColumn("Placeable Profit", format="R%.2f"),
+        })
+        if i is not None:
+            show_opportunity(opportunities[i])
+    else:
+        st.info("No arbitrage opportunities found at the moment. Keep checking as odds change!")
+        st.markdown("""
+        **What is Arbitrage Betting?**
+        
+        Arbitrage betting (or "arbing") is when you bet on all possible outcomes of an event 
+        across different bookmakers to guarantee a profit regardless of the result. This happens 
+        when bookmakers have different opinions on the odds.
+        
+        **Example:** If one bookmaker offers high odds on Team A winning, and another offers 
+        high odds on Team B winning, you might be able to bet on both and guarantee profit.
+        """)
+
+def show_totals_tab(totals: List[Dict]):
+    """The over/under arbitrage tab, laid out like the 1X2 one."""
+    st.header("Over/Under Arbitrage")
+    st.markdown("Two-way totals markets: back Over at one bookmaker and Under at another on the same goal line.")
+    
+    if totals:
+        st.success(f"Found {len(totals)} over/under arbitrage opportunities!")
+        
+        i = pick_row(pd.DataFrame(totals), "totals_table", {
+            'home_team': "Home", 'away_team': "Away", 'date': "Date", 'start_time': "Time",
+            'total_line': st.column_config.NumberColumn("Line", format="%.1f"),
+            'profit_margin': st.column_config.NumberColumn("Profit %", format="%.2f%%"),
+            'profit_amount': st.column_config.NumberColumn("Profit on R100", format="R%.2f"),
+            'best_over_odds': st.column_config.NumberColumn("Over", format="%.2f"),
+            'best_over_source': "Over Book",
+            'best_under_odds': st.column_config.NumberColumn("Under", format="%.2f"),
+            'best_under_source': "Under Book",
+            'placed_profit': st.column_config.NumberColumn("Placeable Profit", format="R%.2f"),
+        })
+        if i is not None:
+            show_totals_opportunity(totals[i])
+    else:
+        st.info("No over/under arbitrage right now. Only rows where the scraper recorded the goal line are compared.")
+
+def show_explainer():
+    """How arbitrage works, with a worked example (static)."""
+    st.subheader("📚 Understanding Arbitrage Betting")
+    
+    with st.expander("**How Arbitrage Works - Click to Learn**", expanded=False):
+        st.markdown("""
+        ### What is Arbitrage Betting?
+        
+        Arbitrage betting (also called "sure betting" or "arbing") is a strategy that guarantees profit by placing bets 
+        on all possible outcomes of an event across different bookmakers. This works when bookmakers disagree on the 
+        odds, creating a mathematical opportunity for guaranteed profit.
+        
+        ---
+        
+        ### The Mathematics Behind It
+        
+        #### 1. **Implied Probability**
+        When a bookmaker offers odds, they're expressing the probability of an outcome. For example:
+        - Odds of 2.00 = 50% implied probability (1 ÷ 2.00 = 0.50)
+        - Odds of 3.00 = 33.33% implied probability (1 ÷ 3.00 = 0.333)
+        
+        #### 2. **The Arbitrage Formula**
+        For a 3-way market (Home/Draw/Away), we calculate:
+        
+        ```
+        Arbitrage % = (1/Odds_Home + 1/Odds_Draw + 1/Odds_Away) × 100
+        ```
+        
+        - **If < 100%**: Arbitrage opportunity exists! ✅
+        - **If = 100%**: Break-even (no profit, no loss)
+        - **If > 100%**: Bookmaker has built-in margin (normal situation)
+        
+        #### 3. **Profit Margin Calculation**
+        
+        ```
+        Profit Margin % = (1 / Arbitrage% - 1) × 100
+        ```
+        
+        ---
+        
+        ### Example Calculation
+        """)
+        
+        st.markdown("#### **Scenario: Manchester United vs Liverpool**")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.info("**Home Win (Man Utd)**\n\nBookmaker A: 2.10")
+        with col2:
+            st.info("**Draw**\n\nBookmaker B: 3.80")
+        with col3:
+            st.info("**Away Win (Liverpool)**\n\nBookmaker C: 4.20")
+        
+        # Calculate the example
+        ex_home, ex_draw, ex_away = 2.10, 3.80, 4.20
+        ex_arb = (1/ex_home + 1/ex_draw + 1/ex_away)
+        ex_profit_margin = (1/ex_arb - 1) * 100
+        
+        st.markdown(f"""
+        #### **Step-by-Step Calculation:**
+        
+        **Step 1:** Calculate implied probabilities
+        ```
+        Home: 1 ÷ 2.10 = 0.4762 (47.62%)
+        Draw: 1 ÷ 3.80 = 0.2632 (26.32%)
+        Away: 1 ÷ 4.20 = 0.2381 (23.81%)
+        ```
+        
+        **Step 2:** Sum the implied probabilities
+        ```
+        Total = 0.4762 + 0.2632 + 0.2381 = 0.9775 (97.75%)
+        ```
+        
+        **Step 3:** Check if arbitrage exists
+        ```
+        97.75% < 100% ✅ YES! Arbitrage opportunity exists!
+        ```
+        
+        **Step 4:** Calculate profit margin
+        ```
+        Profit Margin = (1 ÷ 0.9775 - 1) × 100 = {ex_profit_margin:.2f}%
+        ```
+        
+        ---
+        
+        ### How to Split Your Stakes
+        
+        For a **R1,000 total investment**, calculate each stake as:
+        
+        ```
+        Stake_Outcome = Total_Investment ÷ (Odds_Outcome × Total_Implied_Probability)
+        ```
+        """)
+        
+        total_stake = 1000
+        stake_home = total_stake / (ex_home * ex_arb)
+        stake_draw = total_stake / (ex_draw * ex_arb)
+        stake_away = total_stake / (ex_away * ex_arb)
+        guaranteed_return = stake_home * ex_home
+        profit = guaranteed_return - total_stake
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.success(f"""
+            **Bet on Man Utd Win**
+            - Stake: R{stake_home:.2f}
+            - At odds: 2.10
+            - Returns: R{stake_home * ex_home:.2f}
+            """)
+        with col2:
+            st.success(f"""
+            **Bet on Draw**
+            - Stake: R{stake_draw:.2f}
+            - At odds: 3.80
+            - Returns: R{stake_draw * ex_draw:.2f}
+            """)
+        with col3:
+            st.success(f"""
+            **Bet on Liverpool Win**
+            - Stake: R{stake_away:.2f}
+            - At odds: 4.20
+            - Returns: R{stake_away * ex_away:.2f}
+            """)
+        
+        st.markdown(f"""
+        ### **Final Result:**
+        
+        - **Total Staked:** R{total_stake:.2f}
+        - **Guaranteed Return:** R{guaranteed_return:.2f} (regardless of match outcome)
+        - **Guaranteed Profit:** R{profit:.2f}
+        - **ROI:** {ex_profit_margin:.2f}%
+        
+        ---
+        
+        ### Why Does This Work?
+        
+        Different bookmakers:
+        1. Have different opinions on match outcomes
+        2. Target different customer segments
+        3. Update their odds at different times
+        4. Use different risk management strategies
+        
+        By finding the **best odds for each outcome across multiple bookmakers**, you can sometimes create a situation 
+        where the combined implied probability is less than 100%, guaranteeing profit!
+        
+        ---
+        
+        ### Important Notes
+        
+        ⚠️ **Challenges in Real-World Arbitrage:**
+        - Odds change rapidly - opportunities may disappear quickly
+        - Bookmakers may limit or ban accounts that consistently arb
+        - Need accounts with multiple bookmakers
+        - Must place bets simultaneously to lock in odds
+        - Betting limits may prevent large stakes
+        - Account verification and withdrawal times vary
+        
+        ✅ **Best Practices:**
+        - Act quickly when opportunities arise
+        - Use reliable, licensed bookmakers
+        - Keep accounts funded for fast execution
+        - Calculate stakes accurately
+        - Verify odds before placing bets
+        - Track all bets carefully
+        """)
+
+def show_analysis(analysis: pd.DataFrame):
+    """Every match's best 1X2 prices and implied total, with a breakdown of the selected one."""
+    st.subheader("🔍 Arbitrage Analysis of Your Data")
+    
+    with st.expander("**Analyze All Matches - Click to See Detailed Breakdown**", expanded=True):
+        st.markdown("This section analyzes every match in your data to show whether arbitrage opportunities exist.")
+        
+        # Summary statistics
+        total_matches = len(analysis)
+        arb_matches = int(analysis['is_arbitrage'].sum())
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total Unique Matches", total_matches)
+        col2.metric("Arbitrage Opportunities", arb_matches, delta=f"{(arb_matches/total_matches*100):.1f}%" if total_matches > 0 else "0%")
+        col3.metric("Regular Matches (No Arb)", total_matches - arb_matches)
+        
+        st.markdown("---")
+        
+        # One table for every match; only the selected row gets the full breakdown
+        st.caption("Select a match to see its step-by-step calculation.")
+        table = analysis.assign(status=analysis['is_arbitrage'].map({True: "🟢 Arbitrage", False: "🔴 No arbitrage"}))
+        i = pick_row(table, "analysis_table", {
+            'status': "Status", 'match': "Match", 'date': "Date", 'bookmakers': "Books",
+            'best_home_odds': st.column_config.NumberColumn("Home", format="%.2f"),
+            'home_source': "Home Book",
+            'best_draw_odds': st.column_config.NumberColumn("Draw", format="%.2f"),
+            'draw_source': "Draw Book",
+            'best_away_odds': st.column_config.NumberColumn("Away", format="%.2f"),
+            'away_source': "Away Book",
+            'total_implied_prob': st.column_config.NumberColumn("Implied %", format="%.2f%%"),
+            'profit_margin': st.column_config.NumberColumn("Profit %", format="%.2f%%"),
+        })
+        if i is not None:
+            show_match_analysis(analysis.iloc[i].to_dict())
+
+def show_feed(feed: arb_push.Follower):
+    """The tabs from a push feed's state: nothing is loaded or solved per session."""
+    if feed.updated_at is None:
+        st.info(f"Connecting to the live feed at {PUSH_URL}...")
+        return
+    tab1, tab_totals, tab2, tab3 = st.tabs(["🎯 Arbitrage Opportunities", "⚖️ Over/Under Arbitrage",
+                                            "📊 Best Odds", "📈 Statistics"])
+    with tab1:
+        show_opportunities_tab(feed.opportunities("1X2"))
+    
+    with tab_totals:
+        show_totals_tab(feed.opportunities("O/U"))
+    
+    matches = feed.matches()
+    with tab2:
+        st.header("Best Available Odds")
+        st.caption("The feed carries each match's best fresh price per outcome. "
+                   "Every bookmaker's own odds are on the dashboard without ARB_PUSH_URL.")
+        col1, col2 = st.columns(2)
+        col1.metric("Total Matches", len(matches))
+        col2.metric("Dates Available", matches['date'].nunique())
+        st.dataframe(matches, hide_index=True, use_container_width=True, height=400, column_order=[
+            'home_team', 'away_team', 'date', 'bookmakers', 'best_home_odds', 'home_source',
+            'best_draw_odds', 'draw_source', 'best_away_odds', 'away_source'], column_config={
+            'home_team': "Home Team", 'away_team': "Away Team", 'date': "Date", 'bookmakers': "Books",
+            'best_home_odds': st.column_config.NumberColumn("Home Odds", format="%.2f"), 'home_source': "Home Book",
+            'best_draw_odds': st.column_config.NumberColumn("Draw Odds", format="%.2f"), 'draw_source': "Draw Book",
+            'best_away_odds': st.column_config.NumberColumn("Away Odds", format="%.2f"), 'away_source': "Away Book",
+        })
     
-    return sorted(opportunities, key=lambda x: x['profit_margin'], reverse=True)
+    with tab3:
+        st.header("Statistics & Insights")
+        show_explainer()
+        st.markdown("---")
+        show_analysis(matches)
+        st.markdown("---")
+        st.info("Value bets and per-bookmaker statistics need every book's prices; "
+                "they're on the dashboard without ARB_PUSH_URL.")
+
+def show_footer():
+    st.markdown("---")
+    st.markdown("""
+    <div style='text-align: center'>
+        <p>⚠️ <strong>Disclaimer:</strong> Gambling involves risk. Please bet responsibly. 
+        This tool is for educational purposes only.</p>
+        <p>Last updated: {}</p>
+    </div>
+    """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")), unsafe_allow_html=True)
 
 def main():
     st.set_page_config(page_title="Arbitrage Betting Analyzer", layout="wide", page_icon="⚽")
@@ -170,12 +578,29 @@ def main():
     st.title("⚽ Premier League Arbitrage Betting Analyzer")
     st.markdown("---")
     
-    # Show current output directory
-    st.sidebar.info(f"📁 Output Directory:\n`{OUT_DIR}`")
+    # Show where the data comes from
+    if PUSH_URL:
+        st.sidebar.info(f"📡 Live feed:\n`{PUSH_URL}`\n\nStakes and price freshness are set on the feed server.")
+    else:
+        st.sidebar.info(f"📁 Output Directory:\n`{OUT_DIR}`")
+    
+    # Live mode: only the panel below polls and reruns, not the whole page
+    live = st.sidebar.toggle("⚡ Live mode", value=False)
+    if live:
+        every = st.sidebar.slider("Refresh every (s)", min_value=2, max_value=60, value=5)
+        st.fragment(live_view, run_every=every)()
+        st.markdown("---")
+    
+    # Following a feed: its server analyses once for every viewer
+    if PUSH_URL:
+        show_feed(push_follower(PUSH_URL))
+        show_footer()
+        return
     
     # Load data
-    with st.spinner("Loading betting data..."):
+    with st.spinner("Loading betting data..."), instrument.stage("load"):
         df = load_data()
+    instrument.count("rows", len(df))
     
     if df.empty:
         st.error("❌ No data found or all files are empty.")
@@ -202,7 +627,7 @@ def main():
         3. Verify the output path matches: `{}`
         
         **Or manually set the path:**
-        Update `OUT_DIR` in the script to point to your output folder.
+        Set the `ARB_OUTPUT_DIR` environment variable to your output folder.
         """.format(OUT_DIR))
         return
     
@@ -215,6 +640,21 @@ def main():
     dates = ['All'] + sorted(df['date'].unique().tolist())
     selected_date = st.sidebar.selectbox("Match Date", dates)
     
+    # Bankroll: what can actually be placed at each book
+    st.sidebar.header("Bankroll")
+    balances, limits = {}, {}
+    with st.sidebar.expander("Balances & max bet per bookmaker"):
+        for src in sorted(df['source'].unique().tolist()):
+            balances[src] = st.number_input(f"{src} balance (R)", min_value=0, value=1000, step=100, key=f"bal_{src}")
+            limits[src] = st.number_input(f"{src} max bet (R)", min_value=0, value=500, step=50, key=f"lim_{src}")
+    
+    # Freshness: a book's prices older than this are not paired with the others
+    max_age = st.sidebar.number_input("Max price age (min)", min_value=1, value=15, step=5)
+    max_staleness = {src: pd.Timedelta(minutes=max_age) for src in df['source'].unique()}
+    
+    with instrument.stage("solve"):
+        solved = solve_covers(df, balances=balances, limits=limits, max_staleness=max_staleness)
+    
     # Filter data
     filtered_df = df.copy()
     if selected_source != 'All':
@@ -223,68 +663,14 @@ def main():
         filtered_df = filtered_df[filtered_df['date'] == selected_date]
     
     # Tabs
-    tab1, tab2, tab3 = st.tabs(["🎯 Arbitrage Opportunities", "📊 All Odds", "📈 Statistics"])
+    tab1, tab_totals, tab2, tab3 = st.tabs(["🎯 Arbitrage Opportunities", "⚖️ Over/Under Arbitrage",
+                                            "📊 All Odds", "📈 Statistics"])
     
     with tab1:
-        st.header("Arbitrage Opportunities")
-        st.markdown("These are guaranteed profit opportunities by betting on all outcomes across different bookmakers.")
-        
-        opportunities = find_arbitrage_opportunities(df)
-        
-        if opportunities:
-            st.success(f"Found {len(opportunities)} arbitrage opportunities!")
-            
-            for i, opp in enumerate(opportunities, 1):
-                with st.expander(f"**Opportunity #{i}: {opp['home_team']} vs {opp['away_team']}** - Profit: {opp['profit_margin']:.2f}% (R{opp['profit_amount']:.2f})"):
-                    col1, col2 = st.columns([1, 2])
-                    
-                    with col1:
-                        st.markdown(f"**Match Details**")
-                        st.write(f"📅 {opp['date']}")
-                        st.write(f"⏰ {opp['start_time']}")
-                        st.write(f"💰 Profit Margin: **{opp['profit_margin']:.2f}%**")
-                        st.write(f"💵 Profit on R100: **R{opp['profit_amount']:.2f}**")
-                    
-                    with col2:
-                        st.markdown("**Betting Strategy (for R100 total stake)**")
-                        
-                        # Create three columns for each bet
-                        bet_col1, bet_col2, bet_col3 = st.columns(3)
-                        
-                        with bet_col1:
-                            st.markdown(f"**🏠 Home Win**")
-                            st.write(f"Team: {opp['home_team']}")
-                            st.write(f"Bookmaker: {opp['best_home_source']}")
-                            st.write(f"Odds: {opp['best_home_odds']}")
-                            st.write(f"Stake: R{opp['stake_home']:.2f}")
-                            st.write(f"Return: R{opp['guaranteed_return']:.2f}")
-                        
-                        with bet_col2:
-                            st.markdown(f"**🤝 Draw**")
-                            st.write(f"Bookmaker: {opp['best_draw_source']}")
-                            st.write(f"Odds: {opp['best_draw_odds']}")
-                            st.write(f"Stake: R{opp['stake_draw']:.2f}")
-                            st.write(f"Return: R{opp['guaranteed_return']:.2f}")
-                        
-                        with bet_col3:
-                            st.markdown(f"**✈️ Away Win**")
-                            st.write(f"Team: {opp['away_team']}")
-                            st.write(f"Bookmaker: {opp['best_away_source']}")
-                            st.write(f"Odds: {opp['best_away_odds']}")
-                            st.write(f"Stake: R{opp['stake_away']:.2f}")
-                            st.write(f"Return: R{opp['guaranteed_return']:.2f}")
-        else:
-            st.info("No arbitrage opportunities found at the moment. Keep checking as odds change!")
-            st.markdown("""
-            **What is Arbitrage Betting?**
-            
-            Arbitrage betting (or "arbing") is when you bet on all possible outcomes of an event 
-            across different bookmakers to guarantee a profit regardless of the result. This happens 
-            when bookmakers have different opinions on the odds.
-            
-            **Example:** If one bookmaker offers high odds on Team A winning, and another offers 
-            high odds on Team B winning, you might be able to bet on both and guarantee profit.
-            """)
+        show_opportunities_tab(find_arbitrage_opportunities(df, solved=solved))
+    
+    with tab_totals:
+        show_totals_tab(find_totals_opportunities(df, solved=solved))
     
     with tab2:
         st.header("All Available Odds")
@@ -317,325 +703,39 @@ def main():
     
     with tab3:
         st.header("Statistics & Insights")
+        show_explainer()
+        st.markdown("---")
         
-        # Arbitrage Calculation Explanation Section
-        st.subheader("📚 Understanding Arbitrage Betting")
-        
-        with st.expander("**How Arbitrage Works - Click to Learn**", expanded=False):
-            st.markdown("""
-            ### What is Arbitrage Betting?
-            
-            Arbitrage betting (also called "sure betting" or "arbing") is a strategy that guarantees profit by placing bets 
-            on all possible outcomes of an event across different bookmakers. This works when bookmakers disagree on the 
-            odds, creating a mathematical opportunity for guaranteed profit.
-            
-            ---
-            
-            ### The Mathematics Behind It
-            
-            #### 1. **Implied Probability**
-            When a bookmaker offers odds, they're expressing the probability of an outcome. For example:
-            - Odds of 2.00 = 50% implied probability (1 ÷ 2.00 = 0.50)
-            - Odds of 3.00 = 33.33% implied probability (1 ÷ 3.00 = 0.333)
-            
-            #### 2. **The Arbitrage Formula**
-            For a 3-way market (Home/Draw/Away), we calculate:
-            
-            ```
-            Arbitrage % = (1/Odds_Home + 1/Odds_Draw + 1/Odds_Away) × 100
-            ```
-            
-            - **If < 100%**: Arbitrage opportunity exists! ✅
-            - **If = 100%**: Break-even (no profit, no loss)
-            - **If > 100%**: Bookmaker has built-in margin (normal situation)
-            
-            #### 3. **Profit Margin Calculation**
-            
-            ```
-            Profit Margin % = (1 / Arbitrage% - 1) × 100
-            ```
-            
-            ---
-            
-            ### Example Calculation
-            """)
-            
-            st.markdown("#### **Scenario: Manchester United vs Liverpool**")
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.info("**Home Win (Man Utd)**\n\nBookmaker A: 2.10")
-            with col2:
-                st.info("**Draw**\n\nBookmaker B: 3.80")
-            with col3:
-                st.info("**Away Win (Liverpool)**\n\nBookmaker C: 4.20")
-            
-            # Calculate the example
-            ex_home, ex_draw, ex_away = 2.10, 3.80, 4.20
-            ex_arb = (1/ex_home + 1/ex_draw + 1/ex_away)
-            ex_profit_margin = (1/ex_arb - 1) * 100
-            
-            st.markdown(f"""
-            #### **Step-by-Step Calculation:**
-            
-            **Step 1:** Calculate implied probabilities
-            ```
-            Home: 1 ÷ 2.10 = 0.4762 (47.62%)
-            Draw: 1 ÷ 3.80 = 0.2632 (26.32%)
-            Away: 1 ÷ 4.20 = 0.2381 (23.81%)
-            ```
-            
-            **Step 2:** Sum the implied probabilities
-            ```
-            Total = 0.4762 + 0.2632 + 0.2381 = 0.9775 (97.75%)
-            ```
-            
-            **Step 3:** Check if arbitrage exists
-            ```
-            97.75% < 100% ✅ YES! Arbitrage opportunity exists!
-            ```
-            
-            **Step 4:** Calculate profit margin
-            ```
-            Profit Margin = (1 ÷ 0.9775 - 1) × 100 = {ex_profit_margin:.2f}%
-            ```
-            
-            ---
-            
-            ### How to Split Your Stakes
-            
-            For a **R1,000 total investment**, calculate each stake as:
-            
-            ```
-            Stake_Outcome = Total_Investment ÷ (Odds_Outcome × Total_Implied_Probability)
-            ```
-            """)
-            
-            total_stake = 1000
-            stake_home = total_stake / (ex_home * ex_arb)
-            stake_draw = total_stake / (ex_draw * ex_arb)
-            stake_away = total_stake / (ex_away * ex_arb)
-            guaranteed_return = stake_home * ex_home
-            profit = guaranteed_return - total_stake
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.success(f"""
-                **Bet on Man Utd Win**
-                - Stake: R{stake_home:.2f}
-                - At odds: 2.10
-                - Returns: R{stake_home * ex_home:.2f}
-                """)
-            with col2:
-                st.success(f"""
-                **Bet on Draw**
-                - Stake: R{stake_draw:.2f}
-                - At odds: 3.80
-                - Returns: R{stake_draw * ex_draw:.2f}
-                """)
-            with col3:
-                st.success(f"""
-                **Bet on Liverpool Win**
-                - Stake: R{stake_away:.2f}
-                - At odds: 4.20
-                - Returns: R{stake_away * ex_away:.2f}
-                """)
-            
-            st.markdown(f"""
-            ### **Final Result:**
-            
-            - **Total Staked:** R{total_stake:.2f}
-            - **Guaranteed Return:** R{guaranteed_return:.2f} (regardless of match outcome)
-            - **Guaranteed Profit:** R{profit:.2f}
-            - **ROI:** {ex_profit_margin:.2f}%
-            
-            ---
-            
-            ### Why Does This Work?
-            
-            Different bookmakers:
-            1. Have different opinions on match outcomes
-            2. Target different customer segments
-            3. Update their odds at different times
-            4. Use different risk management strategies
-            
-            By finding the **best odds for each outcome across multiple bookmakers**, you can sometimes create a situation 
-            where the combined implied probability is less than 100%, guaranteeing profit!
-            
-            ---
-            
-            ### Important Notes
-            
-            ⚠️ **Challenges in Real-World Arbitrage:**
-            - Odds change rapidly - opportunities may disappear quickly
-            - Bookmakers may limit or ban accounts that consistently arb
-            - Need accounts with multiple bookmakers
-            - Must place bets simultaneously to lock in odds
-            - Betting limits may prevent large stakes
-            - Account verification and withdrawal times vary
-            
-            ✅ **Best Practices:**
-            - Act quickly when opportunities arise
-            - Use reliable, licensed bookmakers
-            - Keep accounts funded for fast execution
-            - Calculate stakes accurately
-            - Verify odds before placing bets
-            - Track all bets carefully
-            """)
+        with instrument.stage("analyze_matches"):
+            analysis = analyze_matches(df)
+        show_analysis(analysis)
         
         st.markdown("---")
         
-        # Real Data Analysis Section
-        st.subheader("🔍 Arbitrage Analysis of Your Data")
-        
-        with st.expander("**Analyze All Matches - Click to See Detailed Breakdown**", expanded=True):
-            st.markdown("This section analyzes every match in your data to show whether arbitrage opportunities exist.")
-            
-            # Group matches and analyze each one
-            matches = df.groupby(['normalized_home', 'normalized_away', 'date'])
-            
-            analysis_data = []
-            
-            for (home, away, date), group in matches:
-                # Get best odds for each outcome
-                best_home_row = group.loc[group['odds_home'].idxmax()]
-                best_draw_row = group.loc[group['odds_draw'].idxmax()]
-                best_away_row = group.loc[group['odds_away'].idxmax()]
-                
-                best_home_odds = best_home_row['odds_home']
-                best_draw_odds = best_draw_row['odds_draw']
-                best_away_odds = best_away_row['odds_away']
-                
-                # Calculate arbitrage
-                implied_prob_home = 1 / best_home_odds
-                implied_prob_draw = 1 / best_draw_odds
-                implied_prob_away = 1 / best_away_odds
-                total_implied_prob = implied_prob_home + implied_prob_draw + implied_prob_away
-                
-                arbitrage_pct = total_implied_prob * 100
-                profit_margin = (1/total_implied_prob - 1) * 100 if total_implied_prob < 1 else 0
-                is_arbitrage = total_implied_prob < 1.0
-                
-                analysis_data.append({
-                    'match': f"{best_home_row['home_team']} vs {best_away_row['away_team']}",
-                    'date': date,
-                    'home_team': best_home_row['home_team'],
-                    'away_team': best_away_row['away_team'],
-                    'bookmakers': len(group),
-                    'best_home_odds': best_home_odds,
-                    'home_source': best_home_row['source'],
-                    'best_draw_odds': best_draw_odds,
-                    'draw_source': best_draw_row['source'],
-                    'best_away_odds': best_away_odds,
-                    'away_source': best_away_row['source'],
-                    'implied_prob_home': implied_prob_home * 100,
-                    'implied_prob_draw': implied_prob_draw * 100,
-                    'implied_prob_away': implied_prob_away * 100,
-                    'total_implied_prob': arbitrage_pct,
-                    'profit_margin': profit_margin,
-                    'is_arbitrage': is_arbitrage
-                })
-            
-            # Sort by profit margin (arbitrage opportunities first)
-            analysis_data.sort(key=lambda x: x['profit_margin'], reverse=True)
-            
-            # Summary statistics
-            total_matches = len(analysis_data)
-            arb_matches = sum(1 for a in analysis_data if a['is_arbitrage'])
-            
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Total Unique Matches", total_matches)
-            col2.metric("Arbitrage Opportunities", arb_matches, delta=f"{(arb_matches/total_matches*100):.1f}%" if total_matches > 0 else "0%")
-            col3.metric("Regular Matches (No Arb)", total_matches - arb_matches)
-            
-            st.markdown("---")
-            
-            # Display each match analysis
-            for i, analysis in enumerate(analysis_data, 1):
-                if analysis['is_arbitrage']:
-                    header_color = "🟢"
-                    status = "ARBITRAGE OPPORTUNITY"
-                else:
-                    header_color = "🔴"
-                    status = "NO ARBITRAGE"
-                
-                with st.expander(f"{header_color} **{analysis['match']}** ({analysis['date']}) - {status}"):
-                    st.markdown(f"**Match has {analysis['bookmakers']} bookmaker(s) offering odds**")
-                    
-                    # Show best odds from each bookmaker
-                    st.markdown("##### Best Odds Available:")
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.info(f"**🏠 {analysis['home_team']} Win**\n\n"
-                               f"Best Odds: **{analysis['best_home_odds']}**\n\n"
-                               f"Source: {analysis['home_source']}\n\n"
-                               f"Implied Probability: {analysis['implied_prob_home']:.2f}%")
-                    
-                    with col2:
-                        st.info(f"**🤝 Draw**\n\n"
-                               f"Best Odds: **{analysis['best_draw_odds']}**\n\n"
-                               f"Source: {analysis['draw_source']}\n\n"
-                               f"Implied Probability: {analysis['implied_prob_draw']:.2f}%")
-                    
-                    with col3:
-                        st.info(f"**✈️ {analysis['away_team']} Win**\n\n"
-                               f"Best Odds: **{analysis['best_away_odds']}**\n\n"
-                               f"Source: {analysis['away_source']}\n\n"
-                               f"Implied Probability: {analysis['implied_prob_away']:.2f}%")
-                    
-                    st.markdown("---")
-                    st.markdown("##### Arbitrage Calculation:")
-                    
-                    # Show the calculation
-                    st.code(f"""
-Step 1: Calculate Implied Probabilities
-  Home: 1 ÷ {analysis['best_home_odds']} = {analysis['implied_prob_home']:.4f}% 
-  Draw: 1 ÷ {analysis['best_draw_odds']} = {analysis['implied_prob_draw']:.4f}%
-  Away: 1 ÷ {analysis['best_away_odds']} = {analysis['implied_prob_away']:.4f}%
-
-Step 2: Sum Total Implied Probability
-  Total = {analysis['implied_prob_home']:.2f}% + {analysis['implied_prob_draw']:.2f}% + {analysis['implied_prob_away']:.2f}%
-  Total = {analysis['total_implied_prob']:.2f}%
-
-Step 3: Check for Arbitrage
-  {analysis['total_implied_prob']:.2f}% {'<' if analysis['is_arbitrage'] else '>'} 100%
-  Result: {'✅ ARBITRAGE EXISTS!' if analysis['is_arbitrage'] else '❌ No arbitrage (bookmaker margin)'}
-  
-  {'Profit Margin: ' + f"{analysis['profit_margin']:.2f}%" if analysis['is_arbitrage'] else 'Bookmaker Margin: ' + f"{analysis['total_implied_prob'] - 100:.2f}%"}
-                    """)
-                    
-                    if analysis['is_arbitrage']:
-                        # Calculate stake distribution
-                        total_stake = 1000
-                        stake_home = total_stake / (analysis['best_home_odds'] * (analysis['total_implied_prob']/100))
-                        stake_draw = total_stake / (analysis['best_draw_odds'] * (analysis['total_implied_prob']/100))
-                        stake_away = total_stake / (analysis['best_away_odds'] * (analysis['total_implied_prob']/100))
-                        guaranteed_return = stake_home * analysis['best_home_odds']
-                        profit = guaranteed_return - total_stake
-                        
-                        st.success(f"""
-**💰 Profit Opportunity:**
-
-For a R1,000 total investment:
-- Bet R{stake_home:.2f} on {analysis['home_team']} at {analysis['home_source']}
-- Bet R{stake_draw:.2f} on Draw at {analysis['draw_source']}
-- Bet R{stake_away:.2f} on {analysis['away_team']} at {analysis['away_source']}
-
-**Guaranteed Return: R{guaranteed_return:.2f}**
-**Guaranteed Profit: R{profit:.2f}**
-**ROI: {analysis['profit_margin']:.2f}%**
-                        """)
-                    else:
-                        st.warning(f"""
-**Why No Arbitrage?**
-
-The total implied probability ({analysis['total_implied_prob']:.2f}%) is greater than 100%, 
-meaning the bookmakers have built in a {analysis['total_implied_prob'] - 100:.2f}% margin.
-
-This is the normal situation - bookmakers price their odds to guarantee themselves profit.
-To find arbitrage, we need the combined best odds to total less than 100%.
-                        """)
+        # Value bets: prices above the all-book consensus once each book's margin is removed
+        st.subheader("💎 Value Bets")
+        st.markdown("Each bookmaker's margin is removed from its 1X2 and Over/Under prices, the fair "
+                    "probabilities are averaged across bookmakers, and any price paying more than that "
+                    "consensus has positive expected value.")
+        col1, col2 = st.columns(2)
+        method = col1.selectbox("Margin removal", METHODS, format_func=str.capitalize)
+        min_edge = col2.number_input("Min edge (%)", min_value=0.0, value=1.0, step=0.5)
+        with instrument.stage("value_bets"):
+            bets = find_value_bets(df, method, min_edge, solved=solved)
+        if bets.empty:
+            st.info("No prices above the consensus fair odds right now.")
+        else:
+            st.dataframe(bets, hide_index=True, use_container_width=True, column_order=[
+                'home_team', 'away_team', 'date', 'start_time', 'market', 'outcome', 'book',
+                'price', 'fair_odds', 'fair_prob', 'edge', 'n_books'], column_config={
+                'home_team': "Home", 'away_team': "Away", 'date': "Date", 'start_time': "Time",
+                'market': "Market", 'outcome': "Outcome", 'book': "Bookmaker",
+                'price': st.column_config.NumberColumn("Odds", format="%.2f"),
+                'fair_odds': st.column_config.NumberColumn("Fair Odds", format="%.2f"),
+                'fair_prob': st.column_config.NumberColumn("Fair Prob", format="%.3f"),
+                'edge': st.column_config.NumberColumn("Edge %", format="%.2f%%"),
+                'n_books': "Books",
+            })
         
         st.markdown("---")
         
@@ -664,15 +764,10 @@ To find arbitrage, we need the combined best odds to total less than 100%.
             best_away = df.nlargest(3, 'odds_away')[['home_team', 'away_team', 'odds_away', 'source']]
             st.dataframe(best_away, use_container_width=True)
     
-    # Footer
-    st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center'>
-        <p>⚠️ <strong>Disclaimer:</strong> Gambling involves risk. Please bet responsibly. 
-        This tool is for educational purposes only.</p>
-        <p>Last updated: {}</p>
-    </div>
-    """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")), unsafe_allow_html=True)
+    show_footer()
 
 if __name__ == "__main__":
-    main()
+    # one metrics record per rerun in OUT_DIR/metrics/ui.jsonl;
+    # streamlit run ui.py -- --profile adds a cProfile dump per rerun in OUT_DIR/profiles
+    with profiling.profiled("ui", OUT_DIR), instrument.Run("ui", OUT_DIR):
+        main()